@@ -0,0 +1,246 @@
+from array import array
+
+from splay_tree import Rotation, Shape
+
+NIL = -1
+
+
+class ArraySplayTree:
+    """Splay tree stored in parallel typed arrays, nodes are integer slots.
+
+    ``key`` holds the keys (``typecode`` "q" for 64-bit ints, "d" for
+    floats, "i" for 32-bit ints); ``left``, ``right`` and ``parent`` hold
+    slot indices with -1 for none.  Deleted slots go on a free list threaded
+    through ``left`` and are reused by later inserts.  Same API as
+    SplayTree: search/insert/delete return ``(ok, rotations)``.
+    """
+
+    def __init__(self, keys=(), typecode="q"):
+        self.key = array(typecode)
+        self.left = array("i")
+        self.right = array("i")
+        self.parent = array("i")
+        self.root = NIL
+        self.size = 0
+        self.free = NIL
+        for key in keys:
+            self.insert(key)
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        left, right, keys = self.left, self.right, self.key
+        stack = []
+        node = self.root
+        while stack or node != NIL:
+            while node != NIL:
+                stack.append(node)
+                node = left[node]
+            node = stack.pop()
+            yield keys[node]
+            node = right[node]
+
+    def __contains__(self, key):
+        return self.search(key)[0]
+
+    def memory_bytes(self):
+        return sum(a.itemsize * len(a) for a in (self.key, self.left, self.right, self.parent))
+
+    # --- Slots -----------------------------------------------------------
+
+    def _new(self, key, parent):
+        i = self.free
+        if i != NIL:
+            self.free = self.left[i]
+            self.key[i] = key
+            self.left[i] = NIL
+            self.right[i] = NIL
+            self.parent[i] = parent
+            return i
+        self.key.append(key)
+        self.left.append(NIL)
+        self.right.append(NIL)
+        self.parent.append(parent)
+        return len(self.key) - 1
+
+    def _release(self, i):
+        self.left[i] = self.free
+        self.right[i] = NIL
+        self.parent[i] = NIL
+        self.free = i
+
+    # --- Rotations -------------------------------------------------------
+
+    def _rotate(self, x):
+        left, right, parent = self.left, self.right, self.parent
+        p = parent[x]
+        g = parent[p]
+        if left[p] == x:
+            b = right[x]
+            left[p] = b
+            right[x] = p
+        else:
+            b = left[x]
+            right[p] = b
+            left[x] = p
+        if b != NIL:
+            parent[b] = p
+        parent[p] = x
+        parent[x] = g
+        if g == NIL:
+            self.root = x
+        elif left[g] == p:
+            left[g] = x
+        else:
+            right[g] = x
+
+    def _splay(self, x):
+        left, parent = self.left, self.parent
+        rotate = self._rotate
+        rotations = []
+        key = self.key[x]
+        while parent[x] != NIL:
+            p = parent[x]
+            g = parent[p]
+            x_left = left[p] == x
+            if g == NIL:
+                rotations.append(Rotation("zig" if x_left else "zag", key))
+                rotate(x)
+            elif x_left == (left[g] == p):
+                rotations.append(Rotation("zig-zig" if x_left else "zag-zag", key))
+                rotate(p)
+                rotate(x)
+            else:
+                rotations.append(Rotation("zig-zag" if x_left else "zag-zig", key))
+                rotate(x)
+                rotate(x)
+        return rotations
+
+    # --- Operations ------------------------------------------------------
+
+    def _find(self, key):
+        keys, left, right = self.key, self.left, self.right
+        node = self.root
+        last = NIL
+        while node != NIL:
+            last = node
+            k = keys[node]
+            if key < k:
+                node = left[node]
+            elif k < key:
+                node = right[node]
+            else:
+                return node
+        return last
+
+    def search(self, key):
+        node = self._find(key)
+        if node == NIL:
+            return False, []
+        rotations = self._splay(node)
+        return self.key[node] == key, rotations
+
+    def insert(self, key):
+        keys, left, right = self.key, self.left, self.right
+        node = self.root
+        parent = NIL
+        while node != NIL:
+            parent = node
+            k = keys[node]
+            if key < k:
+                node = left[node]
+            elif k < key:
+                node = right[node]
+            else:
+                return False, self._splay(node)
+        node = self._new(key, parent)
+        if parent == NIL:
+            self.root = node
+        elif key < keys[parent]:
+            left[parent] = node
+        else:
+            right[parent] = node
+        self.size += 1
+        return True, self._splay(node)
+
+    def delete(self, key):
+        found, rotations = self.search(key)
+        if not found:
+            return False, rotations
+        left, right, parent = self.left, self.right, self.parent
+        root = self.root
+        l, r = left[root], right[root]
+        self._release(root)
+        self.size -= 1
+        if l == NIL:
+            self.root = r
+            if r != NIL:
+                parent[r] = NIL
+            return True, rotations
+        parent[l] = NIL
+        self.root = l
+        pred = l
+        while right[pred] != NIL:
+            pred = right[pred]
+        rotations.extend(self._splay(pred))
+        right[pred] = r
+        if r != NIL:
+            parent[r] = pred
+        return True, rotations
+
+    # --- Introspection ---------------------------------------------------
+
+    def depth(self, key):
+        keys, left, right = self.key, self.left, self.right
+        node = self.root
+        d = 0
+        while node != NIL:
+            k = keys[node]
+            if key < k:
+                node = left[node]
+            elif k < key:
+                node = right[node]
+            else:
+                return d
+            d += 1
+        return -1
+
+    def height(self):
+        if self.root == NIL:
+            return -1
+        left, right = self.left, self.right
+        best = 0
+        stack = [(self.root, 0)]
+        while stack:
+            node, d = stack.pop()
+            if d > best:
+                best = d
+            if left[node] != NIL:
+                stack.append((left[node], d + 1))
+            if right[node] != NIL:
+                stack.append((right[node], d + 1))
+        return best
+
+    def snapshot(self):
+        if self.root == NIL:
+            return None
+        keys, left, right = self.key, self.left, self.right
+        built = {}
+        stack = [(self.root, False)]
+        while stack:
+            node, done = stack.pop()
+            if done:
+                l, r = left[node], right[node]
+                built[node] = Shape(
+                    keys[node],
+                    built.pop(l) if l != NIL else None,
+                    built.pop(r) if r != NIL else None,
+                )
+                continue
+            stack.append((node, True))
+            if right[node] != NIL:
+                stack.append((right[node], False))
+            if left[node] != NIL:
+                stack.append((left[node], False))
+        return built[self.root]
@@ -0,0 +1,265 @@
+from collections import namedtuple
+
+from splay_tree import Rotation, Shape
+
+# Link/cut trees (Sleator-Tarjan), the "network problems" extension from the
+# deck.  The represented forest is split into preferred paths, each kept in
+# an auxiliary splay tree ordered by depth; an auxiliary root's parent
+# pointer is the path-parent pointer to the node above the path.  Every
+# operation is an access (splaying along the way) plus O(1) pointer work,
+# so all of them are amortized O(log n).
+#
+# Trees are unrooted from the outside: link/cut take an edge and
+# path_aggregate any two connected vertices, using lazy path reversal to
+# re-root.  Splay steps are reported as Rotation records like SplayTree's.
+
+PathAggregate = namedtuple("PathAggregate", ["sum", "min", "max", "length"])
+
+
+class LinkCutNode:
+    __slots__ = ("key", "left", "right", "parent", "flip", "value", "sum", "min", "max", "size")
+
+    def __init__(self, key, value=0):
+        self.key = key
+        self.left = None
+        self.right = None
+        self.parent = None
+        self.flip = False
+        self.value = value
+        self.sum = value
+        self.min = value
+        self.max = value
+        self.size = 1
+
+
+class LinkCutTree:
+    """Dynamic forest over hashable vertex keys.
+
+    ``link(u, v)`` adds an edge between two trees, ``cut(u, v)`` removes
+    one, and ``find_root``/``connected``/``path_aggregate`` query it.
+    ``on_rotate`` (if set) is called after every single rotation, like
+    SplayTree's, and ``aux_trees()`` snapshots the preferred paths.
+    """
+
+    def __init__(self, vertices=(), on_rotate=None):
+        self.nodes = {}
+        self.on_rotate = on_rotate
+        for key in vertices:
+            self.add(key)
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def __contains__(self, key):
+        return key in self.nodes
+
+    def add(self, key, value=0):
+        if key in self.nodes:
+            raise ValueError(f"vertex {key!r} already exists")
+        self.nodes[key] = LinkCutNode(key, value)
+
+    def _node(self, key):
+        try:
+            return self.nodes[key]
+        except KeyError:
+            raise KeyError(f"no vertex {key!r}") from None
+
+    # --- Auxiliary splay trees -------------------------------------------
+
+    @staticmethod
+    def _is_root(x):
+        # Root of its auxiliary tree: no parent, or only a path-parent
+        p = x.parent
+        return p is None or (p.left is not x and p.right is not x)
+
+    @staticmethod
+    def _push(x):
+        if x.flip:
+            x.flip = False
+            x.left, x.right = x.right, x.left
+            if x.left is not None:
+                x.left.flip = not x.left.flip
+            if x.right is not None:
+                x.right.flip = not x.right.flip
+
+    @staticmethod
+    def _update(x):
+        left, right = x.left, x.right
+        total = low = high = x.value
+        size = 1
+        if left is not None:
+            total += left.sum
+            low = min(low, left.min)
+            high = max(high, left.max)
+            size += left.size
+        if right is not None:
+            total += right.sum
+            low = min(low, right.min)
+            high = max(high, right.max)
+            size += right.size
+        x.sum, x.min, x.max, x.size = total, low, high, size
+
+    def _rotate(self, x):
+        p = x.parent
+        g = p.parent
+        if p.left is x:
+            b = x.right
+            p.left = b
+            x.right = p
+        else:
+            b = x.left
+            p.right = b
+            x.left = p
+        if b is not None:
+            b.parent = p
+        if g is not None:
+            # Keep g's child link, or leave a path-parent pointer as it is
+            if g.left is p:
+                g.left = x
+            elif g.right is p:
+                g.right = x
+        x.parent = g
+        p.parent = x
+        self._update(p)
+        self._update(x)
+        if self.on_rotate is not None:
+            self.on_rotate(self)
+
+    def _splay(self, x):
+        # Pending reversals on the way to the auxiliary root go first
+        path = [x]
+        y = x
+        while not self._is_root(y):
+            y = y.parent
+            path.append(y)
+        for y in reversed(path):
+            self._push(y)
+        is_root = self._is_root
+        rotations = []
+        key = x.key
+        while not is_root(x):
+            p = x.parent
+            x_left = p.left is x
+            if is_root(p):
+                rotations.append(Rotation("zig" if x_left else "zag", key))
+                self._rotate(x)
+            elif x_left == (p.parent.left is p):
+                rotations.append(Rotation("zig-zig" if x_left else "zag-zag", key))
+                self._rotate(p)
+                self._rotate(x)
+            else:
+                rotations.append(Rotation("zig-zag" if x_left else "zag-zig", key))
+                self._rotate(x)
+                self._rotate(x)
+        return rotations
+
+    def _access(self, x):
+        # Make the root-to-x path preferred, ending with x at the root of
+        # its auxiliary tree and no deeper node on the path
+        rotations = self._splay(x)
+        x.right = None
+        self._update(x)
+        while x.parent is not None:
+            w = x.parent
+            rotations += self._splay(w)
+            w.right = x
+            self._update(w)
+            rotations += self._splay(x)
+        return rotations
+
+    def _make_root(self, x):
+        self._access(x)
+        x.flip = not x.flip
+
+    def _find_root(self, x):
+        self._access(x)
+        self._push(x)
+        while x.left is not None:
+            x = x.left
+            self._push(x)
+        self._splay(x)
+        return x
+
+    # --- Operations ------------------------------------------------------
+
+    def access(self, key):
+        """Make the path from ``key`` to its tree root preferred; returns
+        the splay steps performed."""
+        return self._access(self._node(key))
+
+    def find_root(self, key):
+        return self._find_root(self._node(key)).key
+
+    def connected(self, u, v):
+        if u == v:
+            return u in self.nodes
+        return self._find_root(self._node(u)) is self._find_root(self._node(v))
+
+    def link(self, u, v):
+        """Add the edge ``u - v``; they must be in different trees."""
+        x, y = self._node(u), self._node(v)
+        if self.connected(u, v):
+            raise ValueError(f"cannot link {u!r} and {v!r}: already connected")
+        self._make_root(x)
+        x.parent = y
+
+    def cut(self, u, v):
+        """Remove the edge ``u - v``."""
+        x, y = self._node(u), self._node(v)
+        self._make_root(x)
+        self._access(y)
+        self._push(x)
+        # The edge exists iff x is y's predecessor on the path from the root
+        if y.left is not x or x.right is not None:
+            raise ValueError(f"no edge between {u!r} and {v!r}")
+        y.left = None
+        x.parent = None
+        self._update(y)
+
+    def set_value(self, key, value):
+        x = self._node(key)
+        self._access(x)
+        x.value = value
+        self._update(x)
+
+    def path_aggregate(self, u, v):
+        """Sum/min/max of the vertex values on the path ``u .. v``."""
+        x, y = self._node(u), self._node(v)
+        if not self.connected(u, v):
+            raise ValueError(f"{u!r} and {v!r} are not connected")
+        self._make_root(x)
+        self._access(y)
+        return PathAggregate(y.sum, y.min, y.max, y.size)
+
+    # --- Introspection ---------------------------------------------------
+
+    def aux_trees(self):
+        """Shape of every auxiliary tree (preferred path), largest first.
+
+        In-order is top-to-bottom along the path; pending reversals are
+        applied on the fly without touching the tree.
+        """
+        shapes = []
+        for root in self.nodes.values():
+            if not self._is_root(root):
+                continue
+            built = {}
+            stack = [(root, False, False)]
+            while stack:
+                node, flipped, done = stack.pop()
+                flipped ^= node.flip
+                left, right = (node.right, node.left) if flipped else (node.left, node.right)
+                if done:
+                    built[node] = Shape(
+                        node.key,
+                        built.pop(left) if left is not None else None,
+                        built.pop(right) if right is not None else None,
+                    )
+                    continue
+                stack.append((node, flipped ^ node.flip, True))
+                for child in (right, left):
+                    if child is not None:
+                        stack.append((child, flipped, False))
+            shapes.append((root.size, built[root]))
+        shapes.sort(key=lambda item: -item[0])
+        return [shape for _, shape in shapes]
@@ -1,6 +1,21 @@
 from manim import *
 from manim_slides import Slide
+import itertools
+import json
+import math
+import os
 import random
+import zlib
+
+from link_cut_tree import LinkCutTree
+from splay_augmented import PotentialSplayTree, SizedSplayTree, cost_stream
+from splay_tree import SplayTree
+from tree_layout import preorder, tidy_layout
+from tree_lod import Summary, lod_shape
+from tree_spec import parse_tree_spec, spec_layout
+from workload_trace import TraceStep, access_depth, budgeted, random_trace, read_trace, replay
+from node_cache import TemplateCache
+from render_profile import RenderProfiler
 
 redC = "#ff001d"
 greenC = "#00fe2d"
@@ -13,46 +28,67 @@ bl = "#0009FF"
 HOLO_GRADIENT = [bl]
 GLOW_OPACITY = 0.3
 
+# Deterministic mode styles every node from a stable function of its label
+# and the scene's nominal clock (the run times of the plays so far), so
+# manim's per-animation hashes and pixels repeat across runs and the
+# partial-movie cache can hit.
+DETERMINISTIC = os.environ.get("SPLAY_DETERMINISTIC", "1") != "0"
+RENDER_SEED = int(os.environ.get("SPLAY_SEED", "3511"))
+SHEEN_RATE = 2.0
+
+def label_phase(label):
+    # Stable in [0, 1) across processes, unlike hash() on str
+    return zlib.crc32(str(label).encode()) / 2**32
+
+def holo_fill(label):
+    if DETERMINISTIC:
+        return HOLO_GRADIENT[int(label_phase(label) * len(HOLO_GRADIENT))]
+    return random.choice(HOLO_GRADIENT)
+
+LEVEL_SEP = 1.5
+
+NODE_FONT = "Orbitron"
+NODE_FONT_SIZE = 26
+NODE_TEMPLATES = TemplateCache(maxsize=1024)
+
+def build_node_template(label, fill):
+    # Holographic node design
+    node = RoundedRectangle(
+        corner_radius=0.15,
+        width=1.0,
+        height=0.7,
+        fill_opacity=1,
+        stroke_width=3,
+        stroke_color=bl
+    ).set_fill(
+        color=fill,
+        opacity=1
+    )
+
+    # Glow effect
+    glow = VGroup(*[
+        Circle(radius=0.5, color=color, fill_opacity=GLOW_OPACITY)
+        for color in HOLO_GRADIENT
+    ]).arrange_in_grid(rows=1, buff=0).move_to(node)
+
+    # Cyber text styling
+    text = Text(label, font=NODE_FONT,
+                font_size=NODE_FONT_SIZE, weight=BOLD, color=WHITE)\
+        .set_stroke(bl, width=2, background=True)\
+        .move_to(node.get_center())
+    return VGroup(glow, node, text)
+
 class BinaryTree(VGroup):
     def __init__(self, label, left=None, right=None, level=0, spacing=3.0, **kwargs):
         super().__init__(**kwargs)
         self.label = label
         
-        # Holographic node design
-        self.node = RoundedRectangle(
-            corner_radius=0.15,
-            width=1.0,
-            height=0.7,
-            fill_opacity=1,
-            stroke_width=3,
-            stroke_color=bl
-        ).set_fill(
-            color=random.choice(HOLO_GRADIENT),
-            opacity=1
-        ).add_updater(lambda m: m.set_sheen(
-            random.uniform(-0.3, 0.3), 
-            random.choice([UL, UR, DL, DR])
-        ))
-        
-        # Glow effect
-        self.glow = VGroup(*[
-            Circle(radius=0.5, color=color, fill_opacity=GLOW_OPACITY)
-            for color in HOLO_GRADIENT
-        ]).arrange_in_grid(rows=1, buff=0).move_to(self.node)
-        self.glow.add_updater(lambda m, dt: m.set_fill(
-            color=interpolate_color(
-                HOLO_GRADIENT[0],
-                HOLO_GRADIENT[-1],
-                (np.sin(self.renderer.time * 1) + 1) / 2
-            ),
-            opacity=GLOW_OPACITY + 0.4 * ((np.sin(self.renderer.time * 1.5) + 1) / 2)
-        ))
-        
-        # Cyber text styling
-        self.text = Text(str(label), font="Orbitron", 
-                        font_size=26, weight=BOLD, color=WHITE)\
-            .set_stroke(bl, width=2, background=True)\
-            .move_to(self.node.get_center())
+        # Glow, box and label come from a cached template; copying points is
+        # far cheaper than going through Pango/SVG for every Text
+        fill = holo_fill(label)
+        key = (str(label), NODE_FONT, NODE_FONT_SIZE, fill)
+        template = NODE_TEMPLATES.get(key, lambda: build_node_template(str(label), fill))
+        self.glow, self.node, self.text = template.copy().submobjects
             
         self.add(self.glow, self.node, self.text)
         
@@ -64,68 +100,495 @@ class BinaryTree(VGroup):
         self.vertical_buff = 1.0
         self.arrange_subtrees()
 
-    def arrange_subtrees(self):
-        current_pos = self.get_center()
-        horizontal_offset = self.spacing * (0.6 ** self.level)
-        vertical_buff = 1.5
-
-        # Position right-skewed children
-        if self.right:
-            self.right.level = self.level + 1
-            new_pos = current_pos + RIGHT * horizontal_offset * 1.2 + DOWN * vertical_buff
-            self.right.move_to(new_pos)
-            self.right.arrange_subtrees()
-
-        # Position left children normally
-        if self.left:
-            self.left.level = self.level + 1
-            new_pos = current_pos + LEFT * horizontal_offset + DOWN * vertical_buff
-            self.left.move_to(new_pos)
-            self.left.arrange_subtrees()
+    @classmethod
+    def from_shape(cls, shape, level=0, **kwargs):
+        # Nodes for nested (key, left, right) tuples, built without recursion
+        # and without arranging
+        key, left, right = shape
+        root = cls(key, level=level, **kwargs)
+        stack = [(root, left, right)]
+        while stack:
+            tree, left, right = stack.pop()
+            for side, child in (("left", left), ("right", right)):
+                if isinstance(child, Summary):
+                    # Collapsed subtree from tree_lod.lod_shape
+                    setattr(tree, side, SubtreeGlyph(child, level=tree.level + 1))
+                elif child is not None:
+                    node = cls(child[0], level=tree.level + 1, **kwargs)
+                    setattr(tree, side, node)
+                    stack.append((node, child[1], child[2]))
+        return root
+
+    @classmethod
+    def from_snapshot(cls, shape, level=0, **kwargs):
+        # Build from the Shape tuples of SplayTree.snapshot()
+        tree = cls.from_shape(shape, level=level, **kwargs)
+        tree.arrange_subtrees()
+        return tree
+
+    @classmethod
+    def from_spec(cls, spec, check_order=True, **kwargs):
+        # One-call loader for compact specs like "6(4(3,5),7)"; parse and
+        # layout are memoized per spec, levels are derived from the shape
+        tree = cls.from_shape(parse_tree_spec(spec, check_order), **kwargs)
+        tree.arrange_subtrees(positions=spec_layout(
+            spec, check_order, sibling_sep=tree.spacing * 0.55, level_sep=LEVEL_SEP
+        ))
+        tree.move_to(ORIGIN)
+        return tree
+
+    def arrange_subtrees(self, positions=None):
+        # One tidy-layout pass over the whole tree: every node's own pieces
+        # are moved exactly once and all of them are held flat by this root,
+        # so deep (skewed) trees don't turn into deeply nested VGroups.
+        # Precomputed pre-order ``positions`` (root at the origin) skip the
+        # layout pass.
+        if positions is None:
+            nodes, parents, positions = tidy_layout(
+                self,
+                sibling_sep=self.spacing * 0.55,
+                level_sep=LEVEL_SEP,
+                origin=self.node.get_center(),
+            )
+        else:
+            nodes, parents, _, _ = preorder(self)
+            positions = positions + self.node.get_center()
+        pieces = []
+        for i, (tree, target) in enumerate(zip(nodes, positions)):
+            shift = target - tree.node.get_center()
+            tree.node.shift(shift)
+            tree.text.shift(shift)
+            tree.glow.shift(shift)
+            if i:
+                tree.level = nodes[parents[i]].level + 1
+                tree.submobjects = [tree.node, tree.text]
+            pieces.append(tree.glow)
+            pieces.append(tree.node)
+            pieces.append(tree.text)
 
         # Create skewed connections
-        self.submobjects = [self.node, self.text]
-        if self.right:
-            # Connect parent's bottom-right to child's left-side
-            start = self.node.get_bottom() + RIGHT * 0.25
-            end = self.right.node.get_left() + UP * 0.25
-            line = Line(start, end, stroke_width=3, color=GREY_B)
-            self.add(line, self.right)
+        edges = {}
+        for i in range(1, len(nodes)):
+            parent, child = nodes[parents[i]], nodes[i]
+            side = "right" if child is parent.right else "left"
+            if side == "right":
+                # Connect parent's bottom-right to child's left-side
+                start = parent.node.get_bottom() + RIGHT * 0.25
+                end = child.node.get_left() + UP * 0.25
+            else:
+                # Standard left connection
+                start = parent.node.get_bottom() + LEFT * 0.25
+                end = child.node.get_top() + RIGHT * 0.25
+            edges[parent.label, child.label, side] = Line(start, end, stroke_width=3, color=GREY_B)
+        self.submobjects = pieces[:3] + list(edges.values()) + pieces[3:]
+        # Pre-order nodes for HoloDriver and keyed views for TreeTransition
+        self.layout_nodes = nodes
+        self.nodes_by_key = {tree.label: tree for tree in nodes}
+        self.edges = edges
+        self.unique_keys = len(self.nodes_by_key) == len(nodes)
+
+
+def build_glyph_template(size, height):
+    # Collapsed-subtree glyph: a dim triangle with the subtree's size and
+    # height, no glow and no sheen
+    node = Triangle(stroke_width=2, stroke_color=GREY_B).set_fill(bl, opacity=0.35)
+    node.stretch_to_fit_width(1.0).stretch_to_fit_height(0.7)
+    text = Text(f"{size}\nh{height}", font=NODE_FONT, font_size=14, color=GREY_A)
+    text.move_to(node.get_center() + DOWN * 0.08)
+    return VGroup(VGroup(), node, text)
+
+class SubtreeGlyph(BinaryTree):
+    # Stand-in for a subtree cut off by lod_shape; keyed by its root and
+    # stats so a collapsed region that is unchanged stays put in
+    # TreeTransition
+    def __init__(self, summary, level=0, spacing=3.0, **kwargs):
+        VGroup.__init__(self, **kwargs)
+        self.label = ("subtree",) + tuple(summary)
+        self.summary = summary
+        key = ("glyph", summary.size, summary.height)
+        template = NODE_TEMPLATES.get(key, lambda: build_glyph_template(summary.size, summary.height))
+        self.glow, self.node, self.text = template.copy().submobjects
+        self.add(self.glow, self.node, self.text)
+        self.left = None
+        self.right = None
+        self.level = level
+        self.spacing = spacing
+        self.vertical_buff = 1.0
 
-        if self.left:
-            # Standard left connection
-            start = self.node.get_bottom() + LEFT * 0.25
-            end = self.left.node.get_top() + RIGHT * 0.25
-            line = Line(start, end, stroke_width=3, color=GREY_B)
-            self.add(line, self.left)
+# Trees with more nodes than this are drawn through lod_shape
+LOD_NODES = int(os.environ.get("SPLAY_LOD_NODES", "127"))
+LOD_DEPTH = int(os.environ.get("SPLAY_LOD_DEPTH", "3"))
+
+def tree_state(tree, focus=(), depth_cutoff=LOD_DEPTH, radius=1):
+    # BinaryTree for a SplayTree's current shape; big trees are pruned to
+    # the top levels plus the paths to ``focus``, the rest summarized
+    if len(tree) <= LOD_NODES:
+        return BinaryTree.from_snapshot(tree.snapshot())
+    return BinaryTree.from_snapshot(lod_shape(tree.root, focus, depth_cutoff, radius))
+
+SHEEN_DIRECTIONS = np.array([UL, UR, DL, DR])
+
+class HoloDriver:
+    # Scene-level replacement for the old per-node updaters: one scene updater
+    # computes glow and sheen for every BinaryTree node on screen with NumPy
+    # and writes the colour arrays straight onto the mobjects.
+    def __init__(self, deterministic=DETERMINISTIC, seed=RENDER_SEED):
+        self.deterministic = deterministic
+        self.time = 0.0
+        self.clock = 0.0
+        self.rng = np.random.default_rng(seed)
+        self.glow_from = color_to_rgb(HOLO_GRADIENT[0])
+        self.glow_to = color_to_rgb(HOLO_GRADIENT[-1])
+        self.scene = None
+        self.trees = []
+        self.phases = np.zeros(0)
+        self._scene_key = None
+
+    def attach(self, scene):
+        self.scene = scene
+        scene.add_updater(self.update)
+        if self.deterministic:
+            play = scene.play
+
+            def pinned_play(*args, **kwargs):
+                # Every play/wait starts from the nominal end of the ones
+                # before it, not from the dt actually rendered: a rendered
+                # play stops a frame short of run_time while a skipped or
+                # cached one jumps straight to it.  The look hashed for a
+                # play then depends only on the run times before it, and the
+                # sheen carries on across plays without snapping back.
+                self.time = self.clock
+                self.style(self.clock)
+                result = play(*args, **kwargs)
+                self.clock += getattr(scene, "duration", None) or 0.0
+                return result
+
+            scene.play = pinned_play
+        return self
+
+    def refresh(self):
+        # Force a rescan, e.g. after re-arranging a tree that is already shown
+        self._scene_key = None
+
+    def _active_trees(self):
+        key = tuple(map(id, self.scene.mobjects))
+        if key != self._scene_key:
+            self._scene_key = key
+            # Node pieces -> their BinaryTree, found through the pre-order
+            # node list every arranged root on screen keeps.  Nothing points
+            # back from a piece to its tree, so copying a piece (``.animate``,
+            # FadeIn, TreeTransition) copies just that piece.
+            by_node = {}
+            for mob in self.scene.get_mobject_family_members():
+                for tree in getattr(mob, "layout_nodes", ()):
+                    if not isinstance(tree, SubtreeGlyph):
+                        by_node[id(tree.node)] = tree
+            self.trees = list(by_node.values())
+            self.phases = np.array([label_phase(tree.label) for tree in self.trees])
+        return self.trees
+
+    def update(self, dt):
+        self.time += dt
+        self.style(self.time)
+
+    def style(self, t):
+        trees = self._active_trees()
+        n = len(trees)
+        if not n:
+            return
+
+        fills = np.empty((n, 2, 4))
+        strokes = np.empty((n, 2, 4))
+        for i, tree in enumerate(trees):
+            fills[i, 0] = tree.node.fill_rgbas[0]
+            strokes[i, 0] = tree.node.stroke_rgbas[0]
+
+        # Sheen: lighten a second gradient stop by a per-node factor
+        if self.deterministic:
+            cycle = self.phases + t * SHEEN_RATE
+            factors = 0.3 * np.sin(2 * np.pi * cycle)
+            corners = (cycle * len(SHEEN_DIRECTIONS)).astype(int) % len(SHEEN_DIRECTIONS)
+        else:
+            factors = self.rng.uniform(-0.3, 0.3, n)
+            corners = self.rng.integers(len(SHEEN_DIRECTIONS), size=n)
+        for rgbas in (fills, strokes):
+            rgbas[:, 1] = rgbas[:, 0]
+            rgbas[:, 1, :3] += factors[:, None]
+            np.clip(rgbas, 0, 1, out=rgbas)
+
+        # Glow: one pulsing colour, faded along with each node
+        glows = np.empty((n, 1, 4))
+        glows[:, 0, :3] = interpolate(self.glow_from, self.glow_to, (np.sin(t) + 1) / 2)
+        glows[:, 0, 3] = (GLOW_OPACITY + 0.4 * ((np.sin(t * 1.5) + 1) / 2)) * fills[:, 0, 3]
+
+        directions = SHEEN_DIRECTIONS[corners]
+        for i, tree in enumerate(trees):
+            node = tree.node
+            node.fill_rgbas = fills[i]
+            node.stroke_rgbas = strokes[i]
+            node.sheen_factor = factors[i]
+            node.sheen_direction = directions[i]
+            for circle in tree.glow.submobjects:
+                circle.fill_rgbas = glows[i]
+
+
+class Forest(VGroup):
+    # BinaryTrees laid out side by side and keyed as one, so TreeTransition
+    # can move nodes between trees (split and join)
+    def __init__(self, *trees, buff=1.0, **kwargs):
+        super().__init__(*trees, **kwargs)
+        if trees:
+            self.arrange(RIGHT, buff=buff, aligned_edge=UP)
+        self.nodes_by_key = {}
+        self.edges = {}
+        for tree in trees:
+            self.nodes_by_key.update(tree.nodes_by_key)
+            self.edges.update(tree.edges)
+        self.unique_keys = all(tree.unique_keys for tree in trees) and (
+            len(self.nodes_by_key) == sum(len(tree.nodes_by_key) for tree in trees)
+        )
+
+
+def node_pieces(tree):
+    return VGroup(tree.glow, tree.node, tree.text)
+
+class TreeTransition(AnimationGroup):
+    # Replaces ``old`` with ``new`` like ReplacementTransform, but nodes are
+    # matched by label: only nodes that moved are shifted, only edges that
+    # changed are redrawn, and everything else stays static.  ``old`` and
+    # ``new`` may be BinaryTrees, Forests, or plain VGroups holding a tree
+    # plus labels; other members (Text, Axes, ...) are paired in order and
+    # transformed as a whole.
+    def __init__(self, old, new, **kwargs):
+        self.target = new
+        self.incoming = []
+        animations = self._diff(old, new)
+        if not animations:
+            animations = [Animation(old)]
+        super().__init__(*animations, group=old, **kwargs)
+
+    def _diff(self, old, new):
+        keyed = (BinaryTree, Forest)
+        if isinstance(old, keyed) and isinstance(new, keyed):
+            return self._diff_trees(old, new)
+        if type(old) is not VGroup or type(new) is not VGroup:
+            # Leaves and composite mobjects can't be matched piece by piece
+            return [Transform(old, new)]
+        animations = []
+        for a, b in zip(old.submobjects, new.submobjects):
+            animations += self._diff(a, b)
+        for extra in old.submobjects[len(new.submobjects):]:
+            animations.append(self._fade_out(extra))
+        for extra in new.submobjects[len(old.submobjects):]:
+            self.incoming.append(extra)
+            animations.append(FadeIn(extra))
+        return animations
+
+    def _fade_out(self, mob):
+        # Faded pieces go away with ``old`` as a whole at clean-up
+        anim = FadeOut(mob)
+        anim.remover = False
+        return anim
+
+    def _diff_trees(self, old, new):
+        if not (old.unique_keys and new.unique_keys):
+            raise ValueError("TreeTransition needs unique node labels")
+        animations = []
+        for key, old_node in old.nodes_by_key.items():
+            new_node = new.nodes_by_key.get(key)
+            if new_node is None:
+                animations.append(self._fade_out(node_pieces(old_node)))
+                continue
+            delta = new_node.node.get_center() - old_node.node.get_center()
+            if not np.allclose(delta, 0):
+                animations.append(node_pieces(old_node).animate.shift(delta))
+        for key, new_node in new.nodes_by_key.items():
+            if key not in old.nodes_by_key:
+                pieces = node_pieces(new_node)
+                self.incoming += pieces.submobjects
+                animations.append(FadeIn(pieces))
+
+        for key, old_edge in old.edges.items():
+            new_edge = new.edges.get(key)
+            if new_edge is None:
+                animations.append(self._fade_out(old_edge))
+            elif not (np.allclose(old_edge.get_start(), new_edge.get_start())
+                      and np.allclose(old_edge.get_end(), new_edge.get_end())):
+                animations.append(Transform(old_edge, new_edge))
+        for key, new_edge in new.edges.items():
+            if key not in old.edges:
+                self.incoming.append(new_edge)
+                animations.append(Create(new_edge))
+        return animations
+
+    def _setup_scene(self, scene):
+        super()._setup_scene(scene)
+        if scene is not None and self.incoming:
+            scene.add(*self.incoming)
+
+    def clean_up_from_scene(self, scene):
+        super().clean_up_from_scene(scene)
+        scene.remove(self.group, *self.group.submobjects, *self.incoming)
+        scene.add(self.target)
+
+def bench_chart(rows, key, title, scale=1.0, width=5.0, height=3.2):
+    # Bar chart of one splay_bench.py metric, one bar per variant.  Drawn
+    # from Rectangle and Text instead of BarChart, whose axis labels and
+    # numbers would need LaTeX
+    values = [row[key] * scale for row in rows]
+    top = max(values) or 1.0
+    colors = [bl, greenC, yellowC, redC]
+    slot = width / len(rows)
+    axis = Line(LEFT * width / 2, RIGHT * width / 2, stroke_width=2, color=GREY_B)
+    bars, numbers, names = VGroup(), VGroup(), VGroup()
+    for i, (row, value) in enumerate(zip(rows, values)):
+        foot = axis.get_left() + RIGHT * slot * (i + 0.5)
+        bar = Rectangle(width=slot * 0.6, height=max(height * value / top, 0.02), stroke_width=0)
+        bar.set_fill(colors[i % len(colors)], opacity=0.9).move_to(foot, aligned_edge=DOWN)
+        bars.add(bar)
+        numbers.add(Text(f"{value:,.1f}" if value < 100 else f"{value:,.0f}", font_size=16).next_to(bar, UP, buff=0.1))
+        name = Text(row["variant"], font_size=16).next_to(foot, DOWN, buff=0.15)
+        if name.width > slot * 0.95:
+            name.scale_to_fit_width(slot * 0.95)
+        names.add(name)
+    caption = Text(title).scale(0.4).next_to(VGroup(bars, numbers), UP)
+    return VGroup(axis, bars, numbers, names, caption)
+
+def cost_plot(costs, width=4.5, height=3.2):
+    # Running actual vs amortized cost of a PotentialSplayTree trace
+    actual = list(itertools.accumulate(cost.actual for cost in costs))
+    amortized = list(itertools.accumulate(cost.amortized for cost in costs))
+    top = max(actual[-1], amortized[-1], 1.0)
+    axes = Axes(
+        x_range=[0, len(costs), max(1, len(costs) // 4)],
+        y_range=[0, top * 1.1, top / 4],
+        x_length=width,
+        y_length=height,
+        tips=False,
+        axis_config={"color": GREY_B, "include_numbers": False},
+    )
+    xs = list(range(1, len(costs) + 1))
+    graphs = VGroup(
+        axes.plot_line_graph(xs, actual, line_color=greenC, add_vertex_dots=False),
+        axes.plot_line_graph(xs, amortized, line_color=yellowC, add_vertex_dots=False),
+    )
+    legend = VGroup(
+        Text(f"actual {actual[-1]:,.0f}", color=greenC),
+        Text(f"amortized {amortized[-1]:,.0f}", color=yellowC),
+    ).scale(0.35).arrange(DOWN, aligned_edge=LEFT).next_to(axes, UP, aligned_edge=LEFT)
+    return VGroup(axes, graphs, legend)
+
+def fit_to_frame(scene, mob, width=0.9, height=0.75):
+    # Center mob and shrink it to fit the given fractions of the frame
+    mob.move_to(ORIGIN)
+    if mob.width > scene.camera.frame_width * width:
+        mob.scale_to_fit_width(scene.camera.frame_width * width)
+    if mob.height > scene.camera.frame_height * height:
+        mob.scale_to_fit_height(scene.camera.frame_height * height)
+    return mob
+
+class ReplayFrame:
+    # Shared placement for the tree states of one replay.  fit_to_frame
+    # would rescale and recenter every state on its own, so TreeTransition
+    # would move every node; here all states get one scale about their root
+    # and the root always sits at the same point, so only the nodes a splay
+    # moved animate.  The scale only shrinks, when a state would not fit;
+    # reserve() every state up front to fix it for the whole replay.
+    def __init__(self, scene, width=0.9, height=0.75, center=ORIGIN):
+        self.half_width = scene.camera.frame_width * width / 2
+        self.height = scene.camera.frame_height * height
+        self.top = np.array(center) + UP * self.height / 2
+        self.scale = 1.0
+
+    def reserve(self, tree):
+        root = tree.node.get_center()
+        reach = max(root[0] - tree.get_left()[0], tree.get_right()[0] - root[0], 1e-6)
+        self.scale = min(self.scale, self.half_width / reach, self.height / max(tree.height, 1e-6))
+        return self
+
+    def place(self, tree):
+        self.reserve(tree)
+        root = tree.node.get_center()
+        tree.scale(self.scale, about_point=root)
+        tree.shift(self.top - root + DOWN * (tree.get_top()[1] - root[1]))
+        return tree
+
+def add_deck_background(scene):
+    # === Persistent Background ===
+    gradient = Rectangle(
+        width=scene.camera.frame_width,
+        height=scene.camera.frame_height,
+        fill_color=["#00002b", "#13003d", "#210051"],
+        fill_opacity=1,
+        stroke_width=0
+    )
+    scene.add(gradient)
+    if DETERMINISTIC:
+        random.seed(RENDER_SEED)
+        np.random.seed(RENDER_SEED)
+    scene.holo = HoloDriver().attach(scene)
+    profile_dir = os.environ.get("SPLAY_PROFILE")
+    if profile_dir:
+        os.makedirs(profile_dir, exist_ok=True)
+        RenderProfiler(scene, os.path.join(profile_dir, type(scene).__name__)).attach()
 
 # -------------------------------------------------------------------------------------------------------------------------------------------
 # -------------------------------------------------------------------------------------------------------------------------------------------
 
 class SplayTreePresentation(Slide, Scene):
+    # The full deck.  Each slide block is its own method so the section
+    # scenes at the bottom of the file can render any subset of them.
+    sections = (
+        "title",
+        "intro",
+        "problem",
+        "technical",
+        "zig",
+        "zag",
+        "zig_zig",
+        "zag_zag",
+        "zig_zag",
+        "zag_zig",
+        "solution",
+        "search",
+        "insert",
+        "delete",
+        "variants",
+        "variants_bench",
+        "extensions",
+        "amortized",
+        "conclusion",
+        "end",
+    )
+
     def construct(self):
-        # === Persistent Background ===
-        gradient = Rectangle(
-            width=self.camera.frame_width,
-            height=self.camera.frame_height,
-            fill_color=["#00002b", "#13003d", "#210051"],
-            fill_opacity=1,
-            stroke_width=0
-        )
-        self.add(gradient)
+        add_deck_background(self)
+
+        for i, name in enumerate(self.sections):
+            self.last_section = i == len(self.sections) - 1
+            getattr(self, "slide_" + name)()
+        logger.info("Node template cache: %s", NODE_TEMPLATES.stats())
+
+    def section_break(self):
+        # Slide boundary before a block's closing fade-out.  When that block
+        # ends a section scene, the fade auto-advances into the next scene
+        # so the stitched deck clicks exactly like the single-scene one.
+        self.next_slide(auto_next=self.last_section)
 
 # -------------------------------------------------------------------------------------------------------------------------------------------
 
+    def slide_title(self):
         # === Title Slide ===
         title = Title("Analysis of Splay Trees").scale(0.80)
         subtitle = Text("By: Dhruv Patel, Ashton Holland, Adam Kulikowski, Aditya Behara").scale(0.5).next_to(title, DOWN)
         title_grp = VGroup(title, subtitle)
         self.play(Write(title_grp))
-        self.next_slide()
+        self.section_break()
         self.play(FadeOut(title_grp))
 
 # -------------------------------------------------------------------------------------------------------------------------------------------
 
+    def slide_intro(self):
         # === Introduction Slide ===
         intro_header = Text("Introduction").scale(0.7).to_edge(UP, buff=0.3)
         intro = BulletedList(
@@ -139,11 +602,12 @@ class SplayTreePresentation(Slide, Scene):
         intro.set_width(self.camera.frame_width * 0.9)
         intro_grp = VGroup(intro_header, intro)
         self.play(Write(intro_grp))
-        self.next_slide()
+        self.section_break()
         self.play(FadeOut(intro_grp))
 
 # -------------------------------------------------------------------------------------------------------------------------------------------
 
+    def slide_problem(self):
         # === Problem Statement and Motivation Slide ===
         prob_header = Text("Problem Statement and Motivation").scale(0.7).to_edge(UP, buff=0.3)
         problem = BulletedList(
@@ -156,11 +620,13 @@ class SplayTreePresentation(Slide, Scene):
         prob_grp = VGroup(prob_header, problem)
         # Fade out previous slide already done; now show problem slide
         self.play(Write(prob_grp))
-        self.next_slide()
+        self.section_break()
         self.play(FadeOut(prob_grp))
 
- # -------------------------------------------------------------------------------------------------------------------------------------------
+# -------------------------------------------------------------------------------------------------------------------------------------------
+# -------------------------------------------------------------------------------------------------------------------------------------------
 
+    def slide_technical(self):
         # === Technical Background Slide ===
         tech_header = Text("Technical Background").scale(0.7).to_edge(UP, buff=0.3)
         tech = BulletedList(
@@ -172,23 +638,19 @@ class SplayTreePresentation(Slide, Scene):
         tech.set_width(self.camera.frame_width * 0.9)
         tech_grp = VGroup(tech_header, tech)
         self.play(Write(tech_grp))
-        self.next_slide()
+        self.section_break()
         self.play(FadeOut(tech_grp))
 
 # -------------------------------------------------------------------------------------------------------------------------------------------
 # -------------------------------------------------------------------------------------------------------------------------------------------
+
+    def slide_zig(self):
         # === Tree Rotations Slide - Animations! ===
         rot_header = Text("Splaying Rotations: Zig, Zag, Zig-Zig, Zag-Zag, Zig-Zag, Zag-Zig").scale(0.5).to_edge(UP, buff=0.3)
         self.play(Write(rot_header))
         
         # --- Zig Rotation Slide ---
-        zig_tree = BinaryTree(6)
-        zig_tree.left = BinaryTree(4)
-        zig_tree.right = BinaryTree(7)
-        zig_tree.left.left = BinaryTree(3)
-        zig_tree.left.right = BinaryTree(5)
-        zig_tree.arrange_subtrees()
-        zig_tree.move_to(ORIGIN)
+        zig_tree = BinaryTree.from_spec("6(4(3,5),7)")
         zig_label = Text("Pre-Zig(4) (Single Right Rotation)").scale(0.5).next_to(zig_tree, DOWN)
         zig_label.set_color(redC)
         zig_grp = VGroup(zig_tree, zig_label)
@@ -198,34 +660,24 @@ class SplayTreePresentation(Slide, Scene):
 # -------------------------------------------------------------------------------------------------------------------------------------------
 
         # Show post-Zig state
-        zig_rotated = BinaryTree(4)
-        zig_rotated.right = BinaryTree(6)
-        zig_rotated.right.right = BinaryTree(7)
-        zig_rotated.left = BinaryTree(3)
-        zig_rotated.right.left = BinaryTree(5)
-        zig_rotated.arrange_subtrees()
-        zig_rotated.move_to(ORIGIN)
+        zig_rotated = BinaryTree.from_spec("4(3,6(5,7))")
         zig_r_label = Text("Post-Zig(4) (Single Right Rotation)").scale(0.5).next_to(zig_rotated, DOWN)
         zig_r_label.set_color(greenC)
         zig_r_Grp = VGroup(zig_rotated, zig_r_label)
-        self.play(ReplacementTransform(zig_tree, zig_rotated))
+        self.play(TreeTransition(zig_tree, zig_rotated))
         self.play(Write(zig_r_label))
-        self.next_slide()
+        self.section_break()
         self.play(FadeOut(zig_r_Grp, rot_header))
+
 # -------------------------------------------------------------------------------------------------------------------------------------------
 # -------------------------------------------------------------------------------------------------------------------------------------------
 
+    def slide_zag(self):
         # --- Zag Rotation Slide ---
         zag_header = Text("Zag (Single Left Rotation)").scale(0.8).to_edge(UP, buff=0.3)
         self.play(Write(zag_header))
         
-        zag_tree = BinaryTree(4)
-        zag_tree.left = BinaryTree(3)
-        zag_tree.right = BinaryTree(6)
-        zag_tree.right.left = BinaryTree(5)
-        zag_tree.right.right = BinaryTree(7)
-        zag_tree.arrange_subtrees()
-        zag_tree.move_to(ORIGIN)
+        zag_tree = BinaryTree.from_spec("4(3,6(5,7))")
         zag_label = Text("Pre-Zag(6) (Single Left Rotation)").scale(0.5).next_to(zag_tree, DOWN)
         zag_label.set_color(redC)
         zag_grp = VGroup(zag_tree, zag_label)
@@ -235,34 +687,24 @@ class SplayTreePresentation(Slide, Scene):
 # -------------------------------------------------------------------------------------------------------------------------------------------
 
         # Show post-Zag state
-        zag_r = BinaryTree(6)
-        zag_r.right = BinaryTree(7)
-        zag_r.left = BinaryTree(4)
-        zag_r.left.left = BinaryTree(3)
-        zag_r.left.right = BinaryTree(5)
-        zag_r.arrange_subtrees()
-        zag_r.move_to(ORIGIN)
+        zag_r = BinaryTree.from_spec("6(4(3,5),7)")
         zag_r_label = Text("Post-Zag(6) (Single Left Rotation)").scale(0.5).next_to(zag_tree, DOWN)
         zag_r_label.set_color(greenC)
         zag_r_Grp = VGroup(zag_r, zag_r_label)
-        self.play(ReplacementTransform(zag_tree, zag_r))
+        self.play(TreeTransition(zag_tree, zag_r))
         self.play(Write(zag_r_label))
-        self.next_slide()
+        self.section_break()
         self.play(FadeOut(zag_r_Grp), FadeOut(zag_header))
+
 # -------------------------------------------------------------------------------------------------------------------------------------------
 # -------------------------------------------------------------------------------------------------------------------------------------------
 
+    def slide_zig_zig(self):
         # --- Zig-Zig Rotation Slide ---
         zig_zig_Header = Text("Zig-Zig (Double Right Rotation)").scale(0.8).to_edge(UP, buff=0.3)
         self.play(Write(zig_zig_Header))
         
-        zig_zig_T = BinaryTree(6, level = 0)
-        zig_zig_T.left = BinaryTree(4, level = 1)
-        zig_zig_T.right = BinaryTree(7, level = 1)
-        zig_zig_T.left.left = BinaryTree(3, level = 2)
-        zig_zig_T.left.right = BinaryTree(5, level = 2)
-        zig_zig_T.arrange_subtrees()
-        zig_zig_T.move_to(ORIGIN)
+        zig_zig_T = BinaryTree.from_spec("6(4(3,5),7)")
         zig_zig_L = Text("Pre-Zig-Zig(3) (Double Right Rotation)").scale(0.5).next_to(zig_zig_T, DOWN)
         zig_zig_L.set_color(redC)
         zig_zig_grp = VGroup(zig_zig_T, zig_zig_L)
@@ -272,33 +714,24 @@ class SplayTreePresentation(Slide, Scene):
 # -------------------------------------------------------------------------------------------------------------------------------------------
 
         # Post-Zig-Zig
-        zig_zig_R = BinaryTree(3, level = 0)
-        zig_zig_R.right = BinaryTree(4, level = 1)
-        zig_zig_R.right.right = BinaryTree(6, level = 2)
-        zig_zig_R.right.right.left = BinaryTree(5, level = 3)
-        zig_zig_R.right.right.right = BinaryTree(7, level = 3)
-        zig_zig_R.arrange_subtrees()
-        zig_zig_R.move_to(ORIGIN)
+        zig_zig_R = BinaryTree.from_spec("3(,4(,6(5,7)))")
         zig_zig_pstL = Text("Post-Zig-Zig(3) (Double Right Rotation)").scale(0.5).next_to(zig_zig_T, DOWN, buff = 1.2)
         zig_zig_pstL.set_color(greenC)
         zig_zig_RGrp = VGroup(zig_zig_R, zig_zig_pstL)
-        self.play(ReplacementTransform(zig_zig_T, zig_zig_R))
+        self.play(TreeTransition(zig_zig_T, zig_zig_R))
         self.play(Write(zig_zig_pstL))
-        self.next_slide()
+        self.section_break()
         self.play(FadeOut(zig_zig_RGrp), FadeOut(zig_zig_Header))
+
 # -------------------------------------------------------------------------------------------------------------------------------------------
 # -------------------------------------------------------------------------------------------------------------------------------------------
+
+    def slide_zag_zag(self):
         # --- Zag-Zag Rotation Slide ---
         zag_zag_Header = Text("Zag-Zag (Double Left Rotation)").scale(0.8).to_edge(UP, buff=0.3)
         self.play(Write(zag_zag_Header))
         
-        zag_zag_T = BinaryTree(4, level = 0)
-        zag_zag_T.left = BinaryTree(3, level = 1)
-        zag_zag_T.right = BinaryTree(6, level = 1)
-        zag_zag_T.right.left = BinaryTree(5, level = 2)
-        zag_zag_T.right.right = BinaryTree(7, level = 2)
-        zag_zag_T.arrange_subtrees()
-        zag_zag_T.move_to(ORIGIN)
+        zag_zag_T = BinaryTree.from_spec("4(3,6(5,7))")
         zag_zag_L = Text("Pre-Zag-Zag(7) (Double Left Rotation)").scale(0.5).next_to(zag_zag_T, DOWN)
         zag_zag_L.set_color(redC)
         zag_zag_grp = VGroup(zag_zag_T, zag_zag_L)
@@ -308,35 +741,25 @@ class SplayTreePresentation(Slide, Scene):
 # -------------------------------------------------------------------------------------------------------------------------------------------
 
         # Post-Zag-Zag
-        zag_zag_R = BinaryTree(7, level = 0)
-        zag_zag_R.left = BinaryTree(6, level = 1)
-        zag_zag_R.left.left = BinaryTree(4, level = 2)
-        zag_zag_R.left.left.left = BinaryTree(3, level = 3)
-        zag_zag_R.left.left.right = BinaryTree(5, level = 3)
-        zag_zag_R.arrange_subtrees()
-        zag_zag_R.move_to(ORIGIN)
+        zag_zag_R = BinaryTree.from_spec("7(6(4(3,5)))")
         zag_zag_pstL = Text("Post-Zag-Zag(7) (Double left Rotation)").scale(0.5).next_to(zag_zag_R, DOWN, buff = 1.0)
         zag_zag_pstL.set_color(greenC)
         zag_zag_RGrp = VGroup(zag_zag_R, zag_zag_pstL)
-        self.play(ReplacementTransform(zag_zag_T, zag_zag_R))
+        self.play(TreeTransition(zag_zag_T, zag_zag_R))
         self.play(Write(zag_zag_pstL))
-        self.next_slide()
+        self.section_break()
         self.play(FadeOut(zag_zag_RGrp), FadeOut(zag_zag_Header))
 
 # -------------------------------------------------------------------------------------------------------------------------------------------
 # -------------------------------------------------------------------------------------------------------------------------------------------
+
+    def slide_zig_zag(self):
         # --- Zig-Zag Rotation Slide ---
         zig_zag_H = Text("Zig-Zag Rotation").scale(0.8).to_edge(UP, buff=0.3)
         self.play(Write(zig_zag_H))
 
         # Original tree
-        zig_zag_T = BinaryTree(4, level=0)
-        zig_zag_T.left = BinaryTree(3, level=1)
-        zig_zag_T.right = BinaryTree(6, level=1)
-        zig_zag_T.right.left = BinaryTree(5, level=2)
-        zig_zag_T.right.right = BinaryTree(7, level=2)
-        zig_zag_T.arrange_subtrees()
-        zig_zag_T.move_to(ORIGIN)
+        zig_zag_T = BinaryTree.from_spec("4(3,6(5,7))")
 
         zig_zag_L = Text("0. Original Splay Tree, Zig-Zag(5)").scale(0.5).next_to(zig_zag_T, DOWN)
         zig_zag_L.set_color(redC)
@@ -346,54 +769,39 @@ class SplayTreePresentation(Slide, Scene):
         self.next_slide()
 
         # --- Replace with first transformation ---
-        zig_zag_Z = BinaryTree(4, level=0)
-        zig_zag_Z.left = BinaryTree(3, level=1)
-        zig_zag_Z.right = BinaryTree(5, level=1)
-        zig_zag_Z.right.right = BinaryTree(6, level=2)
-        zig_zag_Z.right.right.right = BinaryTree(7, level=3)
-        zig_zag_Z.arrange_subtrees()
-        zig_zag_Z.move_to(ORIGIN)
+        zig_zag_Z = BinaryTree.from_spec("4(3,5(,6(,7)))")
 
         zig_zag_ZLabel = Text("1. Zig Rotation(6)").scale(0.5).next_to(zig_zag_Z, DOWN)
         zig_zag_ZLabel.set_color(yellowC)
 
         zig_zag_ZGrp = VGroup(zig_zag_Z, zig_zag_ZLabel)
         # Transform the entire original group into the new group
-        self.play(ReplacementTransform(zig_zag_grp, zig_zag_ZGrp))
+        self.play(TreeTransition(zig_zag_grp, zig_zag_ZGrp))
         self.next_slide()
         self.play(FadeOut(zig_zag_ZGrp))
 
         # --- Replace with second transformation ---
-        zig_zag_ZG = BinaryTree(5, level=0)
-        zig_zag_ZG.left = BinaryTree(4, level=1)
-        zig_zag_ZG.right = BinaryTree(6, level=1)
-        zig_zag_ZG.left.left = BinaryTree(3, level=2)
-        zig_zag_ZG.right.right = BinaryTree(7, level=2)
-        zig_zag_ZG.arrange_subtrees()
-        zig_zag_ZG.move_to(ORIGIN)
+        zig_zag_ZG = BinaryTree.from_spec("5(4(3),6(,7))")
 
         zig_zag_ZGLabel = Text("2. Zag Rotation(4)").scale(0.5).next_to(zig_zag_ZG, DOWN)
         zig_zag_ZGLabel.set_color(greenC)
 
         zig_zag_ZG_Grp = VGroup(zig_zag_ZG, zig_zag_ZGLabel)
         # Transform the previous group into the new one
-        self.play(ReplacementTransform(zig_zag_ZGrp, zig_zag_ZG_Grp))
-        self.next_slide()
+        self.play(TreeTransition(zig_zag_ZGrp, zig_zag_ZG_Grp))
+        self.section_break()
         self.play(FadeOut(zig_zag_ZG_Grp), FadeOut(zig_zag_H))
+
 # -------------------------------------------------------------------------------------------------------------------------------------------
 # -------------------------------------------------------------------------------------------------------------------------------------------
+
+    def slide_zag_zig(self):
         # --- Zag-Zig Rotation Slide ---
         zag_zig_H = Text("Zag-Zig Rotation").scale(0.8).to_edge(UP, buff=0.3)
         self.play(Write(zag_zig_H))
 
         # Original tree
-        zag_zig_T = BinaryTree(6, level=0)
-        zag_zig_T.left = BinaryTree(4, level=1)
-        zag_zig_T.right = BinaryTree(7, level=1)
-        zag_zig_T.left.left = BinaryTree(3, level=2)
-        zag_zig_T.left.right = BinaryTree(5, level=2)
-        zag_zig_T.arrange_subtrees()
-        zag_zig_T.move_to(ORIGIN)
+        zag_zig_T = BinaryTree.from_spec("6(4(3,5),7)")
 
         zag_zig_L = Text("0. Original Splay Tree, Zag-Zig(5)").scale(0.5).next_to(zag_zig_T, DOWN)
         zag_zig_L.set_color(redC)
@@ -403,42 +811,31 @@ class SplayTreePresentation(Slide, Scene):
         self.next_slide()
 
         # --- First Transformation: Replace original with Zag Rotation ---
-        zag_zig_Z = BinaryTree(6, level=0)
-        zag_zig_Z.left = BinaryTree(5, level=1)
-        zag_zig_Z.right = BinaryTree(7, level=1)
-        zag_zig_Z.left.left = BinaryTree(4, level=2)
-        zag_zig_Z.left.left.left = BinaryTree(3, level=3)
-        zag_zig_Z.arrange_subtrees()
-        zag_zig_Z.move_to(ORIGIN)
+        zag_zig_Z = BinaryTree.from_spec("6(5(4(3)),7)")
 
         zag_zig_ZLabel = Text("1. Zag Rotation(3)").scale(0.5).next_to(zag_zig_Z, DOWN)
         zag_zig_ZLabel.set_color(yellowC)
 
         zag_zig_ZGrp = VGroup(zag_zig_Z, zag_zig_ZLabel)
-        self.play(ReplacementTransform(zag_zig_grp, zag_zig_ZGrp))
+        self.play(TreeTransition(zag_zig_grp, zag_zig_ZGrp))
         self.next_slide()
         self.play(FadeOut(zag_zig_ZGrp))
 
         # --- Second Transformation: Replace Zag with Zig Rotation ---
-        zag_zig_ZG = BinaryTree(5, level=0)
-        zag_zig_ZG.left = BinaryTree(4, level=1)
-        zag_zig_ZG.right = BinaryTree(6, level=1)
-        zag_zig_ZG.left.left = BinaryTree(3, level=2)
-        zag_zig_ZG.right.right = BinaryTree(7, level=2)
-        zag_zig_ZG.arrange_subtrees()
-        zag_zig_ZG.move_to(ORIGIN)
+        zag_zig_ZG = BinaryTree.from_spec("5(4(3),6(,7))")
 
         zag_zig_ZGLabel = Text("2. Zig Rotation(6)").scale(0.5).next_to(zag_zig_ZG, DOWN)
         zag_zig_ZGLabel.set_color(greenC)
 
         zag_zig_ZG_Grp = VGroup(zag_zig_ZG, zag_zig_ZGLabel)
-        self.play(ReplacementTransform(zag_zig_ZGrp, zag_zig_ZG_Grp))
-        self.next_slide()
+        self.play(TreeTransition(zag_zig_ZGrp, zag_zig_ZG_Grp))
+        self.section_break()
         self.play(FadeOut(zag_zig_ZG_Grp), FadeOut(zag_zig_H))
 
 # -------------------------------------------------------------------------------------------------------------------------------------------
 # -------------------------------------------------------------------------------------------------------------------------------------------
 
+    def slide_solution(self):
         # === Solution Slide ===
         sol_header = Text("Solution").scale(0.8).to_edge(UP, buff=0.3)
         solution = BulletedList(
@@ -451,24 +848,19 @@ class SplayTreePresentation(Slide, Scene):
         solution.set_width(self.camera.frame_width * 0.9)
         sol_grp = VGroup(sol_header, solution)
         self.play(Write(sol_grp))
-        self.next_slide()
+        self.section_break()
         self.play(FadeOut(sol_grp))
 
-
 # -------------------------------------------------------------------------------------------------------------------------------------------
 # -------------------------------------------------------------------------------------------------------------------------------------------
+
+    def slide_search(self):
         # --- Search Slide ---
         search_H = Text("Splay Trees Method: Search()").scale(0.8).to_edge(UP, buff=0.3)
         self.play(Write(search_H))
 
         # Original tree
-        search_1 = BinaryTree(1, level=0)
-        search_1.left = BinaryTree(2, level=1)
-        search_1.right = BinaryTree(4, level=1)
-        search_1.right.left = BinaryTree(3, level=2)
-        search_1.right.right = BinaryTree(8, level=2)
-        search_1.arrange_subtrees()
-        search_1.move_to(ORIGIN)
+        search_1 = BinaryTree.from_spec("1(2,4(3,8))", check_order=False)
 
         search_1Label = Text("0. Original Splay Tree").scale(0.5).next_to(search_1, DOWN)
         search_1Label.set_color(redC)
@@ -478,53 +870,37 @@ class SplayTreePresentation(Slide, Scene):
         self.next_slide()
 
         # --- Replace Original with "Zig" ---
-        search_2 = BinaryTree(1, level=0)
-        search_2.left = BinaryTree(2, level=1)
-        search_2.right = BinaryTree(3, level=1)
-        search_2.right.right = BinaryTree(4, level=2)
-        search_2.right.right.right = BinaryTree(8, level=3)
-        search_2.arrange_subtrees()
-        search_2.move_to(ORIGIN)
+        search_2 = BinaryTree.from_spec("1(2,3(,4(,8)))", check_order=False)
 
         search_2Label = Text("1. Zig for Search(3)").scale(0.5).next_to(search_2, DOWN)
         search_2Label.set_color(yellowC)
 
         search_2grp = VGroup(search_2, search_2Label)
-        self.play(ReplacementTransform(search_1grp, search_2grp))
+        self.play(TreeTransition(search_1grp, search_2grp))
         self.next_slide()
 
         # --- Replace "Zig" with "Zag" ---
-        search_3 = BinaryTree(3, level=0)
-        search_3.left = BinaryTree(1, level=1)
-        search_3.right = BinaryTree(4, level=1)
-        search_3.left.left = BinaryTree(2, level=2)
-        search_3.right.right = BinaryTree(8, level=2)
-        search_3.arrange_subtrees()
-        search_3.move_to(ORIGIN)
+        search_3 = BinaryTree.from_spec("3(1(2),4(,8))", check_order=False)
 
         search_3Label = Text("2. Zag for Search(3)").scale(0.5).next_to(search_3, DOWN)
         search_3Label.set_color(greenC)
 
         search_3grp = VGroup(search_3, search_3Label)
-        self.play(ReplacementTransform(search_2grp, search_3grp))
-        self.next_slide()
+        self.play(TreeTransition(search_2grp, search_3grp))
+        self.section_break()
 
         self.play(FadeOut(search_3grp), FadeOut(search_H))
 
 # -------------------------------------------------------------------------------------------------------------------------------------------
 # -------------------------------------------------------------------------------------------------------------------------------------------
+
+    def slide_insert(self):
         # --- Insert Implementation ---
         insert_H = Text("Splay Trees Method: Insert()").scale(0.8).to_edge(UP, buff=0.3)
         self.play(Write(insert_H))
 
         # Original tree
-        insert_0 = BinaryTree(1, level=0)
-        insert_0.left = BinaryTree(2, level=1)
-        insert_0.right = BinaryTree(4, level=1)
-        insert_0.right.left = BinaryTree(3, level=2)
-        insert_0.right.right = BinaryTree(8, level=2)
-        insert_0.arrange_subtrees()
-        insert_0.move_to(ORIGIN)
+        insert_0 = BinaryTree.from_spec("1(2,4(3,8))", check_order=False)
 
         insert_0Label = Text("0. Original Splay Tree").scale(0.5).next_to(insert_0, DOWN)
         insert_0Label.set_color(WHITE)
@@ -534,71 +910,47 @@ class SplayTreePresentation(Slide, Scene):
         self.next_slide()
 
         # Replace Original with Insert(0)
-        insert_1 = BinaryTree(1, level=0)
-        insert_1.left = BinaryTree(2, level=1)
-        insert_1.right = BinaryTree(4, level=1)
-        insert_1.left.left = BinaryTree(0, level=2)
-        insert_1.right.left = BinaryTree(3, level=2)
-        insert_1.right.right = BinaryTree(8, level=2)
-        insert_1.arrange_subtrees()
-        insert_1.move_to(ORIGIN)
+        insert_1 = BinaryTree.from_spec("1(2(0),4(3,8))", check_order=False)
 
         insert_1Label = Text("1. Insert(0)").scale(0.5).next_to(insert_1, DOWN)
         insert_1Label.set_color(redC)
 
         insert_1grp = VGroup(insert_1, insert_1Label)
-        self.play(ReplacementTransform(insert_0grp, insert_1grp))
+        self.play(TreeTransition(insert_0grp, insert_1grp))
         self.next_slide()
 
         # Replace with Zig 1 state
-        insert_2 = BinaryTree(2, level=0)
-        insert_2.left = BinaryTree(0, level=1)
-        insert_2.right = BinaryTree(1, level=1)
-        insert_2.right.left = BinaryTree(3, level=2)
-        insert_2.right.right = BinaryTree(4, level=2)
-        insert_2.right.right.right = BinaryTree(8, level=2)
-        insert_2.arrange_subtrees()
-        insert_2.move_to(ORIGIN)
+        insert_2 = BinaryTree.from_spec("2(0,1(3,4(,8)))", check_order=False)
 
         insert_2Label = Text("2. Zig, Insert(0)").scale(0.5).next_to(insert_2, DOWN)
         insert_2Label.set_color(yellowC)
 
         insert_2grp = VGroup(insert_2, insert_2Label)
-        self.play(ReplacementTransform(insert_1grp, insert_2grp))
+        self.play(TreeTransition(insert_1grp, insert_2grp))
         self.next_slide()
 
         # Replace with Zig 2 state (final tree)
-        insert_3 = BinaryTree(0, level=0)
-        insert_3.right = BinaryTree(2, level=1)
-        insert_3.right.right = BinaryTree(1, level=2)
-        insert_3.right.right.left = BinaryTree(3, level=3)
-        insert_3.right.right.right = BinaryTree(4, level=3)
-        insert_3.right.right.right.right = BinaryTree(8, level=4)
-        insert_3.arrange_subtrees()
-        insert_3.move_to(ORIGIN)
+        insert_3 = BinaryTree.from_spec("0(,2(,1(3,4(,8))))", check_order=False)
 
         insert_3Label = Text("3. Zig, Insert(0)").scale(0.5).next_to(insert_3, DOWN)
         insert_3Label.set_color(greenC)
 
         insert_3grp = VGroup(insert_3, insert_3Label)
-        self.play(ReplacementTransform(insert_2grp, insert_3grp))
-        self.next_slide()
+        self.play(TreeTransition(insert_2grp, insert_3grp))
+        self.section_break()
 
         self.play(FadeOut(insert_3grp), FadeOut(insert_H))
+
 # -------------------------------------------------------------------------------------------------------------------------------------------
 # -------------------------------------------------------------------------------------------------------------------------------------------
+
+    def slide_delete(self):
         # --- Delete Implementation ---
         delete_H = Text("Splay Trees Method: Delete()").scale(0.8).to_edge(UP, buff=0.3)
         self.play(Write(delete_H))
 
         # Original tree
-        delete_1 = BinaryTree(1, level=0)
-        delete_1.left = BinaryTree(2, level=1)
-        delete_1.right = BinaryTree(4, level=1)
-        delete_1.right.left = BinaryTree(3, level=2)
-        delete_1.right.right = BinaryTree(8, level=2)
-        delete_1.arrange_subtrees()
-        delete_1.move_to(ORIGIN)
+        delete_1 = BinaryTree.from_spec("1(2,4(3,8))", check_order=False)
 
         delete_1Label = Text("0. Original Splay Tree").scale(0.5).next_to(delete_1, DOWN)
         delete_1Label.set_color(redC)
@@ -608,40 +960,30 @@ class SplayTreePresentation(Slide, Scene):
         self.next_slide()
 
         # --- Replace Original with Delete(3) state ---
-        delete_2 = BinaryTree(1, level=0)
-        delete_2.left = BinaryTree(2, level=1)
-        delete_2.right = BinaryTree(4, level=1)
-        delete_2.right.right = BinaryTree(8, level=2)
-        delete_2.arrange_subtrees()
-        delete_2.move_to(ORIGIN)
+        delete_2 = BinaryTree.from_spec("1(2,4(,8))", check_order=False)
 
         delete_2Label = Text("1. Delete(3)").scale(0.5).next_to(delete_2, DOWN)
         delete_2Label.set_color(yellowC)
 
         delete_2grp = VGroup(delete_2, delete_2Label)
-        self.play(ReplacementTransform(delete_1grp, delete_2grp))
+        self.play(TreeTransition(delete_1grp, delete_2grp))
         self.next_slide()
 
         # --- Replace Delete(3) state with final Zag state ---
-        delete_3 = BinaryTree(4, level=0)
-        delete_3.left = BinaryTree(1, level=1)
-        delete_3.right = BinaryTree(8, level=1)
-        delete_3.left.left = BinaryTree(2, level=2)
-        delete_3.arrange_subtrees()
-        delete_3.move_to(ORIGIN)
+        delete_3 = BinaryTree.from_spec("4(1(2),8)", check_order=False)
 
         delete_3Label = Text("2. Zag").scale(0.5).next_to(delete_3, DOWN)
         delete_3Label.set_color(greenC)
 
         delete_3grp = VGroup(delete_3, delete_3Label)
-        self.play(ReplacementTransform(delete_2grp, delete_3grp))
-        self.next_slide()
+        self.play(TreeTransition(delete_2grp, delete_3grp))
+        self.section_break()
 
         self.play(FadeOut(delete_3grp), FadeOut(delete_H))
 
-# -------------------------------------------------------------------------------------------------------------------------------------------
 # -------------------------------------------------------------------------------------------------------------------------------------------
 
+    def slide_variants(self):
         # === Variants and Optimizations Slide ===
         var_header = Text("Variants and Optimizations").scale(0.8).to_edge(UP, buff=0.3)
         variants = BulletedList(
@@ -653,9 +995,33 @@ class SplayTreePresentation(Slide, Scene):
         variants.set_width(self.camera.frame_width * 0.9)
         var_grp = VGroup(var_header, variants)
         self.play(Write(var_grp))
-        self.next_slide()
+        self.section_break()
         self.play(FadeOut(var_grp))
 
+# -------------------------------------------------------------------------------------------------------------------------------------------
+
+    def slide_variants_bench(self):
+        # === Measured Variants Slide (data from splay_bench.py) ===
+        path = os.environ.get("SPLAY_BENCH", os.path.join("bench", "variants.json"))
+        if not os.path.exists(path):
+            logger.info("No %s, skipping the variants chart; run splay_bench.py --out %s", path, path)
+            return
+        with open(path) as f:
+            results = json.load(f)
+        pattern = "zipf" if any(row["pattern"] == "zipf" for row in results) else results[0]["pattern"]
+        rows = [row for row in results if row["pattern"] == pattern]
+        bench_header = Text(f"Variants Measured: {pattern} accesses, n = {rows[0]['n']:,}").scale(0.6).to_edge(UP, buff=0.3)
+        charts = VGroup(
+            bench_chart(rows, "ops_per_sec", "Thousand ops/sec", 1e-3),
+            bench_chart(rows, "rotations_per_access", "Rotations per access"),
+        ).arrange(RIGHT, buff=1.0).next_to(bench_header, DOWN, buff=0.6)
+        self.play(Write(bench_header), FadeIn(charts))
+        self.section_break()
+        self.play(FadeOut(bench_header, charts))
+
+# -------------------------------------------------------------------------------------------------------------------------------------------
+
+    def slide_extensions(self):
         # === Extensions Slide ===
         ext_header = Text("Extensions to Other Data Structures").scale(0.8).to_edge(UP, buff=0.3)
         extensions = BulletedList(
@@ -666,9 +1032,12 @@ class SplayTreePresentation(Slide, Scene):
         extensions.set_width(self.camera.frame_width * 0.9)
         ext_grp = VGroup(ext_header, extensions)
         self.play(Write(ext_grp))
-        self.next_slide()
+        self.section_break()
         self.play(FadeOut(ext_grp))
 
+# -------------------------------------------------------------------------------------------------------------------------------------------
+
+    def slide_amortized(self):
         # === Amortized Analysis Slide ===
         am_header = Text("Amortized Complexity").scale(0.8).to_edge(UP, buff=0.3)
         analysis = BulletedList(
@@ -680,9 +1049,12 @@ class SplayTreePresentation(Slide, Scene):
         analysis.set_width(self.camera.frame_width * 0.9)
         am_grp = VGroup(am_header, analysis)
         self.play(Write(am_grp))
-        self.next_slide()
+        self.section_break()
         self.play(FadeOut(am_grp))
 
+# -------------------------------------------------------------------------------------------------------------------------------------------
+
+    def slide_conclusion(self):
         # === Conclusion Slide ===
         con_header = Text("Conclusion").scale(0.8).to_edge(UP, buff=0.3)
         conclusion = BulletedList(
@@ -695,10 +1067,296 @@ class SplayTreePresentation(Slide, Scene):
         conclusion.set_width(self.camera.frame_width * 0.9)
         con_grp = VGroup(con_header, conclusion)
         self.play(Write(con_grp))
-        self.next_slide()
+        self.section_break()
         self.play(FadeOut(con_grp))
 
+# -------------------------------------------------------------------------------------------------------------------------------------------
+
+    def slide_end(self):
         # === End Slide ===
         thanks = Text("We appreciate your support CS 3511 TA team. We couldn't have done it without you all!", font_size=32).scale(0.5)
         self.play(Write(thanks))
         self.next_slide()
+
+# -------------------------------------------------------------------------------------------------------------------------------------------
+# -------------------------------------------------------------------------------------------------------------------------------------------
+
+# Independently renderable sections, in deck order.  render_deck.py renders
+# them across a process pool and stitches them into one presentation.
+
+class IntroSection(SplayTreePresentation):
+    sections = ("title", "intro", "problem", "technical")
+
+class ZigSection(SplayTreePresentation):
+    sections = ("zig",)
+
+class ZagSection(SplayTreePresentation):
+    sections = ("zag",)
+
+class ZigZigSection(SplayTreePresentation):
+    sections = ("zig_zig",)
+
+class ZagZagSection(SplayTreePresentation):
+    sections = ("zag_zag",)
+
+class ZigZagSection(SplayTreePresentation):
+    sections = ("zig_zag",)
+
+class ZagZigSection(SplayTreePresentation):
+    sections = ("zag_zig",)
+
+class SolutionSection(SplayTreePresentation):
+    sections = ("solution",)
+
+class SearchSection(SplayTreePresentation):
+    sections = ("search",)
+
+class InsertSection(SplayTreePresentation):
+    sections = ("insert",)
+
+class DeleteSection(SplayTreePresentation):
+    sections = ("delete",)
+
+class AnalysisSection(SplayTreePresentation):
+    sections = ("variants", "variants_bench", "extensions", "amortized", "conclusion", "end")
+
+DECK_SECTIONS = [
+    IntroSection,
+    ZigSection,
+    ZagSection,
+    ZigZigSection,
+    ZagZagSection,
+    ZigZagSection,
+    ZagZigSection,
+    SolutionSection,
+    SearchSection,
+    InsertSection,
+    DeleteSection,
+    AnalysisSection,
+]
+
+# -------------------------------------------------------------------------------------------------------------------------------------------
+# -------------------------------------------------------------------------------------------------------------------------------------------
+
+class SplayTraceReplay(Slide, Scene):
+    # Streams a workload trace through the splay engine.  Configure with
+    # SPLAY_TRACE (file of "op key" lines), SPLAY_TRACE_EVERY (animate every
+    # Nth op, 0 for none) and SPLAY_TRACE_MIN_DEPTH (always animate splays
+    # at least this deep).  Without a trace file a random one is replayed.
+    def construct(self):
+        add_deck_background(self)
+        path = os.environ.get("SPLAY_TRACE")
+        ops = read_trace(path) if path else random_trace(2000, seed=RENDER_SEED)
+        every = int(os.environ.get("SPLAY_TRACE_EVERY", "50"))
+        min_depth = os.environ.get("SPLAY_TRACE_MIN_DEPTH")
+        self.play_trace(ops, every, int(min_depth) if min_depth else None)
+
+    def play_trace(self, ops, every=1, min_depth=None, run_time=0.8):
+        # Only the engine sees every operation; a BinaryTree is built just for
+        # the steps that get animated and dropped once the next one is shown
+        tree = SplayTree()
+        frame = ReplayFrame(self)
+        shown = None
+        for step, animate in budgeted(replay(tree, ops), every, min_depth):
+            if not animate:
+                continue
+            if tree.root is None:
+                if shown is not None:
+                    self.play(FadeOut(shown), run_time=run_time)
+                    shown = None
+                continue
+            state = frame.place(tree_state(tree, [step.key]))
+            caption = Text(
+                f"#{step.index + 1} {step.op}({step.key}) depth {step.depth}"
+            ).scale(0.5).to_edge(UP, buff=0.3)
+            state_grp = VGroup(state, caption)
+            if shown is None:
+                self.play(FadeIn(state_grp), run_time=run_time)
+            else:
+                self.play(TreeTransition(shown, state_grp), run_time=run_time)
+            shown = state_grp
+        self.next_slide()
+
+
+class SplayCostReplay(SplayTraceReplay):
+    # SplayTraceReplay on a PotentialSplayTree, with a running plot of
+    # actual against amortized cost next to the tree (same env settings)
+    def play_trace(self, ops, every=1, min_depth=None, run_time=0.8):
+        tree = PotentialSplayTree()
+        costs = []
+        depths = []
+
+        def measured():
+            # Access depth of each op, taken just before cost_stream applies it
+            for op, key in ops:
+                depths.append(access_depth(tree, op, key))
+                yield op, key
+
+        def steps():
+            for cost in cost_stream(tree, measured()):
+                costs.append(cost)
+                yield TraceStep(cost.index, cost.op, cost.key, cost.ok, (), depths[cost.index])
+
+        # Tree on the left 55% of the frame, plot on the right
+        width = self.camera.frame_width
+        frame = ReplayFrame(self, width=0.55, center=LEFT * (width * (0.5 - 0.55 / 2) - 0.4))
+        shown = None
+        for step, animate in budgeted(steps(), every, min_depth):
+            if not animate or tree.root is None:
+                continue
+            state = frame.place(tree_state(tree, [step.key]))
+            # The step's own cost, and the plot up to and including it
+            cost = costs[step.index]
+            plot = cost_plot(costs[:step.index + 1]).to_edge(RIGHT, buff=0.4)
+            caption = Text(
+                f"#{step.index + 1} {step.op}({step.key}) actual {cost.actual}"
+                f" amortized {cost.amortized:.1f} bound {cost.bound:.1f}"
+            ).scale(0.45).to_edge(UP, buff=0.3)
+            state_grp = VGroup(state, caption, plot)
+            if shown is None:
+                self.play(FadeIn(state_grp), run_time=run_time)
+            else:
+                self.play(TreeTransition(shown, state_grp), run_time=run_time)
+            shown = state_grp
+        self.next_slide()
+
+
+class SplayTreeSplitJoin(Slide, Scene):
+    # Split and join on a tree bulk-built from sorted keys.  SPLAY_SPLIT_KEYS
+    # sets the number of keys (default 15), SPLAY_SPLIT_AT the split key.
+    def construct(self):
+        add_deck_background(self)
+        n = int(os.environ.get("SPLAY_SPLIT_KEYS", "15"))
+        at = int(os.environ.get("SPLAY_SPLIT_AT", str(n // 3 + 1)))
+        tree = SplayTree.from_sorted(range(1, n + 1))
+
+        shown = self.fit(BinaryTree.from_snapshot(tree.snapshot()))
+        title = Text(f"from_sorted(1..{n})").scale(0.5).to_edge(UP, buff=0.3)
+        self.play(FadeIn(shown), FadeIn(title))
+        self.next_slide()
+
+        # Split: splay the last node on the search path, then cut one link
+        states = []
+        tree.on_rotate = lambda t: states.append(t.snapshot())
+        left, right = tree.split(at)
+        left.on_rotate = right.on_rotate = None
+        shown, title = self.show_states(shown, title, states, f"split({at}): splay")
+        split = self.fit(Forest(*self.trees(left, right), buff=1.5))
+        caption = Text(f"keys < {at}  |  keys >= {at}").scale(0.5).to_edge(UP, buff=0.3)
+        self.play(TreeTransition(VGroup(shown, title), VGroup(split, caption)))
+        shown, title = split, caption
+        self.next_slide()
+
+        # Join: splay the minimum of the right tree and the maximum of the
+        # left tree, then hang the right tree off it
+        states = []
+        right.on_rotate = lambda t: states.append((left.snapshot(), t.snapshot(), "join: splay min of right"))
+        left.on_rotate = lambda t: states.append((t.snapshot(), right.snapshot(), "join: splay max of left"))
+        joined = SplayTree.join(left, right)
+        left.on_rotate = right.on_rotate = None
+        for left_shape, right_shape, text in states:
+            state = self.fit(Forest(*self.trees(left_shape, right_shape), buff=1.5))
+            caption = Text(text).scale(0.5).to_edge(UP, buff=0.3)
+            self.play(TreeTransition(VGroup(shown, title), VGroup(state, caption)), run_time=0.6)
+            shown, title = state, caption
+        state = self.fit(BinaryTree.from_snapshot(joined.snapshot()))
+        caption = Text("join: link").scale(0.5).to_edge(UP, buff=0.3)
+        self.play(TreeTransition(VGroup(shown, title), VGroup(state, caption)))
+        self.next_slide()
+
+    def trees(self, *parts):
+        # BinaryTrees for the non-empty SplayTrees / snapshots in ``parts``
+        shapes = [p.snapshot() if isinstance(p, SplayTree) else p for p in parts]
+        return [BinaryTree.from_snapshot(shape) for shape in shapes if shape is not None]
+
+    def fit(self, mob):
+        return fit_to_frame(self, mob)
+
+    def show_states(self, shown, title, states, text):
+        for shape in states:
+            state = self.fit(BinaryTree.from_snapshot(shape))
+            caption = Text(text).scale(0.5).to_edge(UP, buff=0.3)
+            self.play(TreeTransition(VGroup(shown, title), VGroup(state, caption)), run_time=0.6)
+            shown, title = state, caption
+        return shown, title
+
+
+class LinkCutAccess(Slide, Scene):
+    # Preferred-path splaying in a link/cut tree: each auxiliary splay tree
+    # is drawn as a BinaryTree (in-order = top to bottom of its path), and
+    # every rotation of an access is one TreeTransition.  SPLAY_LCT_ACCESS
+    # lists the vertices to access, comma separated.
+    EDGES = [(2, 1), (3, 1), (4, 2), (5, 2), (6, 3), (7, 4), (8, 4), (9, 6), (10, 9), (11, 10)]
+
+    def construct(self):
+        add_deck_background(self)
+        forest = LinkCutTree(range(1, 12))
+        for child, parent in self.EDGES:
+            forest.link(child, parent)
+        forest.access(1)
+        accesses = os.environ.get("SPLAY_LCT_ACCESS", "11,8,5")
+
+        shown = self.paths(forest)
+        title = Text("Preferred paths").scale(0.5).to_edge(UP, buff=0.3)
+        self.play(FadeIn(shown), FadeIn(title))
+        self.next_slide()
+
+        for key in (int(k) for k in accesses.split(",")):
+            states = []
+            forest.on_rotate = lambda f: states.append(self.paths(f))
+            forest.access(key)
+            forest.on_rotate = None
+            states.append(self.paths(forest))
+            caption = Text(f"access({key})").scale(0.5).to_edge(UP, buff=0.3)
+            for state in states:
+                label = caption.copy()
+                self.play(TreeTransition(VGroup(shown, title), VGroup(state, label)), run_time=0.6)
+                shown, title = state, label
+            self.next_slide()
+
+    def paths(self, forest):
+        trees = [BinaryTree.from_snapshot(shape) for shape in forest.aux_trees()]
+        return fit_to_frame(self, Forest(*trees, buff=0.8))
+
+
+class SplayTreeLOD(Slide, Scene):
+    # Level-of-detail view of a big size-augmented tree (SPLAY_LOD_KEYS,
+    # default 100000): each access is shown with its search path expanded,
+    # then again after splaying, so regions open and close as keys move.
+    # SPLAY_LOD_ACCESSES sets how many random keys are accessed.
+    def construct(self):
+        add_deck_background(self)
+        n = int(os.environ.get("SPLAY_LOD_KEYS", "100000"))
+        accesses = int(os.environ.get("SPLAY_LOD_ACCESSES", "6"))
+        tree = SizedSplayTree.from_sorted(range(n))
+        rng = random.Random(RENDER_SEED)
+
+        # Every state is built first so one scale fits them all
+        states = [tree_state(tree)]
+        steps = []
+        for _ in range(accesses):
+            key = rng.randrange(n)
+            depth = tree.depth(key)
+            before = tree_state(tree, [key])
+            tree.search(key)
+            after = tree_state(tree, [key])
+            states += [before, after]
+            steps.append((key, depth, before, after))
+        frame = ReplayFrame(self)
+        for state in states:
+            frame.reserve(state)
+
+        shown = frame.place(states[0])
+        title = Text(f"{n:,} keys").scale(0.5).to_edge(UP, buff=0.3)
+        self.play(FadeIn(shown), FadeIn(title))
+        self.next_slide()
+
+        for key, depth, before, after in steps:
+            frame.place(before)
+            caption = Text(f"search({key}): depth {depth}").scale(0.5).to_edge(UP, buff=0.3)
+            self.play(TreeTransition(VGroup(shown, title), VGroup(before, caption)), run_time=0.8)
+            frame.place(after)
+            label = Text(f"search({key}): splayed").scale(0.5).to_edge(UP, buff=0.3)
+            self.play(TreeTransition(VGroup(before, caption), VGroup(after, label)), run_time=0.8)
+            shown, title = after, label
+            self.next_slide()
@@ -0,0 +1,54 @@
+from collections import OrderedDict
+
+
+class TemplateCache:
+    """Bounded LRU cache of prebuilt templates keyed by (label, font, style).
+
+    ``get`` returns the shared template; callers copy it before use so the
+    cached object is never mutated.
+    """
+
+    def __init__(self, maxsize=1024):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self._items = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def get(self, key, build):
+        items = self._items
+        template = items.get(key)
+        if template is not None:
+            items.move_to_end(key)
+            self.hits += 1
+            return template
+        self.misses += 1
+        template = build()
+        items[key] = template
+        if len(items) > self.maxsize:
+            items.popitem(last=False)
+            self.evictions += 1
+        return template
+
+    def clear(self):
+        self._items.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._items),
+            "maxsize": self.maxsize,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,273 @@
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import sys
+import time
+from collections import namedtuple
+
+from preview import render_svg
+from splay_bench import PATTERNS, build
+from splay_tree import Shape, SplayTree
+from tree_layout import tidy_layout
+from workload_trace import random_trace
+
+# Performance regression suite.  Two halves:
+#
+#   render  tree sizes 7..10k, balanced and fully skewed (a right spine like
+#           the insert_3 slide): tidy_layout and the headless SVG frame, and
+#           with manim installed BinaryTree construction, arrange_subtrees,
+#           one HoloDriver updater pass and one camera raster per frame
+#   splay   SplayTree searches per second for every splay_bench access
+#           pattern, plus a mixed search/insert/delete trace
+#
+#   python perf_suite.py                        # run, compare with the baseline
+#   python perf_suite.py --save-baseline        # accept the current numbers
+#   python perf_suite.py --quick --only splay   # small sizes, one half
+#   python perf_suite.py --deck                 # also time each deck section
+#
+# Every case is timed best-of-N with the garbage collector off.  Results go
+# to --out as JSON; if the baseline file exists every case present in both
+# is compared.  Cases slower by more than --threshold (and by more than
+# --floor seconds, so microsecond cases do not flap) are measured once more,
+# and any still slower are reported with exit status 1.  Baselines are per
+# machine: save one before changing code.
+
+SIZES = (7, 63, 511, 4095, 10_000)
+QUICK_SIZES = (7, 63, 511)
+SHAPES = ("balanced", "skewed")
+FRAME_DT = 1 / 60
+
+
+def balanced_shape(n):
+    return SplayTree.from_sorted(range(n)).snapshot()
+
+
+def skewed_shape(n):
+    shape = None
+    for key in reversed(range(n)):
+        shape = Shape(key, None, shape)
+    return shape
+
+
+SHAPE_BUILDERS = {"balanced": balanced_shape, "skewed": skewed_shape}
+
+# ``row`` is the case's JSON record without the timing
+Case = namedtuple("Case", ["row", "run", "setup", "repeat", "budget"])
+
+
+def best_of(run, setup=None, repeat=5, budget=2.0):
+    # Fastest of up to ``repeat`` timed calls of run(setup()), with the
+    # garbage collector off like timeit; stops early once ``budget``
+    # seconds are spent, after at least one call
+    best = float("inf")
+    spent = 0.0
+    for _ in range(repeat):
+        arg = setup() if setup is not None else None
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            run(arg)
+            elapsed = time.perf_counter() - start
+        finally:
+            gc.enable()
+        best = min(best, elapsed)
+        spent += elapsed
+        if spent > budget:
+            break
+    return best
+
+
+def load_deck():
+    try:
+        import main
+    except ImportError as e:
+        print(f"render: manim cases skipped ({e})", file=sys.stderr)
+        return None
+    return main
+
+
+def render_cases(sizes, deck):
+    cases = []
+    for shape_name in SHAPES:
+        for n in sizes:
+            shape = SHAPE_BUILDERS[shape_name](n)
+            runs = {
+                "layout": (lambda _, shape=shape: tidy_layout(shape), None),
+                "svg": (lambda _, shape=shape: render_svg(shape), None),
+            }
+            if deck is not None:
+                runs.update(manim_cases(deck, shape))
+            for case, (run, setup) in runs.items():
+                row = {"name": f"render/{case}/{shape_name}/{n}", "group": "render",
+                       "case": case, "shape": shape_name, "n": n}
+                cases.append(Case(row, run, setup, 20, 1.0))
+    return cases
+
+
+def manim_cases(deck, shape):
+    # (run, setup) pairs; setup builds what run needs outside the timing
+    def arranged(_=None):
+        tree = deck.BinaryTree.from_shape(shape)
+        tree.arrange_subtrees()
+        return tree
+
+    def scene(_=None):
+        stage = deck.Scene()
+        stage.add(arranged())
+        deck.HoloDriver().attach(stage)
+        return stage
+
+    def raster(stage):
+        camera = stage.renderer.camera
+        camera.capture_mobjects(stage.mobjects)
+        camera.reset()
+
+    return {
+        "build": (lambda _: deck.BinaryTree.from_shape(shape), None),
+        "arrange": (lambda tree: tree.arrange_subtrees(), arranged),
+        "update": (lambda stage: stage.update_self(FRAME_DT), scene),
+        "raster": (raster, scene),
+    }
+
+
+def deck_cases(deck):
+    from render_deck import render_section
+
+    return [
+        Case({"name": f"deck/{section.__name__}", "group": "deck", "case": section.__name__},
+             lambda _, name=section.__name__: render_section(name, "l"), None, 1, 0.0)
+        for section in deck.DECK_SECTIONS
+    ]
+
+
+def splay_cases(n, m, seed=0):
+    workloads = {name: PATTERNS[name](n, m, random.Random(seed)) for name in PATTERNS}
+    workloads["mixed"] = list(random_trace(m, key_range=2 * n, seed=seed))
+
+    def fresh(_=None):
+        return build(SplayTree, n, seed)
+
+    cases = []
+    for name, workload in workloads.items():
+        if name == "mixed":
+            def run(tree, ops=workload):
+                for op, key in ops:
+                    getattr(tree, op)(key)
+        else:
+            def run(tree, keys=workload):
+                search = tree.search
+                for key in keys:
+                    search(key)
+        row = {"name": f"splay/{name}", "group": "splay", "case": name, "n": n, "m": m}
+        cases.append(Case(row, run, fresh, 5, 5.0))
+    return cases
+
+
+def measure(case):
+    row = dict(case.row, seconds=best_of(case.run, case.setup, case.repeat, case.budget))
+    if "m" in row:
+        row["ops_per_sec"] = row["m"] / row["seconds"] if row["seconds"] else float("inf")
+        print(f"{row['name']:<32} {row['ops_per_sec']:>12,.0f} ops/s", flush=True)
+    else:
+        print(f"{row['name']:<32} {row['seconds'] * 1000:>12.3f} ms", flush=True)
+    return row
+
+
+def compare(results, baseline, threshold, floor):
+    """Cases slower than the baseline by more than ``threshold`` (a
+    fraction) and ``floor`` seconds, as ``(name, old, new)``."""
+    old = {row["name"]: row["seconds"] for row in baseline["results"]}
+    regressions = []
+    for row in results:
+        before = old.get(row["name"])
+        if before is None:
+            continue
+        now = row["seconds"]
+        if now > before * (1 + threshold) and now - before > floor:
+            regressions.append((row["name"], before, now))
+    return regressions
+
+
+def machine():
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render and splay benchmarks with regression tracking.")
+    parser.add_argument("--only", choices=("render", "splay"), help="run one half")
+    parser.add_argument("--quick", action="store_true", help="sizes up to 511 and fewer operations")
+    parser.add_argument("--deck", action="store_true", help="also render each deck section at low quality")
+    parser.add_argument("-n", type=int, default=None, help="keys in the splay tree (default 20000, quick 5000)")
+    parser.add_argument("-m", type=int, default=None, help="operations per pattern (default 100000, quick 20000)")
+    parser.add_argument("--out", default="bench/perf.json")
+    parser.add_argument("--baseline", default="bench/perf_baseline.json")
+    parser.add_argument("--save-baseline", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown, 0.25 = 25%%")
+    parser.add_argument("--floor", type=float, default=5e-4, help="ignore slowdowns below this many seconds")
+    args = parser.parse_args(argv)
+
+    n = args.n or (5_000 if args.quick else 20_000)
+    m = args.m or (20_000 if args.quick else 100_000)
+    cases = []
+    deck = load_deck() if args.only != "splay" else None
+    if args.only != "splay":
+        cases += render_cases(QUICK_SIZES if args.quick else SIZES, deck)
+        if args.deck and deck is not None:
+            cases += deck_cases(deck)
+    if args.only != "render":
+        cases += splay_cases(n, m)
+    results = [measure(case) for case in cases]
+
+    report = {"machine": machine(), "created": time.strftime("%Y-%m-%dT%H:%M:%S"), "results": results}
+    for path in (args.out, args.baseline if args.save_baseline else None):
+        if path:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            with open(path, "w") as f:
+                json.dump(report, f, indent=2)
+    if args.save_baseline:
+        print(f"baseline saved to {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"no baseline at {args.baseline}; run with --save-baseline to create one")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if baseline.get("machine") != report["machine"]:
+        print("warning: baseline was recorded on a different machine or Python", file=sys.stderr)
+    regressions = compare(results, baseline, args.threshold, args.floor)
+    if regressions:
+        # One more measurement of each suspect, keeping the faster, so a
+        # burst of load on the machine does not fail the run
+        print(f"re-measuring {len(regressions)} slower case(s)")
+        suspects = {name for name, _, _ in regressions}
+        for i, case in enumerate(cases):
+            if case.row["name"] in suspects:
+                again = measure(case)
+                if again["seconds"] < results[i]["seconds"]:
+                    results[i] = again
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+        regressions = compare(results, baseline, args.threshold, args.floor)
+    compared = len({row["name"] for row in baseline["results"]} & {row["name"] for row in results})
+    if not regressions:
+        print(f"no regressions in {compared} case(s) (threshold {args.threshold:.0%})")
+        return 0
+    print(f"\nREGRESSIONS: {len(regressions)} of {compared} case(s) slower than the baseline by more than {args.threshold:.0%}")
+    for name, before, now in regressions:
+        print(f"  {name:<32} {before * 1000:>10.3f} ms -> {now * 1000:>10.3f} ms  ({now / before - 1:+.0%})")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,273 @@
+import argparse
+import ast
+import hashlib
+import os
+import sys
+import time
+from xml.sax.saxutils import escape
+
+import numpy as np
+
+from splay_tree import ShapeForest, SplayTree, splay_states
+from tree_layout import tidy_layout
+from tree_lod import Summary
+from tree_spec import format_tree_spec, parse_key, parse_tree_spec
+
+# Headless previews of tree states: SVG straight from tidy_layout, no manim,
+# Pango, Cairo or ffmpeg.  Boxes, edges and spacing match BinaryTree's.
+#
+#   python preview.py slides                    # every spec tree in main.py
+#   python preview.py slides zig zag --watch    # re-render on change
+#   python preview.py spec "6(4(3,5),7)"
+#   python preview.py steps "6(4(3,5),7)" search 3
+#
+# Slide trees are found by reading main.py's slide_<name> methods for
+# BinaryTree.from_spec("...") calls, so only spec-built trees preview.
+# --png needs cairosvg.
+
+SCALE = 60  # pixels per manim unit
+MARGIN = 0.8
+SIBLING_SEP = 3.0 * 0.55
+LEVEL_SEP = 1.5
+NODE_W, NODE_H = 1.0, 0.7
+FOREST_GAP = NODE_W + 1.0  # Forest(buff=1.0) in main.py
+BACKGROUND = ("#00002b", "#13003d", "#210051")
+NODE_FILL = "#0009FF"
+EDGE = "#BBBBBB"
+FOCUS = "#fefe00"
+
+
+def layout(shape):
+    # tidy_layout of one tree, or of every tree of a ShapeForest side by
+    # side with their roots level; parents are -1 for each root
+    trees = shape.trees if isinstance(shape, ShapeForest) else (shape,)
+    nodes, parents, blocks = [], [], []
+    for tree in trees:
+        if tree is None:
+            continue
+        tree_nodes, tree_parents, positions = tidy_layout(tree, sibling_sep=SIBLING_SEP, level_sep=LEVEL_SEP)
+        if blocks:
+            positions[:, 0] += blocks[-1][:, 0].max() + FOREST_GAP - positions[:, 0].min()
+        parents += [p + len(nodes) if p >= 0 else -1 for p in tree_parents]
+        nodes += tree_nodes
+        blocks.append(positions)
+    return nodes, parents, np.concatenate(blocks) if blocks else np.zeros((0, 3))
+
+
+def state_spec(shape):
+    # Title text for a state: its spec, forests joined by " | "
+    if isinstance(shape, ShapeForest):
+        return " | ".join(state_spec(tree) for tree in shape.trees)
+    return format_tree_spec(shape) if shape is not None else "empty"
+
+
+def render_svg(shape, title=None, focus=()):
+    """SVG for a Shape (or any node with key/left/right) or a ShapeForest;
+    ``focus`` keys get a highlighted outline.  Summary leaves draw as
+    triangles."""
+    nodes, parents, positions = layout(shape)
+    if len(nodes):
+        xs, ys = positions[:, 0], positions[:, 1]
+        left, right = xs.min() - NODE_W / 2 - MARGIN, xs.max() + NODE_W / 2 + MARGIN
+        top, bottom = ys.max() + NODE_H / 2 + MARGIN, ys.min() - NODE_H / 2 - MARGIN
+    else:
+        left, right, top, bottom = -2.0, 2.0, 1.0, -1.0
+    if title:
+        top += 0.6
+    width, height = (right - left) * SCALE, (top - bottom) * SCALE
+
+    def px(x, y):
+        return (x - left) * SCALE, (top - y) * SCALE
+
+    out = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width:.0f}" height="{height:.0f}"'
+        f' viewBox="0 0 {width:.1f} {height:.1f}">',
+        '<defs><linearGradient id="bg" x1="0" y1="0" x2="1" y2="1">'
+        + "".join(f'<stop offset="{i / 2:.1f}" stop-color="{c}"/>' for i, c in enumerate(BACKGROUND))
+        + "</linearGradient></defs>",
+        f'<rect width="{width:.1f}" height="{height:.1f}" fill="url(#bg)"/>',
+    ]
+    if title:
+        out.append(
+            f'<text x="{width / 2:.1f}" y="{0.55 * SCALE:.1f}" fill="white" font-family="sans-serif"'
+            f' font-size="{0.35 * SCALE:.0f}" text-anchor="middle">{escape(title)}</text>'
+        )
+    focus = set(focus)
+    # Edges first, same anchor points as BinaryTree.arrange_subtrees
+    for i, parent in enumerate(parents):
+        if parent < 0:
+            continue
+        (x0, y0), (x1, y1) = positions[parent][:2], positions[i][:2]
+        if nodes[i] is nodes[parent].right:
+            start, end = (x0 + 0.25, y0 - NODE_H / 2), (x1 - NODE_W / 2, y1 + 0.25)
+        else:
+            start, end = (x0 - 0.25, y0 - NODE_H / 2), (x1 + 0.25, y1 + NODE_H / 2)
+        (a, b), (c, d) = px(*start), px(*end)
+        out.append(f'<line x1="{a:.1f}" y1="{b:.1f}" x2="{c:.1f}" y2="{d:.1f}" stroke="{EDGE}" stroke-width="2"/>')
+    for node, (x, y, _) in zip(nodes, positions):
+        cx, cy = px(x, y)
+        w, h = NODE_W * SCALE, NODE_H * SCALE
+        if isinstance(node, Summary):
+            points = f"{cx:.1f},{cy - h / 2:.1f} {cx - w / 2:.1f},{cy + h / 2:.1f} {cx + w / 2:.1f},{cy + h / 2:.1f}"
+            out.append(f'<polygon points="{points}" fill="{NODE_FILL}" fill-opacity="0.35" stroke="{EDGE}"/>')
+            label, size = f"{node.size} h{node.height}", 0.18
+        else:
+            stroke = FOCUS if node.key in focus else NODE_FILL
+            out.append(
+                f'<circle cx="{cx:.1f}" cy="{cy:.1f}" r="{0.5 * SCALE:.1f}" fill="{NODE_FILL}" fill-opacity="0.3"/>'
+                f'<rect x="{cx - w / 2:.1f}" y="{cy - h / 2:.1f}" width="{w:.1f}" height="{h:.1f}"'
+                f' rx="{0.15 * SCALE:.1f}" fill="{NODE_FILL}" stroke="{stroke}" stroke-width="3"/>'
+            )
+            label, size = str(node.key), 0.4
+        out.append(
+            f'<text x="{cx:.1f}" y="{cy:.1f}" fill="white" font-family="sans-serif" font-weight="bold"'
+            f' font-size="{size * SCALE:.0f}" text-anchor="middle" dominant-baseline="central">{escape(label)}</text>'
+        )
+    out.append("</svg>")
+    return "\n".join(out)
+
+
+def write_frame(svg, path, png=False):
+    if png:
+        try:
+            import cairosvg
+        except ImportError:
+            raise RuntimeError("--png needs cairosvg (pip install cairosvg)") from None
+        path = os.path.splitext(path)[0] + ".png"
+        cairosvg.svg2png(bytestring=svg.encode(), write_to=path)
+    else:
+        with open(path, "w") as f:
+            f.write(svg)
+    return path
+
+
+def slide_specs(path="main.py"):
+    """``{slide name: [(variable, spec, check_order), ...]}`` for every
+    ``BinaryTree.from_spec("...")`` call in the deck's slide methods."""
+    with open(path) as f:
+        module = ast.parse(f.read(), path)
+    slides = {}
+    for cls in module.body:
+        if not (isinstance(cls, ast.ClassDef) and cls.name == "SplayTreePresentation"):
+            continue
+        for method in cls.body:
+            if not (isinstance(method, ast.FunctionDef) and method.name.startswith("slide_")):
+                continue
+            specs = []
+            for node in ast.walk(method):
+                if not (isinstance(node, ast.Assign) and isinstance(node.value, ast.Call)):
+                    continue
+                call = node.value
+                if (isinstance(call.func, ast.Attribute) and call.func.attr == "from_spec"
+                        and call.args and isinstance(call.args[0], ast.Constant)):
+                    target = node.targets[0]
+                    name = target.id if isinstance(target, ast.Name) else "tree"
+                    # Mid-rotation states pass check_order=False
+                    check_order = True
+                    for kw in call.keywords:
+                        if kw.arg == "check_order" and isinstance(kw.value, ast.Constant):
+                            check_order = bool(kw.value.value)
+                    specs.append((node.lineno, name, call.args[0].value, check_order))
+            if specs:
+                slides[method.name[len("slide_"):]] = [spec[1:] for spec in sorted(specs)]
+    return slides
+
+
+def render_slides(names=None, out="preview", png=False, deck="main.py", previous=None):
+    """Render the spec trees of the named slides (all by default); slides
+    whose specs equal ``previous[name]`` are skipped.  Returns the specs."""
+    slides = slide_specs(deck)
+    unknown = set(names or ()) - set(slides)
+    if unknown:
+        raise SystemExit(f"no spec trees in slide(s): {', '.join(sorted(unknown))}")
+    os.makedirs(out, exist_ok=True)
+    for name in names or slides:
+        specs = slides[name]
+        if previous is not None and previous.get(name) == specs:
+            continue
+        start = time.perf_counter()
+        for i, (variable, spec, check_order) in enumerate(specs):
+            svg = render_svg(parse_tree_spec(spec, check_order), f"{name}: {variable}  {spec}")
+            write_frame(svg, os.path.join(out, f"{name}_{i:02d}.svg"), png)
+        print(f"{name}: {len(specs)} frame(s) in {(time.perf_counter() - start) * 1000:.1f} ms", flush=True)
+    return slides
+
+
+def render_steps(spec, op, key, out="preview", png=False):
+    """One frame per single rotation of ``op(key)`` on the tree ``spec``,
+    then one of the tree it leaves."""
+    tree = SplayTree.from_shape(parse_tree_spec(spec))
+    os.makedirs(out, exist_ok=True)
+    frames = [(spec, tree.snapshot())]
+    ok, rotations, states = splay_states(tree, op, key)
+    for i, state in enumerate(states, 1):
+        frames.append((f"{op}({key}) step {i}: {state_spec(state)}", state))
+    paths = []
+    for i, (title, shape) in enumerate(frames):
+        paths.append(write_frame(render_svg(shape, title, focus=[key]), os.path.join(out, f"step_{i:02d}.svg"), png))
+    steps = " ".join(r.step for r in rotations) or "none"
+    print(f"{op}({key}) -> {ok}, rotations: {steps}; {len(paths)} frame(s) in {out}/")
+    return paths
+
+
+def watch(names, out, png, deck, interval=0.3):
+    # Poll the deck's mtime and content hash; only slides whose specs
+    # changed are rendered again
+    previous = render_slides(names, out, png, deck)
+    stamp = digest = None
+    while True:
+        time.sleep(interval)
+        try:
+            mtime = os.stat(deck).st_mtime
+        except FileNotFoundError:
+            continue
+        if mtime == stamp:
+            continue
+        stamp = mtime
+        with open(deck, "rb") as f:
+            new_digest = hashlib.sha1(f.read()).digest()
+        if new_digest == digest:
+            continue
+        digest = new_digest
+        try:
+            previous = render_slides(names, out, png, deck, previous)
+        except (SyntaxError, ValueError) as e:
+            print(f"skipped: {e}", flush=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless SVG/PNG previews of tree states.")
+    parser.add_argument("--out", default="preview", help="output directory")
+    parser.add_argument("--png", action="store_true", help="write PNG (needs cairosvg) instead of SVG")
+    sub = parser.add_subparsers(dest="command", required=True)
+    slides = sub.add_parser("slides", help="spec trees of the deck's slides")
+    slides.add_argument("names", nargs="*", help="slide names, e.g. zig zag_zig (default: all)")
+    slides.add_argument("--deck", default="main.py")
+    slides.add_argument("--watch", action="store_true", help="re-render changed slides on save")
+    spec = sub.add_parser("spec", help="one tree spec")
+    spec.add_argument("spec")
+    steps = sub.add_parser("steps", help="every rotation of one operation")
+    steps.add_argument("spec")
+    steps.add_argument("op", choices=("search", "insert", "delete"))
+    steps.add_argument("key")
+    args = parser.parse_args(argv)
+
+    if args.command == "slides":
+        if args.watch:
+            try:
+                watch(args.names, args.out, args.png, args.deck)
+            except KeyboardInterrupt:
+                pass
+        else:
+            render_slides(args.names, args.out, args.png, args.deck)
+    elif args.command == "spec":
+        os.makedirs(args.out, exist_ok=True)
+        path = write_frame(render_svg(parse_tree_spec(args.spec), args.spec), os.path.join(args.out, "spec.svg"), args.png)
+        print(path)
+    else:
+        render_steps(args.spec, args.op, parse_key(args.key), args.out, args.png)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
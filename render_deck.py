@@ -0,0 +1,90 @@
+import argparse
+import multiprocessing
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# Renders the section scenes of main.py concurrently, one manim render per
+# worker process, then stitches them into a single manim-slides presentation.
+#
+#   python render_deck.py                      # all sections, all cores
+#   python render_deck.py -q h --jobs 16 --out main.html
+#   python render_deck.py ZigSection SearchSection --no-convert
+
+QUALITIES = {
+    "l": "low_quality",
+    "m": "medium_quality",
+    "h": "high_quality",
+    "p": "production_quality",
+    "k": "fourk_quality",
+}
+
+
+def section_names():
+    import main
+    return [scene.__name__ for scene in main.DECK_SECTIONS]
+
+
+def render_section(name, quality):
+    # Runs inside a worker; manim's config is per process so sections
+    # never share render state.
+    from manim import tempconfig
+    import main
+
+    start = time.perf_counter()
+    with tempconfig({"quality": QUALITIES[quality]}):
+        getattr(main, name)().render()
+    return name, time.perf_counter() - start
+
+
+def render_sections(names, quality="h", jobs=None):
+    jobs = jobs or os.cpu_count() or 1
+    timings = {}
+    # "spawn" keeps Cairo/Pango state out of forked children
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=min(jobs, len(names)), mp_context=context) as pool:
+        futures = {pool.submit(render_section, name, quality): name for name in names}
+        for future in as_completed(futures):
+            name, elapsed = future.result()
+            timings[name] = elapsed
+            print(f"rendered {name} in {elapsed:.1f}s")
+    return timings
+
+
+def convert(names, out):
+    # manim-slides concatenates scenes in the order given, keeping every
+    # slide boundary of each scene
+    subprocess.run(["manim-slides", "convert", *names, out], check=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render the splay tree deck in parallel.")
+    parser.add_argument("sections", nargs="*", help="section scenes to render (default: whole deck)")
+    parser.add_argument("-q", "--quality", choices=sorted(QUALITIES), default="h")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--out", default="main.html", help="stitched presentation file")
+    parser.add_argument("--no-convert", action="store_true", help="render only, skip stitching")
+    args = parser.parse_args(argv)
+
+    deck = section_names()
+    names = args.sections or deck
+    unknown = [name for name in names if name not in deck]
+    if unknown:
+        parser.error(f"unknown section(s): {', '.join(unknown)}; choose from {', '.join(deck)}")
+    names = [name for name in deck if name in names]
+
+    start = time.perf_counter()
+    timings = render_sections(names, args.quality, args.jobs)
+    wall = time.perf_counter() - start
+    serial = sum(timings.values())
+    print(f"{len(names)} sections in {wall:.1f}s wall ({serial:.1f}s of work, {serial / wall:.1f}x)")
+
+    if not args.no_convert:
+        convert(names, args.out)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
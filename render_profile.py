@@ -0,0 +1,140 @@
+import csv
+import json
+import time
+from collections import OrderedDict
+
+# Profiling mode for slide scenes.  RenderProfiler wraps a scene instance's
+# play/next_slide, its updater passes, the camera's rasterizer and the movie
+# writer, and records per play call:
+#
+#   build    time since the previous play returned (constructing mobjects)
+#   update   mobject and scene updaters
+#   raster   camera.capture_mobjects
+#   encode   file_writer.write_frame
+#   other    the rest of play (hashing, interpolation, caching)
+#
+# plus live mobject and point counts.  Reports go to <prefix>.json and
+# <prefix>.csv, with a per-slide summary table.
+
+FIELDS = [
+    "play", "slide", "animations", "build", "update", "raster", "encode",
+    "other", "total", "mobjects", "points",
+]
+TIMERS = ("update", "raster", "encode")
+
+
+class RenderProfiler:
+    def __init__(self, scene, prefix="render_profile"):
+        self.scene = scene
+        self.prefix = prefix
+        self.records = []
+        self.slide = 0
+        self._timers = dict.fromkeys(TIMERS, 0.0)
+        self._last = None
+
+    def attach(self):
+        scene = self.scene
+        self._wrap(scene, "update_mobjects", "update")
+        self._wrap(scene, "update_self", "update")
+        renderer = scene.renderer
+        self._wrap(renderer.camera, "capture_mobjects", "raster")
+        self._wrap(renderer.file_writer, "write_frame", "encode")
+
+        play = scene.play
+        next_slide = getattr(scene, "next_slide", None)
+        tear_down = scene.tear_down
+
+        def profiled_play(*args, **kwargs):
+            self._play(play, args, kwargs)
+
+        def profiled_next_slide(*args, **kwargs):
+            self.slide += 1
+            return next_slide(*args, **kwargs)
+
+        def profiled_tear_down():
+            tear_down()
+            self.write()
+
+        scene.play = profiled_play
+        if next_slide is not None:
+            scene.next_slide = profiled_next_slide
+        scene.tear_down = profiled_tear_down
+        self._last = time.perf_counter()
+        return self
+
+    def _wrap(self, owner, name, timer):
+        original = getattr(owner, name, None)
+        if original is None:
+            return
+        timers = self._timers
+
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                timers[timer] += time.perf_counter() - start
+
+        setattr(owner, name, timed)
+
+    def _play(self, play, args, kwargs):
+        start = time.perf_counter()
+        build = start - self._last
+        family = self.scene.get_mobject_family_members()
+        mobjects = len(family)
+        points = sum(len(mob.points) for mob in family)
+        for timer in TIMERS:
+            self._timers[timer] = 0.0
+        try:
+            play(*args, **kwargs)
+        finally:
+            end = time.perf_counter()
+            total = end - start
+            spent = {timer: self._timers[timer] for timer in TIMERS}
+            self.records.append(OrderedDict(
+                play=len(self.records),
+                slide=self.slide,
+                animations=", ".join(type(anim).__name__ for anim in args),
+                build=build,
+                **spent,
+                other=max(total - sum(spent.values()), 0.0),
+                total=total,
+                mobjects=mobjects,
+                points=points,
+            ))
+            self._last = end
+
+    def slides(self):
+        """Per-slide totals, in slide order."""
+        totals = OrderedDict()
+        for record in self.records:
+            row = totals.setdefault(record["slide"], OrderedDict(
+                slide=record["slide"], plays=0, build=0.0, update=0.0, raster=0.0,
+                encode=0.0, other=0.0, total=0.0, mobjects=0, points=0,
+            ))
+            row["plays"] += 1
+            for key in ("build", "update", "raster", "encode", "other", "total"):
+                row[key] += record[key]
+            row["mobjects"] = max(row["mobjects"], record["mobjects"])
+            row["points"] = max(row["points"], record["points"])
+        return list(totals.values())
+
+    def summary(self):
+        header = f"{'slide':>5} {'plays':>5} {'build':>8} {'update':>8} {'raster':>8} {'encode':>8} {'other':>8} {'total':>8} {'mobjects':>9} {'points':>10}"
+        lines = [header, "-" * len(header)]
+        for row in self.slides():
+            lines.append(
+                f"{row['slide']:>5} {row['plays']:>5} {row['build']:>8.3f} {row['update']:>8.3f}"
+                f" {row['raster']:>8.3f} {row['encode']:>8.3f} {row['other']:>8.3f}"
+                f" {row['total']:>8.3f} {row['mobjects']:>9} {row['points']:>10}"
+            )
+        return "\n".join(lines)
+
+    def write(self):
+        with open(self.prefix + ".json", "w") as f:
+            json.dump({"plays": self.records, "slides": self.slides()}, f, indent=2)
+        with open(self.prefix + ".csv", "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=FIELDS)
+            writer.writeheader()
+            writer.writerows(self.records)
+        print(self.summary())
@@ -0,0 +1,303 @@
+import copy
+from collections import namedtuple
+
+# Implicit-key splay tree: a sequence (rope) ordered by position instead of
+# by key.  A node's index is the size of everything left of it in in-order,
+# so positions are found by walking subtree sizes and nothing is renumbered
+# when elements come or go.  Range operations split the range out into its
+# own subtree (two splays), work on its root in O(1) and join it back.
+#
+# Range reversal and range add are lazy: a node's tag means its own value,
+# aggregates and child order are already up to date and the tag is still
+# owed to its children.  Tags are pushed down on every walk from the root,
+# before any rotation touches the nodes below.
+
+RangeAggregate = namedtuple("RangeAggregate", ["sum", "min", "max", "length"])
+
+
+class SequenceNode:
+    __slots__ = ("value", "left", "right", "parent", "size", "sum", "min", "max", "flip", "add")
+
+    def __init__(self, value, parent=None):
+        self.value = value
+        self.left = None
+        self.right = None
+        self.parent = parent
+        self.size = 1
+        self.sum = value
+        self.min = value
+        self.max = value
+        self.flip = False
+        self.add = 0
+
+
+class SequenceSplayTree:
+    """Sequence of numbers with amortized O(log n) positional editing.
+
+    Indexing, ``insert``, ``delete_range``, ``split_at``/``concat``,
+    ``reverse``, ``add`` and ``aggregate`` (sum/min/max) all splay.
+    ``on_rotate`` (if set) is called after every single rotation, like
+    SplayTree's.
+    """
+
+    def __init__(self, values=(), on_rotate=None):
+        self.on_rotate = on_rotate
+        self.root = self._build(list(values))
+
+    def __len__(self):
+        return self.root.size if self.root is not None else 0
+
+    def __iter__(self):
+        push = self._push
+        stack = []
+        node = self.root
+        while stack or node is not None:
+            while node is not None:
+                push(node)
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node.value
+            node = node.right
+
+    def __repr__(self):
+        return f"{type(self).__name__}({list(self)!r})"
+
+    def _build(self, values):
+        # Balanced tree over values in linear time
+        def build(lo, hi, parent):
+            if lo >= hi:
+                return None
+            mid = (lo + hi) // 2
+            node = SequenceNode(values[mid], parent)
+            node.left = build(lo, mid, node)
+            node.right = build(mid + 1, hi, node)
+            self._update(node)
+            return node
+
+        return build(0, len(values), None)
+
+    # --- Lazy tags and aggregates ----------------------------------------
+
+    @staticmethod
+    def _apply(x, flip, delta):
+        if x is None:
+            return
+        if flip:
+            x.left, x.right = x.right, x.left
+            x.flip = not x.flip
+        if delta:
+            x.value += delta
+            x.sum += delta * x.size
+            x.min += delta
+            x.max += delta
+            x.add += delta
+
+    def _push(self, x):
+        if x.flip or x.add:
+            self._apply(x.left, x.flip, x.add)
+            self._apply(x.right, x.flip, x.add)
+            x.flip = False
+            x.add = 0
+
+    @staticmethod
+    def _update(x):
+        left, right = x.left, x.right
+        total = low = high = x.value
+        size = 1
+        if left is not None:
+            total += left.sum
+            low = min(low, left.min)
+            high = max(high, left.max)
+            size += left.size
+        if right is not None:
+            total += right.sum
+            low = min(low, right.min)
+            high = max(high, right.max)
+            size += right.size
+        x.sum, x.min, x.max, x.size = total, low, high, size
+
+    # --- Splaying --------------------------------------------------------
+
+    def _rotate(self, x):
+        p = x.parent
+        g = p.parent
+        if p.left is x:
+            b = x.right
+            p.left = b
+            x.right = p
+        else:
+            b = x.left
+            p.right = b
+            x.left = p
+        if b is not None:
+            b.parent = p
+        if g is not None:
+            if g.left is p:
+                g.left = x
+            else:
+                g.right = x
+        x.parent = g
+        p.parent = x
+        self._update(p)
+        self._update(x)
+        if self.on_rotate is not None:
+            self.on_rotate(self)
+
+    def _splay(self, x):
+        # Tags on x's root path must already be pushed (_select does that)
+        while x.parent is not None:
+            p = x.parent
+            g = p.parent
+            if g is None:
+                self._rotate(x)
+            elif (g.left is p) == (p.left is x):
+                self._rotate(p)
+                self._rotate(x)
+            else:
+                self._rotate(x)
+                self._rotate(x)
+        return x
+
+    def _select(self, root, i):
+        # Node at position i (0 <= i < size) under root, pushing tags on the way
+        x = root
+        while True:
+            self._push(x)
+            left = x.left.size if x.left is not None else 0
+            if i < left:
+                x = x.left
+            elif i > left:
+                i -= left + 1
+                x = x.right
+            else:
+                return x
+
+    def _split(self, root, i):
+        # (first i elements, the rest) as two detached roots
+        if root is None or i <= 0:
+            return None, root
+        if i >= root.size:
+            return root, None
+        x = self._splay(self._select(root, i))
+        left = x.left
+        x.left = None
+        left.parent = None
+        self._update(x)
+        return left, x
+
+    def _join(self, left, right):
+        if left is None:
+            return right
+        if right is None:
+            return left
+        x = self._splay(self._select(left, left.size - 1))
+        x.right = right
+        right.parent = x
+        self._update(x)
+        return x
+
+    def _index(self, i):
+        n = len(self)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("sequence index out of range")
+        return i
+
+    def _range(self, start, stop):
+        start, stop, _ = slice(start, stop).indices(len(self))
+        return start, max(start, stop)
+
+    def _isolate(self, start, stop):
+        # Roots of [0, start), [start, stop) and [stop, n)
+        left, rest = self._split(self.root, start)
+        middle, right = self._split(rest, stop - start)
+        return left, middle, right
+
+    def _rejoin(self, left, middle, right):
+        self.root = self._join(self._join(left, middle), right)
+
+    # --- Operations ------------------------------------------------------
+
+    def __getitem__(self, i):
+        self.root = self._splay(self._select(self.root, self._index(i)))
+        return self.root.value
+
+    def __setitem__(self, i, value):
+        x = self.root = self._splay(self._select(self.root, self._index(i)))
+        x.value = value
+        self._update(x)
+
+    def __delitem__(self, i):
+        i = self._index(i)
+        self.delete_range(i, i + 1)
+
+    def insert(self, i, value):
+        """Insert ``value`` before position ``i`` (clamped like list.insert)."""
+        n = len(self)
+        if i < 0:
+            i = max(0, i + n)
+        left, right = self._split(self.root, min(i, n))
+        node = SequenceNode(value)
+        node.left, node.right = left, right
+        if left is not None:
+            left.parent = node
+        if right is not None:
+            right.parent = node
+        self._update(node)
+        self.root = node
+
+    def append(self, value):
+        self.insert(len(self), value)
+
+    def extend(self, values):
+        self.root = self._join(self.root, self._build(list(values)))
+
+    def delete_range(self, start, stop):
+        """Remove positions ``[start, stop)`` and return them as a new sequence."""
+        left, middle, right = self._isolate(*self._range(start, stop))
+        self._rejoin(left, None, right)
+        return self._spawn(middle)
+
+    def _spawn(self, root):
+        # Empty-config copy of this sequence (same class and settings) over root
+        tree = copy.copy(self)
+        tree.root = root
+        return tree
+
+    def split_at(self, i):
+        """Split into ``(left, right)`` with the first ``i`` elements and
+        the rest.  This sequence is left empty."""
+        left, right = self._split(self.root, self._range(0, i)[1])
+        self.root = None
+        return self._spawn(left), self._spawn(right)
+
+    @classmethod
+    def concat(cls, left, right):
+        """Append ``right`` to ``left`` and return ``left``; ``right`` is emptied."""
+        left.root = left._join(left.root, right.root)
+        right.root = None
+        return left
+
+    def reverse(self, start=0, stop=None):
+        left, middle, right = self._isolate(*self._range(start, stop))
+        self._apply(middle, True, 0)
+        self._rejoin(left, middle, right)
+
+    def add(self, start, stop, delta):
+        """Add ``delta`` to every element in ``[start, stop)``."""
+        left, middle, right = self._isolate(*self._range(start, stop))
+        self._apply(middle, False, delta)
+        self._rejoin(left, middle, right)
+
+    def aggregate(self, start=0, stop=None):
+        """Sum/min/max/length of ``[start, stop)``; min and max are None
+        for an empty range."""
+        left, middle, right = self._isolate(*self._range(start, stop))
+        if middle is None:
+            result = RangeAggregate(0, None, None, 0)
+        else:
+            result = RangeAggregate(middle.sum, middle.min, middle.max, middle.size)
+        self._rejoin(left, middle, right)
+        return result
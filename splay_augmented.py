@@ -0,0 +1,259 @@
+import math
+from collections import namedtuple
+
+from splay_tree import SplayTree, rotation_count
+
+# Augmented splay trees.  Every node carries aggregates of its subtree that
+# _update recomputes from the two children, so a rotation (which only
+# changes the subtrees of x and its parent) costs O(1) extra and nothing
+# ever needs an in-order walk.
+#
+# PotentialSplayTree tracks the potential from the "Amortized Complexity"
+# slide, Phi = sum over nodes of r(v) = log2 w(v) where w(v) is the total
+# weight of v's subtree, and reports every operation's actual cost,
+# potential change and amortized cost against the access lemma bound
+# 3(r(root) - r(x)) + 1.
+
+Cost = namedtuple("Cost", [
+    "index", "op", "key", "ok", "actual", "potential_change", "amortized", "bound", "potential",
+])
+
+
+class SizedNode:
+    __slots__ = ("key", "left", "right", "parent", "size", "height", "weight", "total", "rank")
+
+    def __init__(self, key, parent=None, weight=1):
+        self.key = key
+        self.left = None
+        self.right = None
+        self.parent = parent
+        self.size = 1
+        self.height = 0
+        self.weight = weight
+        self.total = weight
+        # log2(total) as last counted in the tree's potential; 0 until then
+        self.rank = 0.0
+
+
+class SizedSplayTree(SplayTree):
+    """Splay tree whose nodes know their subtree size and height."""
+
+    node_class = SizedNode
+
+    def _update(self, node):
+        size = 1
+        height = 0
+        left, right = node.left, node.right
+        if left is not None:
+            size += left.size
+            height = left.height + 1
+        if right is not None:
+            size += right.size
+            if right.height >= height:
+                height = right.height + 1
+        node.size = size
+        node.height = height
+
+    def _update_path(self, node):
+        while node is not None:
+            self._update(node)
+            node = node.parent
+
+    def _size_of(self, node):
+        return 0 if node is None else node.size
+
+    # --- Order statistics ------------------------------------------------
+
+    def select(self, k):
+        """The ``k``-th smallest key (0-based, negative counts from the end)."""
+        n = self.root.size if self.root is not None else 0
+        if k < 0:
+            k += n
+        if not 0 <= k < n:
+            raise IndexError(f"select({k}) out of range for {n} keys")
+        node = self.root
+        while True:
+            left = node.left.size if node.left is not None else 0
+            if k < left:
+                node = node.left
+            elif k > left:
+                k -= left + 1
+                node = node.right
+            else:
+                break
+        self._splay(node)
+        return node.key
+
+    def rank(self, key):
+        """Number of keys smaller than ``key``."""
+        node = self.root
+        last = None
+        below = 0
+        while node is not None:
+            last = node
+            if node.key < key:
+                below += 1 + (node.left.size if node.left is not None else 0)
+                node = node.right
+            elif key < node.key:
+                node = node.left
+            else:
+                below += node.left.size if node.left is not None else 0
+                break
+        if last is not None:
+            self._splay(last)
+        return below
+
+    def count_range(self, lo, hi):
+        """Number of keys in ``[lo, hi)``."""
+        if not lo < hi:
+            return 0
+        return self.rank(hi) - self.rank(lo)
+
+
+class PotentialSplayTree(SizedSplayTree):
+    """Splay tree that keeps the total potential up to date per rotation.
+
+    ``weight`` maps a key to its (positive) weight when the key is inserted;
+    all weights are 1 by default, which makes w(v) the subtree size.  Use
+    ``measure(op, key)`` or ``cost_stream`` to get a ``Cost`` per operation.
+    """
+
+    def __init__(self, keys=(), on_rotate=None, weight=None):
+        self.weight = weight
+        self._potential = 0.0
+        self._actual = 0
+        self._bound = 0.0
+        self._splay_change = 0.0
+        super().__init__(keys, on_rotate)
+
+    @property
+    def potential(self):
+        if self._potential is None:
+            # Unknown after a split until somebody asks
+            self._potential = self.recompute_potential()
+        return self._potential
+
+    def recompute_potential(self):
+        # O(n) reference value, for checking the incremental one
+        total = 0.0
+        stack = [self.root] if self.root is not None else []
+        while stack:
+            node = stack.pop()
+            total += math.log2(node.total)
+            for child in (node.left, node.right):
+                if child is not None:
+                    stack.append(child)
+        return total
+
+    def _new_node(self, key, parent):
+        if self.weight is None:
+            return SizedNode(key, parent)
+        weight = self.weight(key)
+        if not weight > 0:
+            raise ValueError(f"weight of {key!r} must be positive, got {weight!r}")
+        return SizedNode(key, parent, weight)
+
+    def _update(self, node):
+        size = 1
+        height = 0
+        total = node.weight
+        left, right = node.left, node.right
+        if left is not None:
+            size += left.size
+            height = left.height + 1
+            total += left.total
+        if right is not None:
+            size += right.size
+            if right.height >= height:
+                height = right.height + 1
+            total += right.total
+        node.size = size
+        node.height = height
+        node.total = total
+        rank = math.log2(total)
+        if self._potential is not None:
+            self._potential += rank - node.rank
+        node.rank = rank
+
+    def _splay_to_root(self, x):
+        root = self.root
+        before = self._potential
+        self._bound += 3 * (math.log2(root.total) - math.log2(x.total)) + 1
+        rotations = super()._splay_to_root(x)
+        self._actual += max(1, rotation_count(rotations))
+        if before is not None and self._potential is not None:
+            self._splay_change += self._potential - before
+        return rotations
+
+    def delete(self, key):
+        removed = self.root.total if self.root is not None else 0
+        ok, rotations = super().delete(key)
+        if ok and self._potential is not None:
+            # The old root went with the whole tree's weight as its rank
+            self._potential -= math.log2(removed)
+        return ok, rotations
+
+    def _spawn(self, root, size):
+        tree = super()._spawn(root, size)
+        tree._potential = None
+        return tree
+
+    def split(self, key):
+        left, right = super().split(key)
+        # This tree is empty now; the halves count their own potential
+        self._potential = 0.0
+        return left, right
+
+    @classmethod
+    def join(cls, left, right):
+        right.potential  # count it now, before right is splayed
+        joined = super().join(left, right)
+        if joined._potential is not None:
+            # right's ranks (after splaying its minimum) carry over unchanged
+            joined._potential += right._potential
+        right._potential = 0.0
+        return joined
+
+    def measure(self, op, key, index=0):
+        """Apply ``op`` ("search", "insert" or "delete") and return its ``Cost``.
+
+        ``actual`` counts rotations (at least 1 per splay), ``bound`` is the
+        access lemma bound summed over the splays plus any potential change
+        from attaching or removing a node, so ``amortized <= bound``.
+        """
+        before = self.potential
+        self._actual = 0
+        self._bound = 0.0
+        self._splay_change = 0.0
+        ok = getattr(self, op)(key)[0]
+        change = self.potential - before
+        return Cost(
+            index, op, key, ok, self._actual, change, self._actual + change,
+            self._bound + (change - self._splay_change), self._potential,
+        )
+
+
+def cost_stream(tree, ops):
+    """Apply ``(op, key)`` pairs to a PotentialSplayTree, yielding a ``Cost`` each."""
+    for index, (op, key) in enumerate(ops):
+        yield tree.measure(op, key, index)
+
+
+if __name__ == "__main__":
+    import random
+    import sys
+
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    rng = random.Random(0)
+    tree = PotentialSplayTree()
+    ops = ((rng.choice(("search", "insert", "delete")), rng.randrange(n // 4)) for _ in range(n))
+    actual = amortized = 0.0
+    worst = 0.0
+    for cost in cost_stream(tree, ops):
+        actual += cost.actual
+        amortized += cost.amortized
+        worst = max(worst, cost.amortized - cost.bound)
+    drift = tree.potential - tree.recompute_potential()
+    print(f"{n} ops: actual {actual:,.0f}, amortized {amortized:,.0f}, "
+          f"final potential {tree.potential:,.1f} (drift {drift:.2e}), "
+          f"worst amortized - bound {worst:.2e}")
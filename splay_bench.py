@@ -0,0 +1,607 @@
+import argparse
+import bisect
+import functools
+import itertools
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+from link_cut_tree import LinkCutTree
+from sequence_splay_tree import SequenceSplayTree
+from node_cache import TemplateCache
+from splay_cache import splay_cache
+from splay_augmented import SizedSplayTree
+from splay_tree import SplayTree, rotation_count
+from string_splay_tree import StringSplayTree
+from splay_variants import VARIANTS
+
+# Benchmarks the splay variants against standard access patterns.
+#
+#   python splay_bench.py                       # default sizes, print table
+#   python splay_bench.py -n 100000 -m 500000 --out bench/variants.json
+#
+# Each (variant, pattern) pair builds a tree of n keys in random order and
+# runs m searches.  ops/sec and rotations come from a plain timed pass; the
+# average access depth and peak memory from a second, instrumented pass so
+# the measuring does not slow the timed numbers down.
+#
+#   python splay_bench.py --order-stats         # select/rank/count_range
+#
+# compares the size-augmented splay tree with bisect on a sorted list for
+# mixed workloads, at several write ratios.
+#
+#   python splay_bench.py --link-cut -n 1000000 # dynamic connectivity
+#
+# builds a random forest with n edges and times connectivity queries and
+# edge replacements (cut + relink) on a link/cut tree against BFS over
+# adjacency sets.  BFS only runs the first --naive-ops operations.
+#
+#   python splay_bench.py --batched             # search_many vs search
+#
+# looks up batches of keys clustered in a window (spatial locality) with
+# one search_many call per batch against a search per key, in arrival
+# order and sorted.
+#
+#   python splay_bench.py --cache               # caches
+#
+# replays Zipf and scan-heavy key traces through the splay_cache decorator,
+# functools.lru_cache and the OrderedDict LRU (node_cache.TemplateCache),
+# each holding n / 10 entries, and reports hit rate and lookups/sec.
+#
+#   python splay_bench.py --strings -n 1000000  # autocomplete
+#
+# loads n generated identifiers and fetches the first 10 completions of
+# Zipf-distributed prefixes from the string splay tree, a dict of every
+# prefix, and bisect over a sorted list.
+#
+#   python splay_bench.py --sequence -n 2000000 # ropes
+#
+# runs random single-element inserts/deletes and range reverse, add, sum/
+# min/max and block moves (split_at + concat) over spans of up to n / 10
+# elements on the implicit-key splay tree and on a list with slicing.
+
+
+def uniform(n, m, rng):
+    return [rng.randrange(n) for _ in range(m)]
+
+
+def zipf(n, m, rng, s=1.1):
+    # Rank r is accessed with weight 1/r^s; ranks map to shuffled keys so
+    # hot keys are spread over the key space
+    keys = list(range(n))
+    rng.shuffle(keys)
+    cum_weights = list(itertools.accumulate(1 / (r ** s) for r in range(1, n + 1)))
+    return rng.choices(keys, cum_weights=cum_weights, k=m)
+
+
+def sequential(n, m, rng):
+    return [i % n for i in range(m)]
+
+
+def working_set(n, m, rng, size=64, shift_every=5000):
+    # Almost all accesses hit a small hot window that moves every so often
+    out = []
+    base = rng.randrange(n)
+    for i in range(m):
+        if i % shift_every == 0:
+            base = rng.randrange(n)
+        if rng.random() < 0.95:
+            out.append((base + rng.randrange(size)) % n)
+        else:
+            out.append(rng.randrange(n))
+    return out
+
+
+def adversarial(n, m, rng):
+    # Bit-reversal order: no spatial or temporal locality for splaying to
+    # exploit, every access lands Theta(log n) deep
+    bits = max(1, (n - 1).bit_length())
+    order = [k for k in (int(format(i, f"0{bits}b")[::-1], 2) for i in range(1 << bits)) if k < n]
+    return [order[i % len(order)] for i in range(m)]
+
+
+PATTERNS = {
+    "uniform": uniform,
+    "zipf": zipf,
+    "sequential": sequential,
+    "working-set": working_set,
+    "adversarial": adversarial,
+}
+
+
+def build(tree_class, n, seed):
+    keys = list(range(n))
+    random.Random(seed).shuffle(keys)
+    tree = tree_class()
+    for key in keys:
+        tree.insert(key)
+    return tree
+
+
+def run_one(tree_class, accesses, n, seed=0):
+    tree = build(tree_class, n, seed)
+    search = tree.search
+    rotations = 0
+    start = time.perf_counter()
+    for key in accesses:
+        rotations += rotation_count(search(key)[1])
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    tree = build(tree_class, n, seed)
+    depth = 0
+    for key in accesses:
+        depth += tree.depth(key)
+        tree.search(key)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    m = len(accesses)
+    return {
+        "ops_per_sec": m / elapsed if elapsed else float("inf"),
+        "rotations_per_access": rotations / m,
+        "avg_depth": depth / m,
+        "peak_memory": peak,
+    }
+
+
+def run(n=20_000, m=100_000, variants=None, patterns=None, seed=0):
+    results = []
+    for pattern in patterns or PATTERNS:
+        accesses = PATTERNS[pattern](n, m, random.Random(seed))
+        for variant in variants or VARIANTS:
+            row = {"variant": variant, "pattern": pattern, "n": n, "m": m}
+            row.update(run_one(VARIANTS[variant], accesses, n, seed))
+            results.append(row)
+            print(format_row(row), flush=True)
+    return results
+
+
+def order_ops(n, m, rng, writes):
+    # Reads split evenly between select, rank and count_range; writes
+    # between insert and delete, over a key space of 2n
+    ops = []
+    for _ in range(m):
+        if rng.random() < writes:
+            ops.append((rng.choice(("insert", "delete")), rng.randrange(2 * n), None))
+        else:
+            lo = rng.randrange(2 * n)
+            ops.append((rng.choice(("select", "rank", "count_range")), lo, lo + rng.randrange(n // 10 + 1)))
+    return ops
+
+
+def run_order_tree(n, ops):
+    keys = list(range(0, 2 * n, 2))
+    tree = SizedSplayTree.from_sorted(keys)
+    insert, delete, select, rank, count_range = (
+        tree.insert, tree.delete, tree.select, tree.rank, tree.count_range
+    )
+    start = time.perf_counter()
+    for op, a, b in ops:
+        if op == "select":
+            if tree.root is not None:
+                select(a % tree.root.size)
+        elif op == "rank":
+            rank(a)
+        elif op == "count_range":
+            count_range(a, b)
+        elif op == "insert":
+            insert(a)
+        else:
+            delete(a)
+    return time.perf_counter() - start
+
+
+def run_order_bisect(n, ops):
+    keys = list(range(0, 2 * n, 2))
+    bisect_left = bisect.bisect_left
+    start = time.perf_counter()
+    for op, a, b in ops:
+        if op == "select":
+            if keys:
+                keys[a % len(keys)]
+        elif op == "rank":
+            bisect_left(keys, a)
+        elif op == "count_range":
+            bisect_left(keys, b) - bisect_left(keys, a)
+        elif op == "insert":
+            i = bisect_left(keys, a)
+            if i == len(keys) or keys[i] != a:
+                keys.insert(i, a)
+        else:
+            i = bisect_left(keys, a)
+            if i < len(keys) and keys[i] == a:
+                del keys[i]
+    return time.perf_counter() - start
+
+
+def run_order(n=20_000, m=100_000, writes=(0.05, 0.2, 0.5), seed=0):
+    results = []
+    for ratio in writes:
+        ops = order_ops(n, m, random.Random(seed), ratio)
+        for structure, runner in (("splay", run_order_tree), ("bisect", run_order_bisect)):
+            elapsed = runner(n, ops)
+            row = {
+                "structure": structure, "writes": ratio, "n": n, "m": m,
+                "ops_per_sec": m / elapsed if elapsed else float("inf"),
+            }
+            results.append(row)
+            print(f"{ratio:>6.2f} {structure:<8} {row['ops_per_sec']:>12,.0f}", flush=True)
+    return results
+
+
+def clustered_batches(n, m, rng, batch=64, spread=4):
+    # Each batch draws its keys from a window of batch * spread keys
+    batches = []
+    for _ in range(m // batch):
+        base = rng.randrange(max(1, n - batch * spread))
+        batches.append([base + rng.randrange(batch * spread) for _ in range(batch)])
+    return batches
+
+
+def run_batched(n=20_000, m=100_000, batch_sizes=(16, 64, 256), seed=0):
+    results = []
+    for batch in batch_sizes:
+        batches = clustered_batches(n, m, random.Random(seed), batch)
+        lookups = sum(len(b) for b in batches)
+        for mode in ("search", "sorted search", "search_many"):
+            tree = build(SplayTree, n, seed)
+            search, search_many = tree.search, tree.search_many
+            start = time.perf_counter()
+            for keys in batches:
+                if mode == "search_many":
+                    for _ in search_many(keys):
+                        pass
+                else:
+                    for key in (sorted(keys) if mode == "sorted search" else keys):
+                        search(key)
+            elapsed = time.perf_counter() - start
+            row = {
+                "mode": mode, "batch": batch, "n": n, "m": lookups,
+                "ops_per_sec": lookups / elapsed if elapsed else float("inf"),
+            }
+            results.append(row)
+            print(f"{batch:>6} {mode:<14} {row['ops_per_sec']:>12,.0f}", flush=True)
+    return results
+
+
+def scan_heavy(n, m, rng, scan=0.7, hot=0.01):
+    # Long sequential scans over all n keys interleaved with Zipf hits on
+    # a small hot set, which flushes a plain LRU
+    hot_keys = zipf(max(1, int(n * hot)), m, rng)
+    out = []
+    position = 0
+    for i in range(m):
+        if rng.random() < scan:
+            out.append(n + position)
+            position = (position + 1) % n
+        else:
+            out.append(hot_keys[i])
+    return out
+
+
+CACHE_TRACES = {"zipf": zipf, "scan-heavy": scan_heavy}
+
+
+def run_cache(n=20_000, m=100_000, seed=0):
+    capacity = max(1, n // 10)
+    results = []
+    for trace in CACHE_TRACES:
+        keys = CACHE_TRACES[trace](n, m, random.Random(seed))
+        for structure in ("splay", "lru_cache", "ordereddict"):
+            calls = [0]
+
+            def compute(key):
+                calls[0] += 1
+                return key
+
+            if structure == "splay":
+                lookup = splay_cache(maxsize=capacity)(compute)
+            elif structure == "lru_cache":
+                lookup = functools.lru_cache(maxsize=capacity)(compute)
+            else:
+                cache = TemplateCache(maxsize=capacity)
+
+                def lookup(key, get=cache.get):
+                    return get(key, lambda: compute(key))
+
+            start = time.perf_counter()
+            for key in keys:
+                lookup(key)
+            elapsed = time.perf_counter() - start
+            row = {
+                "structure": structure, "trace": trace, "n": n, "m": m, "capacity": capacity,
+                "hit_rate": 1 - calls[0] / m,
+                "ops_per_sec": m / elapsed if elapsed else float("inf"),
+            }
+            if structure == "splay":
+                row["avg_hit_depth"] = lookup.cache_stats()["avg_hit_depth"]
+            results.append(row)
+            print(f"{trace:<11} {structure:<12} {row['hit_rate']:>8.3f} {row['ops_per_sec']:>12,.0f}", flush=True)
+    return results
+
+
+def forest_edges(n, rng):
+    # Random recursive tree: vertex i hangs off a random earlier vertex
+    return [(i, rng.randrange(i)) for i in range(1, n + 1)]
+
+
+class BFSForest:
+    # Naive baseline: adjacency sets, every query a fresh BFS
+    def __init__(self, vertices):
+        self.adj = {v: set() for v in vertices}
+
+    def link(self, u, v):
+        self.adj[u].add(v)
+        self.adj[v].add(u)
+
+    def cut(self, u, v):
+        self.adj[u].discard(v)
+        self.adj[v].discard(u)
+
+    def connected(self, u, v):
+        adj = self.adj
+        seen = {u}
+        queue = [u]
+        for x in queue:
+            if x == v:
+                return True
+            for y in adj[x]:
+                if y not in seen:
+                    seen.add(y)
+                    queue.append(y)
+        return False
+
+
+def run_dynamic_forest(forest_class, n, m, seed):
+    rng = random.Random(seed)
+    edges = forest_edges(n, rng)
+    forest = forest_class(range(n + 1))
+    for u, v in edges:
+        forest.link(u, v)
+    start = time.perf_counter()
+    for _ in range(m):
+        if rng.random() < 0.5:
+            forest.connected(rng.randrange(n + 1), rng.randrange(n + 1))
+            continue
+        # Replace a random edge, reconnecting elsewhere when that is legal
+        i = rng.randrange(n)
+        u, v = edges[i]
+        forest.cut(u, v)
+        w = rng.randrange(n + 1)
+        if not forest.connected(u, w):
+            v = w
+        forest.link(u, v)
+        edges[i] = (u, v)
+    return time.perf_counter() - start
+
+
+def run_link_cut(n=20_000, m=100_000, naive_ops=20, seed=0):
+    results = []
+    for structure, forest_class, ops in (("link-cut", LinkCutTree, m), ("bfs", BFSForest, min(m, naive_ops))):
+        elapsed = run_dynamic_forest(forest_class, n, ops, seed)
+        row = {
+            "structure": structure, "edges": n, "m": ops,
+            "ops_per_sec": ops / elapsed if elapsed else float("inf"),
+        }
+        results.append(row)
+        print(f"{structure:<9} {n:>9} {ops:>9} {row['ops_per_sec']:>12,.1f}", flush=True)
+    return results
+
+
+SYLLABLES = [
+    "get", "set", "is", "has", "make", "load", "save", "read", "write", "parse",
+    "node", "tree", "key", "value", "index", "cache", "buffer", "stream", "path", "file",
+    "user", "item", "list", "map", "count", "size", "root", "left", "right", "splay",
+]
+
+
+def identifiers(n, rng):
+    words = set()
+    while len(words) < n:
+        parts = rng.choices(SYLLABLES, k=rng.randrange(2, 5))
+        words.add("_".join(parts) + str(rng.randrange(1000)))
+    return sorted(words)
+
+
+def prefix_queries(words, m, rng, s=1.1):
+    hot = zipf(len(words), m, rng, s)
+    return [w[:rng.randrange(1, len(w) + 1)] for w in (words[i] for i in hot)]
+
+
+class PrefixDict:
+    # Every prefix of every word maps to its sorted completions
+    def __init__(self, words):
+        self.table = {}
+        for word in words:
+            for i in range(1, len(word) + 1):
+                self.table.setdefault(word[:i], []).append(word)
+
+    def complete(self, prefix, limit):
+        return self.table.get(prefix, [])[:limit]
+
+
+class SortedWords:
+    def __init__(self, words):
+        self.words = words
+
+    def complete(self, prefix, limit):
+        words = self.words
+        i = bisect.bisect_left(words, prefix)
+        out = []
+        while i < len(words) and len(out) < limit and words[i].startswith(prefix):
+            out.append(words[i])
+            i += 1
+        return out
+
+
+class SplayWords:
+    def __init__(self, words):
+        self.tree = StringSplayTree.from_words(words)
+
+    def complete(self, prefix, limit):
+        return list(itertools.islice(self.tree.prefix_iter(prefix), limit))
+
+
+def run_strings(n=20_000, m=100_000, limit=10, seed=0):
+    rng = random.Random(seed)
+    words = identifiers(n, rng)
+    queries = prefix_queries(words, m, rng)
+    results = []
+    for structure, structure_class in (("splay", SplayWords), ("bisect", SortedWords), ("prefix-dict", PrefixDict)):
+        tracemalloc.start()
+        start = time.perf_counter()
+        index = structure_class(words)
+        built = time.perf_counter() - start
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        complete = index.complete
+        start = time.perf_counter()
+        for prefix in queries:
+            complete(prefix, limit)
+        elapsed = time.perf_counter() - start
+        row = {
+            "structure": structure, "n": n, "m": m, "build_seconds": built,
+            "ops_per_sec": m / elapsed if elapsed else float("inf"), "memory": memory,
+        }
+        results.append(row)
+        print(f"{structure:<12} {built:>8.2f} {row['ops_per_sec']:>12,.0f} {memory / 2**20:>9.1f}", flush=True)
+        del index
+    return results
+
+
+SEQUENCE_OPS = ("insert", "delete", "reverse", "add", "aggregate", "move")
+
+
+def sequence_ops(n, m, rng):
+    # (op, a, b, c): position a, span end b, and a value or target position c
+    ops = []
+    for _ in range(m):
+        op = rng.choice(SEQUENCE_OPS)
+        a = rng.randrange(n)
+        ops.append((op, a, a + rng.randrange(1, n // 10 + 2), rng.randrange(n)))
+    return ops
+
+
+def run_sequence_tree(n, ops):
+    seq = SequenceSplayTree(range(n))
+    start = time.perf_counter()
+    for op, a, b, c in ops:
+        if op == "insert":
+            seq.insert(a, c)
+        elif op == "delete":
+            del seq[a % len(seq)]
+        elif op == "reverse":
+            seq.reverse(a, b)
+        elif op == "add":
+            seq.add(a, b, 1)
+        elif op == "aggregate":
+            seq.aggregate(a, b)
+        else:
+            piece = seq.delete_range(a, b)
+            head, tail = seq.split_at(c)
+            seq = SequenceSplayTree.concat(SequenceSplayTree.concat(head, piece), tail)
+    return time.perf_counter() - start
+
+
+def run_sequence_list(n, ops):
+    seq = list(range(n))
+    start = time.perf_counter()
+    for op, a, b, c in ops:
+        if op == "insert":
+            seq.insert(a, c)
+        elif op == "delete":
+            del seq[a % len(seq)]
+        elif op == "reverse":
+            seq[a:b] = seq[a:b][::-1]
+        elif op == "add":
+            seq[a:b] = [x + 1 for x in seq[a:b]]
+        elif op == "aggregate":
+            span = seq[a:b]
+            if span:
+                sum(span), min(span), max(span)
+        else:
+            piece = seq[a:b]
+            del seq[a:b]
+            seq[c:c] = piece
+    return time.perf_counter() - start
+
+
+def run_sequence(n=20_000, m=100_000, seed=0):
+    ops = sequence_ops(n, m, random.Random(seed))
+    results = []
+    for structure, runner in (("splay", run_sequence_tree), ("list", run_sequence_list)):
+        elapsed = runner(n, ops)
+        row = {
+            "structure": structure, "n": n, "m": m,
+            "ops_per_sec": m / elapsed if elapsed else float("inf"),
+        }
+        results.append(row)
+        print(f"{structure:<8} {n:>9} {row['ops_per_sec']:>12,.0f}", flush=True)
+    return results
+
+
+def format_row(row):
+    return (
+        f"{row['pattern']:<12} {row['variant']:<12} {row['ops_per_sec']:>12,.0f}"
+        f" {row['rotations_per_access']:>9.2f} {row['avg_depth']:>9.2f}"
+        f" {row['peak_memory'] / 2**20:>9.1f}"
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark splay tree variants.")
+    parser.add_argument("-n", type=int, default=20_000, help="keys in the tree")
+    parser.add_argument("-m", type=int, default=100_000, help="accesses per run")
+    parser.add_argument("--variant", action="append", choices=sorted(VARIANTS))
+    parser.add_argument("--pattern", action="append", choices=sorted(PATTERNS))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--order-stats", action="store_true",
+                        help="benchmark select/rank/count_range against bisect instead")
+    parser.add_argument("--link-cut", action="store_true",
+                        help="benchmark link/cut trees against BFS on a forest of n edges instead")
+    parser.add_argument("--batched", action="store_true",
+                        help="benchmark search_many against single searches instead")
+    parser.add_argument("--cache", action="store_true",
+                        help="benchmark the splay cache against LRU caches instead")
+    parser.add_argument("--strings", action="store_true",
+                        help="benchmark prefix completion on generated identifiers instead")
+    parser.add_argument("--sequence", action="store_true",
+                        help="benchmark the implicit-key sequence tree against list slicing instead")
+    parser.add_argument("--naive-ops", type=int, default=20, help="operations for the BFS baseline")
+    parser.add_argument("--out", help="write results as JSON (read by the deck's chart slide)")
+    args = parser.parse_args(argv)
+
+    if args.cache:
+        print(f"{'trace':<11} {'struct':<12} {'hit rate':>8} {'ops/sec':>12}")
+        results = run_cache(args.n, args.m, seed=args.seed)
+    elif args.batched:
+        print(f"{'batch':>6} {'mode':<14} {'ops/sec':>12}")
+        results = run_batched(args.n, args.m, seed=args.seed)
+    elif args.strings:
+        print(f"{'struct':<12} {'build s':>8} {'ops/sec':>12} {'MiB':>9}")
+        results = run_strings(args.n, args.m, seed=args.seed)
+    elif args.sequence:
+        print(f"{'struct':<8} {'n':>9} {'ops/sec':>12}")
+        results = run_sequence(args.n, args.m, args.seed)
+    elif args.link_cut:
+        print(f"{'struct':<9} {'edges':>9} {'ops':>9} {'ops/sec':>12}")
+        results = run_link_cut(args.n, args.m, args.naive_ops, args.seed)
+    elif args.order_stats:
+        print(f"{'writes':>6} {'struct':<8} {'ops/sec':>12}")
+        results = run_order(args.n, args.m, seed=args.seed)
+    else:
+        print(f"{'pattern':<12} {'variant':<12} {'ops/sec':>12} {'rot/acc':>9} {'depth':>9} {'peak MiB':>9}")
+        results = run(args.n, args.m, args.variant, args.pattern, args.seed)
+    if args.out:
+        os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
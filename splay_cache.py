@@ -0,0 +1,255 @@
+import functools
+import random
+import sys
+import time
+from collections.abc import MutableMapping
+
+from splay_tree import SplayTree
+
+# A cache on top of the splay tree: every hit splays the entry to the root,
+# so by the working set theorem hot keys stay shallow and cold ones sink.
+# Eviction exploits that: victims are leaves found by a few random walks
+# from the root (the deep, least recently splayed region), and of those the
+# one with the oldest access stamp goes.  Expired entries go first.
+
+
+class CacheNode:
+    __slots__ = ("key", "left", "right", "parent", "value", "nbytes", "expires", "stamp")
+
+    def __init__(self, key, parent=None):
+        self.key = key
+        self.left = None
+        self.right = None
+        self.parent = parent
+        self.value = None
+        self.nbytes = 0
+        self.expires = None
+        self.stamp = 0
+
+
+class CacheTree(SplayTree):
+    node_class = CacheNode
+
+
+class SplayCache(MutableMapping):
+    """Mapping bounded by ``maxsize`` entries, ``maxbytes`` (``sizeof`` of
+    the values, ``sys.getsizeof`` by default) and a per-entry ``ttl`` in
+    seconds of ``clock``.  Keys must be mutually orderable.
+
+    Lookups (``[]``, ``get``) count as accesses and splay; ``in`` and
+    iteration only peek.
+    """
+
+    def __init__(self, maxsize=1024, maxbytes=None, ttl=None, sizeof=None,
+                 clock=time.monotonic, samples=3, seed=0):
+        if maxsize is not None and maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self.ttl = ttl
+        self.sizeof = sizeof or sys.getsizeof
+        self.clock = clock
+        self.samples = samples
+        self.tree = CacheTree()
+        self.nbytes = 0
+        self._rng = random.Random(seed)
+        self._tick = 0
+        self.hits = 0
+        self.misses = 0
+        self.hit_depth = 0
+        self.evictions = {"capacity": 0, "bytes": 0, "ttl": 0}
+
+    def __len__(self):
+        return len(self.tree)
+
+    def __iter__(self):
+        return iter(self.tree)
+
+    def __contains__(self, key):
+        node = self._walk(key)[0]
+        return node is not None and not self._expired(node)
+
+    def _walk(self, key):
+        # Plain BST walk, no splay: (node or None, depth)
+        node = self.tree.root
+        depth = 0
+        while node is not None:
+            if key < node.key:
+                node = node.left
+            elif node.key < key:
+                node = node.right
+            else:
+                return node, depth
+            depth += 1
+        return None, depth
+
+    def _expired(self, node):
+        return node.expires is not None and node.expires <= self.clock()
+
+    def _touch(self, node):
+        self._tick += 1
+        node.stamp = self._tick
+        self.tree._splay(node)
+
+    def __getitem__(self, key):
+        node, depth = self._walk(key)
+        if node is not None and self._expired(node):
+            self._remove(node)
+            self.evictions["ttl"] += 1
+            node = None
+        if node is None:
+            self.misses += 1
+            raise KeyError(key)
+        self.hits += 1
+        self.hit_depth += depth
+        self._touch(node)
+        return node.value
+
+    def __setitem__(self, key, value):
+        node, inserted = self.tree._attach(key)
+        nbytes = self.sizeof(value)
+        self.nbytes += nbytes - node.nbytes
+        node.value = value
+        node.nbytes = nbytes
+        node.expires = self.clock() + self.ttl if self.ttl is not None else None
+        self._touch(node)
+        self._shrink()
+
+    def __delitem__(self, key):
+        node = self._walk(key)[0]
+        if node is None:
+            raise KeyError(key)
+        self._remove(node)
+
+    def _remove(self, node):
+        self.nbytes -= node.nbytes
+        self.tree.delete(node.key)
+
+    def _shrink(self):
+        tree = self.tree
+        while tree.root is not None:
+            if self.maxsize is not None and len(tree) > self.maxsize:
+                reason = "capacity"
+            elif self.maxbytes is not None and self.nbytes > self.maxbytes and len(tree) > 1:
+                reason = "bytes"
+            else:
+                return
+            victim = self._victim()
+            if self._expired(victim):
+                reason = "ttl"
+            self._unlink_leaf(victim)
+            self.evictions[reason] += 1
+
+    def _victim(self):
+        # Oldest-stamped leaf among a few random root-to-leaf walks; the
+        # root just splayed in is never picked while anything else is left
+        rng = self._rng
+        best = None
+        for _ in range(self.samples):
+            node = self.tree.root
+            while True:
+                left, right = node.left, node.right
+                if left is None:
+                    if right is None:
+                        break
+                    node = right
+                elif right is None or rng.random() < 0.5:
+                    node = left
+                else:
+                    node = right
+            if self._expired(node):
+                return node
+            if best is None or node.stamp < best.stamp:
+                best = node
+        return best
+
+    def _unlink_leaf(self, node):
+        # Leaves come out without splaying, so the hot top stays put
+        tree = self.tree
+        parent = node.parent
+        if parent is None:
+            tree.root = None
+        elif parent.left is node:
+            parent.left = None
+        else:
+            parent.right = None
+        tree._resize(-1)
+        self.nbytes -= node.nbytes
+
+    def expire(self):
+        """Drop every expired entry now instead of lazily."""
+        now = self.clock()
+        stale = [node.key for node in self._nodes() if node.expires is not None and node.expires <= now]
+        for key in stale:
+            self._remove(self._walk(key)[0])
+        self.evictions["ttl"] += len(stale)
+        return len(stale)
+
+    def _nodes(self):
+        stack = [self.tree.root] if self.tree.root is not None else []
+        while stack:
+            node = stack.pop()
+            yield node
+            for child in (node.left, node.right):
+                if child is not None:
+                    stack.append(child)
+
+    def clear(self):
+        self.tree = CacheTree()
+        self.nbytes = 0
+        self.hits = self.misses = self.hit_depth = 0
+        self.evictions = dict.fromkeys(self.evictions, 0)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "avg_hit_depth": self.hit_depth / self.hits if self.hits else 0.0,
+            "evictions": dict(self.evictions),
+            "size": len(self.tree),
+            "bytes": self.nbytes,
+            "maxsize": self.maxsize,
+            "maxbytes": self.maxbytes,
+        }
+
+
+def splay_cache(maxsize=1024, maxbytes=None, ttl=None, sizeof=None):
+    """Memoizing decorator like ``functools.lru_cache`` over a SplayCache.
+
+    Arguments only need to be hashable: entries are ordered by the hash of
+    the argument key, and a hash collision just counts as a miss.
+    """
+
+    measure = sizeof or sys.getsizeof
+
+    def decorator(func):
+        # Entries hold (key, value); only the value counts towards maxbytes
+        cache = SplayCache(maxsize, maxbytes, ttl, lambda item: measure(item[1]))
+        missing = object()
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = args if not kwargs else args + (missing,) + tuple(sorted(kwargs.items()))
+            slot = hash(key)
+            try:
+                stored, value = cache[slot]
+            except KeyError:
+                stored = missing
+            if stored == key:
+                return value
+            if stored is not missing:
+                # Collision: undo the hit it was counted as
+                cache.hits -= 1
+                cache.misses += 1
+            value = func(*args, **kwargs)
+            cache[slot] = (key, value)
+            return value
+
+        wrapper.cache = cache
+        wrapper.cache_stats = cache.stats
+        wrapper.cache_clear = cache.clear
+        return wrapper
+
+    return decorator
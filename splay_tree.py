@@ -0,0 +1,542 @@
+import bisect
+import copy
+import random
+import sys
+from collections import namedtuple
+
+# Splay step names follow the deck: "zig" is a single right rotation (the
+# node was a left child), "zag" a single left rotation (the node was a right
+# child).  Double steps name the parent rotation first, then the grandparent.
+Rotation = namedtuple("Rotation", ["step", "key"])
+
+# Immutable tree shape: nested (key, left, right) with None for no child.
+# It has left/right attributes, so tree_layout can lay it out directly.
+Shape = namedtuple("Shape", ["key", "left", "right"])
+
+# Several shapes side by side, left to right, for states where part of the
+# tree hangs loose (a delete between cutting out the root and the join)
+ShapeForest = namedtuple("ShapeForest", ["trees"])
+
+
+def rotation_count(rotations):
+    # Single rotations performed: one per zig/zag, two per double step
+    return sum(1 if len(r.step) == 3 else 2 for r in rotations)
+
+
+class SplayNode:
+    __slots__ = ("key", "left", "right", "parent")
+
+    def __init__(self, key, parent=None):
+        self.key = key
+        self.left = None
+        self.right = None
+        self.parent = parent
+
+
+class SplayTree:
+    """Bottom-up splay tree.
+
+    ``search``, ``insert`` and ``delete`` each return ``(ok, rotations)``
+    where ``rotations`` is the list of splay steps performed, in order.
+    ``on_rotate`` (if set) is called with the tree after every single
+    rotation, which is what the slides use to snapshot intermediate states.
+    """
+
+    node_class = SplayNode
+
+    def __init__(self, keys=(), on_rotate=None):
+        self.root = None
+        self.size = 0
+        self.on_rotate = on_rotate
+        for key in keys:
+            self.insert(key)
+
+    def __len__(self):
+        if self.size is None:
+            # Unknown after a split until somebody asks
+            self.size = sum(1 for _ in self)
+        return self.size
+
+    def _resize(self, delta):
+        if self.size is not None:
+            self.size += delta
+
+    def __iter__(self):
+        # In-order walk without recursion so skewed trees don't hit the limit
+        stack = []
+        node = self.root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node.key
+            node = node.right
+
+    def __contains__(self, key):
+        return self.search(key)[0]
+
+    # --- Rotations -------------------------------------------------------
+
+    def _rotate(self, x):
+        # Lift x above its parent, fixing every parent pointer involved
+        p = x.parent
+        g = p.parent
+        if p.left is x:
+            b = x.right
+            p.left = b
+            x.right = p
+        else:
+            b = x.left
+            p.right = b
+            x.left = p
+        if b is not None:
+            b.parent = p
+        p.parent = x
+        x.parent = g
+        if g is None:
+            self.root = x
+        elif g.left is p:
+            g.left = x
+        else:
+            g.right = x
+        self._update(p)
+        self._update(x)
+        if self.on_rotate is not None:
+            self.on_rotate(self)
+
+    def _update(self, node):
+        # Hook for augmented variants that keep per-node aggregates
+        pass
+
+    def _splay(self, x):
+        # Access policy; variants override this, structural edits that need
+        # x at the root call _splay_to_root directly
+        return self._splay_to_root(x)
+
+    def _splay_to_root(self, x):
+        rotations = []
+        key = x.key
+        while x.parent is not None:
+            p = x.parent
+            g = p.parent
+            x_left = p.left is x
+            if g is None:
+                rotations.append(Rotation("zig" if x_left else "zag", key))
+                self._rotate(x)
+            elif x_left == (g.left is p):
+                rotations.append(Rotation("zig-zig" if x_left else "zag-zag", key))
+                self._rotate(p)
+                self._rotate(x)
+            else:
+                rotations.append(Rotation("zig-zag" if x_left else "zag-zig", key))
+                self._rotate(x)
+                self._rotate(x)
+        return rotations
+
+    # --- Lookups ---------------------------------------------------------
+
+    def _find(self, key):
+        # Returns the node holding key, or the last node on the search path
+        node = self.root
+        last = None
+        while node is not None:
+            last = node
+            if key < node.key:
+                node = node.left
+            elif node.key < key:
+                node = node.right
+            else:
+                return node
+        return last
+
+    def search(self, key):
+        node = self._find(key)
+        if node is None:
+            return False, []
+        rotations = self._splay(node)
+        return node.key == key, rotations
+
+    def _finger_find(self, finger, key):
+        # _find starting from finger instead of the root, for keys at or
+        # after finger.key: climb only while key is past the subtree
+        node = finger
+        while node.key < key:
+            p = node.parent
+            if p is None or (p.left is node and key < p.key):
+                break
+            node = p
+        last = node
+        while node is not None:
+            last = node
+            if key < node.key:
+                node = node.left
+            elif node.key < key:
+                node = node.right
+            else:
+                return node
+        return last
+
+    def search_many(self, keys):
+        """Look up a batch of keys, yielding ``(key, found)`` in sorted order.
+
+        Each lookup walks from the previous one (the finger) instead of the
+        root, so close keys cost O(log distance); only the last node of the
+        batch is splayed.  Don't modify the tree while iterating.
+        """
+        if self.root is None:
+            for key in sorted(keys):
+                yield key, False
+            return
+        node = None
+        for key in sorted(keys):
+            node = self._find(key) if node is None else self._finger_find(node, key)
+            yield key, node.key == key
+        if node is not None:
+            self._splay(node)
+
+    def _attach(self, key):
+        # Plain BST insert; returns (node, inserted) without splaying
+        node = self.root
+        parent = None
+        while node is not None:
+            parent = node
+            if key < node.key:
+                node = node.left
+            elif node.key < key:
+                node = node.right
+            else:
+                return node, False
+        node = self._new_node(key, parent)
+        if parent is None:
+            self.root = node
+        elif key < parent.key:
+            parent.left = node
+        else:
+            parent.right = node
+        self._resize(1)
+        self._update_path(node)
+        return node, True
+
+    def _new_node(self, key, parent):
+        return self.node_class(key, parent)
+
+    def insert(self, key):
+        node, inserted = self._attach(key)
+        return inserted, self._splay(node)
+
+    def _update_path(self, node):
+        # Refresh aggregates from node (a new leaf) up to the root
+        pass
+
+    def delete(self, key):
+        node = self._find(key)
+        if node is None:
+            return False, []
+        rotations = self._splay_to_root(node)
+        root = self.root
+        if root.key != key:
+            return False, rotations
+        left, right = root.left, root.right
+        root.left = root.right = None
+        self._resize(-1)
+        if left is None:
+            self.root = right
+            if right is not None:
+                right.parent = None
+            return True, rotations
+        left.parent = None
+        self.root = left
+        # Splay the predecessor to the top of the left subtree, then hang
+        # the right subtree off it (the "join" from the Solution slide)
+        pred = left
+        while pred.right is not None:
+            pred = pred.right
+        rotations.extend(self._splay_to_root(pred))
+        pred = self.root
+        pred.right = right
+        if right is not None:
+            right.parent = pred
+        self._update(pred)
+        return True, rotations
+
+    # --- Split / join / bulk build -------------------------------------
+
+    def _spawn(self, root, size):
+        # Empty-config copy of this tree (same class and settings) over root
+        tree = copy.copy(self)
+        tree.root = root
+        tree.size = size
+        return tree
+
+    def _set_parent(self, node, parent):
+        if node is not None:
+            node.parent = parent
+
+    def _size_of(self, node):
+        # Node count under node if known cheaply, else None
+        return 0 if node is None else None
+
+    def split(self, key):
+        """Split into ``(left, right)`` with keys ``< key`` and ``>= key``.
+
+        Splays the last node on the search path to the root and cuts one
+        link, so it costs the same as a search.  This tree is left empty.
+        """
+        node = self._find(key)
+        left = right = None
+        if node is not None:
+            self._splay_to_root(node)
+            node = self.root
+            if node.key < key:
+                left, right = node, node.right
+                node.right = None
+            else:
+                left, right = node.left, node
+                node.left = None
+            self._set_parent(right if node is left else left, None)
+            self._update(node)
+        left_size, right_size = self._size_of(left), self._size_of(right)
+        if left_size is None and right_size is not None and self.size is not None:
+            left_size = self.size - right_size
+        elif right_size is None and left_size is not None and self.size is not None:
+            right_size = self.size - left_size
+        self.root = None
+        self.size = 0
+        return self._spawn(left, left_size), self._spawn(right, right_size)
+
+    @classmethod
+    def join(cls, left, right):
+        """Join two trees whose keys are all smaller in ``left`` than in
+        ``right``.  Returns ``left`` holding every key; ``right`` is emptied."""
+        if right.root is None:
+            return left
+        lowest = right.root
+        while lowest.left is not None:
+            lowest = lowest.left
+        right._splay_to_root(lowest)
+        if left.root is None:
+            left.root, left.size = right.root, right.size
+        else:
+            highest = left.root
+            while highest.right is not None:
+                highest = highest.right
+            if not highest.key < lowest.key:
+                raise ValueError(f"cannot join: {highest.key!r} in left is not below {lowest.key!r} in right")
+            left._splay_to_root(highest)
+            highest = left.root
+            highest.right = right.root
+            left._set_parent(right.root, highest)
+            left._update(highest)
+            if left.size is not None and right.size is not None:
+                left.size += right.size
+            else:
+                left.size = None
+        right.root = None
+        right.size = 0
+        return left
+
+    @classmethod
+    def from_shape(cls, shape, **kwargs):
+        """Tree with exactly the shape of nested ``(key, left, right)``
+        tuples (a Shape or parse_tree_spec output), without splaying."""
+        tree = cls(**kwargs)
+        if shape is None:
+            return tree
+        order = []
+        stack = [(shape, None, None)]
+        while stack:
+            item, parent, side = stack.pop()
+            node = tree._new_node(item[0], parent)
+            order.append(node)
+            if parent is None:
+                tree.root = node
+            else:
+                setattr(parent, side, node)
+            for child_side, child in (("right", item[2]), ("left", item[1])):
+                if child is not None:
+                    stack.append((child, node, child_side))
+        if type(tree)._update is not SplayTree._update:
+            for node in reversed(order):
+                tree._update(node)
+        tree.size = len(order)
+        return tree
+
+    @classmethod
+    def from_sorted(cls, keys, **kwargs):
+        """Perfectly balanced tree from strictly increasing ``keys`` in O(n)."""
+        tree = cls(**kwargs)
+        make = tree._new_node
+        nodes = []
+        for key in keys:
+            if nodes and not nodes[-1].key < key:
+                raise ValueError(f"keys are not strictly increasing at {key!r}")
+            nodes.append(make(key, None))
+        if not nodes:
+            return tree
+        order = []
+        stack = [(0, len(nodes), None, None)]
+        while stack:
+            lo, hi, parent, side = stack.pop()
+            mid = (lo + hi) // 2
+            node = nodes[mid]
+            order.append(node)
+            if parent is None:
+                tree.root = node
+            else:
+                setattr(parent, side, node)
+                tree._set_parent(node, parent)
+            if mid + 1 < hi:
+                stack.append((mid + 1, hi, node, "right"))
+            if lo < mid:
+                stack.append((lo, mid, node, "left"))
+        if type(tree)._update is not SplayTree._update:
+            # Augmented trees: children are always later in order
+            for node in reversed(order):
+                tree._update(node)
+        tree.size = len(nodes)
+        return tree
+
+    # --- Introspection ---------------------------------------------------
+
+    def depth(self, key):
+        # Plain BST walk; does not splay
+        node = self.root
+        d = 0
+        while node is not None:
+            if key < node.key:
+                node = node.left
+            elif node.key < key:
+                node = node.right
+            else:
+                return d
+            d += 1
+        return -1
+
+    def height(self):
+        if self.root is None:
+            return -1
+        best = 0
+        stack = [(self.root, 0)]
+        while stack:
+            node, d = stack.pop()
+            if d > best:
+                best = d
+            if node.left is not None:
+                stack.append((node.left, d + 1))
+            if node.right is not None:
+                stack.append((node.right, d + 1))
+        return best
+
+    def snapshot(self):
+        """Nested ``Shape(key, left, right)`` tuples of the current tree."""
+        return shape_of(self.root)
+
+
+def shape_of(root):
+    # Shape of the subtree under any node with key/left/right, or None
+    if root is None:
+        return None
+    built = {}
+    stack = [(root, False)]
+    while stack:
+        node, done = stack.pop()
+        if done:
+            built[node] = Shape(
+                node.key,
+                built.pop(node.left) if node.left is not None else None,
+                built.pop(node.right) if node.right is not None else None,
+            )
+            continue
+        stack.append((node, True))
+        if node.right is not None:
+            stack.append((node.right, False))
+        if node.left is not None:
+            stack.append((node.left, False))
+    return built[root]
+
+
+def splay_states(tree, op, key):
+    """Apply ``op`` ("search", "insert" or "delete") to ``tree`` and collect
+    a snapshot after every single rotation; the last state is always the
+    tree the operation leaves.  For inserts the first snapshot is the tree
+    with the new leaf attached, before any splaying.  While a delete splays
+    the predecessor its right subtree is cut loose, so those states are
+    ``ShapeForest((left part, right subtree))``."""
+    states = []
+    previous = tree.on_rotate
+    try:
+        if op == "insert":
+            tree.on_rotate = None
+            node, ok = tree._attach(key)
+            if ok:
+                states.append(tree.snapshot())
+            tree.on_rotate = lambda t: states.append(t.snapshot())
+            rotations = tree._splay(node)
+        elif op == "delete":
+            target = tree._find(key)
+            if target is not None and target.key != key:
+                target = None
+            # The right subtree delete will detach: target's right child
+            # as of the moment target reaches the root
+            detached = [target.right if target is not None and target is tree.root else None]
+
+            def record(t):
+                if target is not None and t.root is not target and target.parent is None:
+                    # target is cut out and t.root is its left subtree
+                    states.append(ShapeForest((t.snapshot(), shape_of(detached[0]))))
+                    return
+                if t.root is target:
+                    detached[0] = target.right
+                states.append(t.snapshot())
+
+            tree.on_rotate = record
+            ok, rotations = tree.delete(key)
+        else:
+            tree.on_rotate = lambda t: states.append(t.snapshot())
+            ok, rotations = getattr(tree, op)(key)
+    finally:
+        tree.on_rotate = previous
+    final = tree.snapshot()
+    if not states or states[-1] != final:
+        states.append(final)
+    return ok, rotations, states
+
+
+def check_against_sorted(n_ops=1_000_000, key_range=100_000, seed=0, tree_class=None):
+    """Run a random op mix against a bisect-maintained sorted list.  Full
+    splaying (``tree_class`` left as SplayTree) must also leave every
+    accessed key at the root."""
+    rng = random.Random(seed)
+    tree = (tree_class or SplayTree)()
+    full_splay = tree_class is None
+    baseline = []
+    for i in range(n_ops):
+        key = rng.randrange(key_range)
+        op = rng.random()
+        idx = bisect.bisect_left(baseline, key)
+        present = idx < len(baseline) and baseline[idx] == key
+        if op < 0.5:
+            found, _ = tree.search(key)
+            assert found == present, (i, "search", key)
+            assert not (full_splay and found) or tree.root.key == key
+        elif op < 0.8:
+            inserted, _ = tree.insert(key)
+            assert inserted != present, (i, "insert", key)
+            if not present:
+                baseline.insert(idx, key)
+            assert not full_splay or tree.root.key == key
+        else:
+            deleted, _ = tree.delete(key)
+            assert deleted == present, (i, "delete", key)
+            if present:
+                del baseline[idx]
+        assert len(tree) == len(baseline)
+    assert list(tree) == baseline
+    return len(baseline)
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    remaining = check_against_sorted(n)
+    print(f"{n} operations matched the sorted baseline ({remaining} keys left)")
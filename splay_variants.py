@@ -0,0 +1,213 @@
+import math
+
+from splay_tree import Rotation, SplayTree
+
+# The variants from the "Variants and Optimizations" slide, all with the
+# SplayTree interface: search/insert/delete return (ok, rotations), plus
+# len(), iteration, depth(), height() and snapshot().  Rotations are logged
+# per single rotation ("zig"/"zag") unless a full double step was done.
+
+
+class SemiSplayTree(SplayTree):
+    """Semi-splaying: on a zig-zig only the parent is lifted and splaying
+    continues from there, halving the path instead of moving the accessed
+    node all the way up."""
+
+    def _splay(self, x):
+        rotations = []
+        while x.parent is not None:
+            p = x.parent
+            g = p.parent
+            x_left = p.left is x
+            if g is None:
+                rotations.append(Rotation("zig" if x_left else "zag", x.key))
+                self._rotate(x)
+            elif x_left == (g.left is p):
+                rotations.append(Rotation("zig" if x_left else "zag", p.key))
+                self._rotate(p)
+                x = p
+            else:
+                rotations.append(Rotation("zig-zag" if x_left else "zag-zig", x.key))
+                self._rotate(x)
+                self._rotate(x)
+        return rotations
+
+
+class ConditionalSplayTree(SplayTree):
+    """Splays only when the access path is longer than
+    ``factor * log2(n + 1)``; shallow hits leave the tree alone."""
+
+    def __init__(self, keys=(), on_rotate=None, factor=1.0):
+        self.factor = factor
+        super().__init__(keys, on_rotate)
+
+    def _splay(self, x):
+        limit = self.factor * math.log2(len(self) + 1)
+        depth = 0
+        node = x.parent
+        while node is not None:
+            depth += 1
+            if depth > limit:
+                return self._splay_to_root(x)
+            node = node.parent
+        return []
+
+
+class SnapshotSplayTree(SplayTree):
+    """Snapshot optimization: splay for ``warmup`` accesses after every
+    insert/delete, then stop splaying (the shape is "snapshotted") until
+    the next modification.  ``freeze``/``thaw`` switch it by hand."""
+
+    def __init__(self, keys=(), on_rotate=None, warmup=1024):
+        self.warmup = warmup
+        self.budget = warmup
+        super().__init__(keys, on_rotate)
+
+    @property
+    def frozen(self):
+        return self.budget <= 0
+
+    def freeze(self):
+        self.budget = 0
+
+    def thaw(self):
+        self.budget = self.warmup
+
+    def _splay(self, x):
+        if self.budget <= 0:
+            return []
+        self.budget -= 1
+        return self._splay_to_root(x)
+
+    def insert(self, key):
+        self.thaw()
+        return super().insert(key)
+
+    def delete(self, key):
+        self.thaw()
+        return super().delete(key)
+
+
+class TopDownNode:
+    __slots__ = ("key", "left", "right")
+
+    def __init__(self, key):
+        self.key = key
+        self.left = None
+        self.right = None
+
+
+class TopDownSplayTree(SplayTree):
+    """Sleator-Tarjan top-down splaying: one pass down the search path,
+    splitting it into left and right trees that are reassembled at the end.
+    Nodes carry no parent pointer."""
+
+    node_class = TopDownNode
+
+    def _top_down(self, key):
+        t = self.root
+        rotations = []
+        if t is None:
+            return rotations
+        header = TopDownNode(None)
+        left = right = header
+        while True:
+            if key < t.key:
+                if t.left is None:
+                    break
+                if key < t.left.key:
+                    y = t.left
+                    t.left = y.right
+                    y.right = t
+                    t = y
+                    rotations.append(Rotation("zig", t.key))
+                    if t.left is None:
+                        break
+                right.left = t
+                right = t
+                t = t.left
+            elif t.key < key:
+                if t.right is None:
+                    break
+                if t.right.key < key:
+                    y = t.right
+                    t.right = y.left
+                    y.left = t
+                    t = y
+                    rotations.append(Rotation("zag", t.key))
+                    if t.right is None:
+                        break
+                left.right = t
+                left = t
+                t = t.right
+            else:
+                break
+        left.right = t.left
+        right.left = t.right
+        t.left = header.right
+        t.right = header.left
+        self.root = t
+        return rotations
+
+    def _new_node(self, key, parent):
+        return TopDownNode(key)
+
+    def _splay_to_root(self, x):
+        return self._top_down(x.key)
+
+    def _set_parent(self, node, parent):
+        pass
+
+    def search_many(self, keys):
+        # No parent pointers to climb from a finger; plain splaying searches
+        for key in sorted(keys):
+            yield key, self.search(key)[0]
+
+    def search(self, key):
+        rotations = self._top_down(key)
+        return self.root is not None and self.root.key == key, rotations
+
+    def insert(self, key):
+        rotations = self._top_down(key)
+        root = self.root
+        if root is not None and root.key == key:
+            return False, rotations
+        node = TopDownNode(key)
+        if root is not None:
+            if key < root.key:
+                node.left = root.left
+                node.right = root
+                root.left = None
+            else:
+                node.right = root.right
+                node.left = root
+                root.right = None
+        self.root = node
+        self._resize(1)
+        return True, rotations
+
+    def delete(self, key):
+        rotations = self._top_down(key)
+        root = self.root
+        if root is None or root.key != key:
+            return False, rotations
+        right = root.right
+        if root.left is None:
+            self.root = right
+        else:
+            # Splaying the left subtree for key lifts its maximum to the top,
+            # which has no right child to clash with
+            self.root = root.left
+            rotations.extend(self._top_down(key))
+            self.root.right = right
+        self._resize(-1)
+        return True, rotations
+
+
+VARIANTS = {
+    "bottom-up": SplayTree,
+    "top-down": TopDownSplayTree,
+    "semi-splay": SemiSplayTree,
+    "conditional": ConditionalSplayTree,
+    "snapshot": SnapshotSplayTree,
+}
@@ -0,0 +1,95 @@
+from splay_tree import SplayTree
+
+# Lexicographic splay tree for string keys, the "Lexicographic Trees"
+# extension from the deck.  Keys stay whole strings compared with str's own
+# character-by-character ordering, so no comparison builds a slice.  Every
+# prefix query splays the first match, so the regions of recently used
+# prefixes collect near the root, which is what skewed autocomplete traffic
+# wants.
+
+
+def common_prefix_length(a, b):
+    n = min(len(a), len(b))
+    i = 0
+    while i < n and a[i] == b[i]:
+        i += 1
+    return i
+
+
+class StringSplayTree(SplayTree):
+    """Splay tree over strings with prefix queries.
+
+    ``prefix_iter`` is lazy and walks successor links, so the tree must not
+    be modified while one is being consumed.
+    """
+
+    @classmethod
+    def from_words(cls, words, **kwargs):
+        # Bulk load: sort and dedupe, then the linear-time balanced build
+        return cls.from_sorted(sorted(set(words)), **kwargs)
+
+    def _lower_bound(self, key):
+        # Smallest node with node.key >= key (or None), and the last node
+        # on the search path for splaying
+        node = self.root
+        last = best = None
+        while node is not None:
+            last = node
+            if node.key < key:
+                node = node.right
+            else:
+                best = node
+                if key < node.key:
+                    node = node.left
+                else:
+                    break
+        return best, last
+
+    @staticmethod
+    def _successor(node):
+        if node.right is not None:
+            node = node.right
+            while node.left is not None:
+                node = node.left
+            return node
+        while node.parent is not None and node.parent.right is node:
+            node = node.parent
+        return node.parent
+
+    def prefix_iter(self, prefix):
+        """Yield the stored keys starting with ``prefix``, in order."""
+        node, last = self._lower_bound(prefix)
+        if last is not None:
+            self._splay(node if node is not None else last)
+        while node is not None and node.key.startswith(prefix):
+            yield node.key
+            node = self._successor(node)
+
+    def count_prefix(self, prefix):
+        return sum(1 for _ in self.prefix_iter(prefix))
+
+    def longest_common_prefix(self, query):
+        """Longest prefix of ``query`` that some stored key starts with."""
+        # The best match is query's in-order neighbour on one side or the other
+        node = self.root
+        below = above = None
+        while node is not None:
+            if node.key < query:
+                below = node
+                node = node.right
+            elif query < node.key:
+                above = node
+                node = node.left
+            else:
+                self._splay(node)
+                return query
+        best, length = None, 0
+        for candidate in (below, above):
+            if candidate is not None:
+                n = common_prefix_length(query, candidate.key)
+                if best is None or n > length:
+                    best, length = candidate, n
+        if best is None:
+            return ""
+        self._splay(best)
+        return query[:length]
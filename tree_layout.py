@@ -0,0 +1,101 @@
+import numpy as np
+
+# Reingold-Tilford style tidy layout for binary trees.
+#
+# Works on anything with ``left``/``right`` attributes (BinaryTree, SplayNode).
+# Subtrees are placed bottom-up; each subtree keeps its left and right contour
+# as a list ordered deepest level first plus a lazy shift, so merging two
+# siblings only walks the shorter contour and the whole pass stays linear.
+# Everything is iterative so fully skewed trees of any depth are fine.
+
+
+def preorder(root):
+    """Nodes in pre-order with parent index, side (-1 left, +1 right) and depth."""
+    nodes, parents, sides, depths = [], [], [], []
+    stack = [(root, -1, 0, 0)]
+    while stack:
+        node, parent, side, depth = stack.pop()
+        nodes.append(node)
+        parents.append(parent)
+        sides.append(side)
+        depths.append(depth)
+        index = len(nodes) - 1
+        if node.right is not None:
+            stack.append((node.right, index, 1, depth + 1))
+        if node.left is not None:
+            stack.append((node.left, index, -1, depth + 1))
+    return nodes, parents, sides, depths
+
+
+def tidy_layout(root, sibling_sep=1.6, level_sep=1.5, origin=(0.0, 0.0, 0.0)):
+    """Return ``(nodes, parents, positions)`` for the tree under ``root``.
+
+    ``positions`` is an ``(n, 3)`` array aligned with ``nodes`` (pre-order);
+    the root sits at ``origin`` and every level is ``level_sep`` lower.
+    Neighbouring nodes on a level are at least ``sibling_sep`` apart.
+    """
+    nodes, parents, sides, depths = preorder(root)
+    n = len(nodes)
+    left_child = [-1] * n
+    right_child = [-1] * n
+    for i in range(1, n):
+        if sides[i] < 0:
+            left_child[parents[i]] = i
+        else:
+            right_child[parents[i]] = i
+
+    offset = [0.0] * n
+    contour = [None] * n
+    half = sibling_sep / 2
+
+    # Children always come after their parent in pre-order, so a reverse
+    # sweep sees every subtree before the node that owns it.
+    for i in range(n - 1, -1, -1):
+        lc, rc = left_child[i], right_child[i]
+        if lc < 0 and rc < 0:
+            contour[i] = ([0.0], [0.0], 0.0)
+            continue
+        if lc >= 0 and rc >= 0:
+            l_left, l_right, l_shift = contour[lc]
+            r_left, r_right, r_shift = contour[rc]
+            contour[lc] = contour[rc] = None
+            shared = min(len(l_right), len(r_left))
+            widest = 0.0
+            for d in range(1, shared + 1):
+                gap = (l_right[-d] + l_shift) - (r_left[-d] + r_shift)
+                if gap > widest:
+                    widest = gap
+            h = (widest + sibling_sep) / 2
+            offset[lc] = -h
+            offset[rc] = h
+            if len(l_left) >= len(r_left):
+                shift = l_shift - h
+                new_left = l_left
+                new_right = l_right
+                for d in range(1, len(r_right) + 1):
+                    new_right[-d] = r_right[-d] + r_shift + h - shift
+            else:
+                shift = r_shift + h
+                new_left = r_left
+                new_right = r_right
+                for d in range(1, len(l_left) + 1):
+                    new_left[-d] = l_left[-d] + l_shift - h - shift
+        else:
+            child = lc if lc >= 0 else rc
+            h = -half if lc >= 0 else half
+            new_left, new_right, c_shift = contour[child]
+            contour[child] = None
+            offset[child] = h
+            shift = c_shift + h
+        new_left.append(-shift)
+        new_right.append(-shift)
+        contour[i] = (new_left, new_right, shift)
+
+    positions = np.zeros((n, 3))
+    xs = positions[:, 0]
+    xs[0] = origin[0]
+    for i in range(1, n):
+        xs[i] = xs[parents[i]] + offset[i]
+    positions[:, 1] = origin[1] - level_sep * np.asarray(depths, dtype=float)
+    positions[:, 2] = origin[2]
+    return nodes, parents, positions
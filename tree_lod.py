@@ -0,0 +1,99 @@
+import math
+from collections import namedtuple
+
+from splay_tree import Shape
+
+# Level of detail for drawing very large trees.  lod_shape prunes a tree to
+# the nodes worth drawing (everything down to a depth cutoff, plus the
+# search paths to the focus keys and a fringe around them) and replaces
+# each subtree it cuts off with a Summary leaf giving its size and height.
+# Splaying pulls the focus up and pushes old paths down, so recomputing the
+# pruned shape after every access expands and collapses regions by itself.
+
+
+class Summary(namedtuple("Summary", ["key", "size", "height"])):
+    # Collapsed subtree rooted at ``key``; a leaf for tree_layout
+    __slots__ = ()
+    left = None
+    right = None
+
+
+def subtree_stats(node):
+    # (size, height); O(1) on size-augmented nodes, one walk otherwise
+    size = getattr(node, "size", None)
+    height = getattr(node, "height", None)
+    if size is not None and height is not None:
+        return size, height
+    size = height = 0
+    stack = [(node, 0)]
+    while stack:
+        node, depth = stack.pop()
+        size += 1
+        if depth > height:
+            height = depth
+        if node.left is not None:
+            stack.append((node.left, depth + 1))
+        if node.right is not None:
+            stack.append((node.right, depth + 1))
+    return size, height
+
+
+def lod_shape(root, focus=(), depth_cutoff=4, radius=1):
+    """Shape of the tree under ``root`` pruned for drawing.
+
+    Keeps every node at depth ``<= depth_cutoff``, the search path to each
+    key in ``focus`` and anything within ``radius`` levels below that path;
+    other subtrees become ``Summary`` leaves.  Works on any node with
+    key/left/right; on SizedSplayTree nodes the cost is O(nodes kept).
+    """
+    if root is None:
+        return None
+    on_path = set()
+    for key in focus:
+        node = root
+        while node is not None:
+            on_path.add(id(node))
+            if key < node.key:
+                node = node.left
+            elif node.key < key:
+                node = node.right
+            else:
+                break
+    built = {}
+    stack = [(root, 0, 0 if id(root) in on_path else math.inf, False)]
+    while stack:
+        node, depth, off_path, done = stack.pop()
+        left, right = node.left, node.right
+        if done:
+            built[id(node)] = Shape(
+                node.key,
+                built.pop(id(left)) if left is not None else None,
+                built.pop(id(right)) if right is not None else None,
+            )
+            continue
+        stack.append((node, depth, off_path, True))
+        for child in (right, left):
+            if child is None:
+                continue
+            distance = 0 if id(child) in on_path else off_path + 1
+            if depth < depth_cutoff or distance <= radius:
+                stack.append((child, depth + 1, distance, False))
+            else:
+                built[id(child)] = Summary(child.key, *subtree_stats(child))
+    return built[id(root)]
+
+
+def shape_size(shape):
+    # (drawn nodes, summary glyphs) in a pruned shape
+    nodes = glyphs = 0
+    stack = [shape] if shape is not None else []
+    while stack:
+        item = stack.pop()
+        if isinstance(item, Summary):
+            glyphs += 1
+            continue
+        nodes += 1
+        for child in (item.left, item.right):
+            if child is not None:
+                stack.append(child)
+    return nodes, glyphs
@@ -0,0 +1,172 @@
+import re
+from functools import lru_cache
+
+from splay_tree import Shape
+from tree_layout import tidy_layout
+
+# Compact tree specs:  key(left,right)
+#
+#   "6(4(3,5),7)"   6 with children 4 and 7, 4 with children 3 and 5
+#   "4(3)"          left child only
+#   "3(,4(,6))"     right children only
+#
+# Keys are ints, floats or bare words.  Parsing is iterative, so specs for
+# fully skewed trees thousands of levels deep are fine.
+
+_TOKEN = re.compile(r"\s*([(),]|[^(),\s]+)")
+
+
+class TreeSpecError(ValueError):
+    pass
+
+
+def parse_key(token):
+    try:
+        return int(token)
+    except ValueError:
+        pass
+    try:
+        return float(token)
+    except ValueError:
+        return token
+
+
+def _tokens(spec):
+    pos = 0
+    end = len(spec.rstrip())
+    while pos < end:
+        match = _TOKEN.match(spec, pos)
+        if match is None:
+            raise TreeSpecError(f"unexpected character at {pos}: {spec[pos:pos + 10]!r}")
+        yield match.group(1), match.start(1)
+        pos = match.end()
+
+
+def _parse(spec):
+    # Each open frame is [key, left, right, slot]; slot 0 fills left, 1 right
+    stack = []
+    root = None
+    pending = None  # key read but not yet known to be a leaf or a parent
+
+    def attach(shape, at):
+        nonlocal root
+        if not stack:
+            if root is not None:
+                raise TreeSpecError(f"more than one root at {at}")
+            root = shape
+            return
+        frame = stack[-1]
+        slot = 1 + frame[3]
+        if frame[slot] is not None:
+            raise TreeSpecError(f"{frame[0]!r} already has that child at {at}")
+        frame[slot] = shape
+
+    for token, at in _tokens(spec):
+        if token == "(":
+            if pending is None:
+                raise TreeSpecError(f"'(' without a key at {at}")
+            stack.append([pending, None, None, 0])
+            pending = None
+            continue
+        if pending is not None:
+            attach(Shape(pending, None, None), at)
+            pending = None
+        if token == ",":
+            if not stack or stack[-1][3]:
+                raise TreeSpecError(f"unexpected ',' at {at}")
+            stack[-1][3] = 1
+        elif token == ")":
+            if not stack:
+                raise TreeSpecError(f"unbalanced ')' at {at}")
+            key, left, right, _ = stack.pop()
+            attach(Shape(key, left, right), at)
+        else:
+            if root is not None and not stack:
+                raise TreeSpecError(f"more than one root at {at}")
+            pending = parse_key(token)
+    if pending is not None:
+        attach(Shape(pending, None, None), len(spec))
+    if stack:
+        raise TreeSpecError(f"{len(stack)} unclosed '('")
+    if root is None:
+        raise TreeSpecError("empty tree spec")
+    return root
+
+
+def check_bst_order(shape):
+    # In-order walk must be strictly increasing
+    stack = []
+    node = shape
+    previous = None
+    first = True
+    while stack or node is not None:
+        while node is not None:
+            stack.append(node)
+            node = node.left
+        node = stack.pop()
+        try:
+            out_of_order = not first and not previous < node.key
+        except TypeError:
+            raise TreeSpecError(f"keys {previous!r} and {node.key!r} cannot be compared") from None
+        if out_of_order:
+            raise TreeSpecError(f"{node.key!r} is out of BST order after {previous!r}")
+        previous = node.key
+        first = False
+        node = node.right
+
+
+@lru_cache(maxsize=256)
+def parse_tree_spec(spec, check_order=True):
+    """Parse ``spec`` into a ``Shape``; identical specs share one result."""
+    shape = _parse(spec)
+    if check_order:
+        check_bst_order(shape)
+    return shape
+
+
+@lru_cache(maxsize=256)
+def spec_layout(spec, check_order=True, sibling_sep=1.65, level_sep=1.5):
+    """Tidy-layout positions for ``spec`` in pre-order, root at the origin."""
+    _, _, positions = tidy_layout(
+        parse_tree_spec(spec, check_order), sibling_sep=sibling_sep, level_sep=level_sep
+    )
+    positions.flags.writeable = False
+    return positions
+
+
+def format_tree_spec(shape):
+    """Inverse of ``parse_tree_spec``; accepts any ``(key, left, right)`` nesting."""
+    out = []
+    stack = [shape]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            out.append(item)
+            continue
+        key, left, right = item
+        out.append(str(key))
+        if left is None and right is None:
+            continue
+        stack.append(")")
+        if right is not None:
+            stack.append(right)
+            stack.append(",")
+        if left is not None:
+            stack.append(left)
+        stack.append("(")
+    return "".join(out)
+
+
+def read_tree_specs(path, check_order=True):
+    """Shapes for every spec in ``path``: one per line, ``#`` starts a comment."""
+    shapes = []
+    with open(path) as f:
+        for lineno, line in enumerate(f, 1):
+            spec = line.split("#", 1)[0].strip()
+            if not spec:
+                continue
+            try:
+                shapes.append(parse_tree_spec(spec, check_order))
+            except TreeSpecError as e:
+                raise TreeSpecError(f"{path}:{lineno}: {e}") from None
+    return shapes
@@ -0,0 +1,349 @@
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from array_splay_tree import NIL, ArraySplayTree
+from splay_tree import SplayTree
+from workload_trace import OPS
+
+# On-disk splay tree state.
+#
+# Snapshot: a fixed header, then four flat native-order arrays with one
+# slot per node in pre-order: keys (int64 "q" or float64 "d"), and int32
+# left, right and parent slot indices with -1 for none.  The root is slot
+# 0.  MappedSnapshot maps the file and answers lookups straight from the
+# mapped pages (the OS faults them in as they are touched), so a process
+# can serve reads right after open; to_array_tree()/to_tree() materialize
+# a splayable tree when writes start.  Files are little-endian only, so
+# they map without any byte swapping.
+#
+# Op log: a header naming the snapshot generation it continues from, then
+# fixed-size (op, key) records appended as operations happen.  A checkpoint
+# writes a new snapshot (atomically, via rename) and restarts the log.
+
+MAGIC = b"SPLAYSNP"
+LOG_MAGIC = b"SPLAYLOG"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<8sIcxxxQQ")  # magic, version, typecode, count, generation
+LOG_HEADER = struct.Struct("<8sIcxxxQ")  # magic, version, typecode, generation
+LINK = "i"
+
+
+class StoreError(ValueError):
+    pass
+
+
+def _typecode(keys):
+    if all(isinstance(k, int) and not isinstance(k, bool) for k in keys):
+        return "q"
+    if all(isinstance(k, (int, float)) and not isinstance(k, bool) for k in keys):
+        return "d"
+    raise TypeError("snapshots hold int or float keys only")
+
+
+def _flatten(tree):
+    # Pre-order arrays of any SplayTree-like tree or an ArraySplayTree
+    if isinstance(tree, ArraySplayTree):
+        root = tree.root if tree.root != NIL else None
+        key_of, left_of, right_of = tree.key.__getitem__, tree.left.__getitem__, tree.right.__getitem__
+
+        def children(node):
+            l, r = left_of(node), right_of(node)
+            return (l if l != NIL else None), (r if r != NIL else None)
+    else:
+        root = tree.root
+
+        def key_of(node):
+            return node.key
+
+        def children(node):
+            return node.left, node.right
+    keys = []
+    left, right, parent = array(LINK), array(LINK), array(LINK)
+    stack = [(root, NIL, None)] if root is not None else []
+    while stack:
+        node, up, side = stack.pop()
+        slot = len(keys)
+        keys.append(key_of(node))
+        left.append(NIL)
+        right.append(NIL)
+        parent.append(up)
+        if side is not None:
+            side[up] = slot
+        l, r = children(node)
+        if r is not None:
+            stack.append((r, slot, right))
+        if l is not None:
+            stack.append((l, slot, left))
+    return keys, left, right, parent
+
+
+def save_snapshot(tree, path, generation=0, typecode=None):
+    """Write ``tree``'s shape and keys to ``path`` atomically and return
+    the key typecode: ``typecode`` if given, else "q" when every key is an
+    int and "d" otherwise."""
+    if sys.byteorder != "little":
+        raise StoreError("snapshots are little-endian only")
+    keys, left, right, parent = _flatten(tree)
+    typecode = typecode or _typecode(keys)
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, typecode.encode(), len(keys), generation))
+        for data in (array(typecode, keys), left, right, parent):
+            data.tofile(f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    return typecode
+
+
+class MappedSnapshot:
+    """Read-only tree over a memory-mapped snapshot, nothing copied.
+
+    Lookups are plain BST walks over the mapped arrays and never splay,
+    like versioned_splay_tree.TreeView.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            # mmap refuses empty files, so check before mapping
+            if os.fstat(f.fileno()).st_size < HEADER.size:
+                raise StoreError(f"{path}: truncated header")
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._map)
+        try:
+            self._open()
+        except BaseException:
+            # A mapping with exported views can't be closed, so release them first
+            self.close()
+            raise
+
+    def _open(self):
+        view = self._view
+        magic, version, typecode, count, generation = HEADER.unpack_from(view)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise StoreError(f"{self.path}: not a version {FORMAT_VERSION} splay snapshot")
+        self.typecode = typecode.decode()
+        if self.typecode not in ("q", "d"):
+            raise StoreError(f"{self.path}: unknown key typecode {self.typecode!r}")
+        self.size = count
+        self.generation = generation
+        offset = HEADER.size
+        key_bytes, link_bytes = count * 8, count * 4
+        if len(view) < offset + key_bytes + 3 * link_bytes:
+            raise StoreError(f"{self.path}: truncated arrays")
+        self.keys = view[offset:offset + key_bytes].cast(self.typecode)
+        offset += key_bytes
+        self.left = view[offset:offset + link_bytes].cast(LINK)
+        offset += link_bytes
+        self.right = view[offset:offset + link_bytes].cast(LINK)
+        offset += link_bytes
+        self.parent = view[offset:offset + link_bytes].cast(LINK)
+
+    def close(self):
+        for name in ("keys", "left", "right", "parent", "_view"):
+            view = getattr(self, name, None)
+            if view is not None:
+                view.release()
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.size
+
+    def __contains__(self, key):
+        return self.depth(key) >= 0
+
+    def search(self, key):
+        return self.depth(key) >= 0, []
+
+    def depth(self, key):
+        keys, left, right = self.keys, self.left, self.right
+        node = 0 if self.size else NIL
+        d = 0
+        while node != NIL:
+            k = keys[node]
+            if key < k:
+                node = left[node]
+            elif k < key:
+                node = right[node]
+            else:
+                return d
+            d += 1
+        return -1
+
+    def __iter__(self):
+        keys, left, right = self.keys, self.left, self.right
+        stack = []
+        node = 0 if self.size else NIL
+        while stack or node != NIL:
+            while node != NIL:
+                stack.append(node)
+                node = left[node]
+            node = stack.pop()
+            yield keys[node]
+            node = right[node]
+
+    def to_array_tree(self):
+        """ArraySplayTree over copies of the arrays (one memcpy each)."""
+        tree = ArraySplayTree(typecode=self.typecode)
+        tree.key.frombytes(self.keys.cast("B"))
+        for name in ("left", "right", "parent"):
+            links = array(LINK)
+            links.frombytes(getattr(self, name).cast("B"))
+            setattr(tree, name, links)
+        tree.root = 0 if self.size else NIL
+        tree.size = self.size
+        return tree
+
+    def to_tree(self, tree_class=SplayTree, **kwargs):
+        """Node-based tree of ``tree_class`` with the snapshot's shape.
+
+        Every node is built up front; lookups that should not pay for that
+        go through this snapshot's own read path until writes start.
+        """
+        tree = tree_class(**kwargs)
+        if not self.size:
+            return tree
+        keys, left, right = self.keys, self.left, self.right
+        make = tree._new_node
+        nodes = [None] * self.size
+        parent = self.parent
+        # Pre-order puts every parent before its children
+        for slot in range(self.size):
+            up = parent[slot]
+            node = make(keys[slot], nodes[up] if up != NIL else None)
+            nodes[slot] = node
+            if up == NIL:
+                tree.root = node
+            elif left[up] == slot:
+                nodes[up].left = node
+            else:
+                nodes[up].right = node
+        if type(tree)._update is not SplayTree._update:
+            for node in reversed(nodes):
+                tree._update(node)
+        tree.size = self.size
+        return tree
+
+
+class OpLog:
+    """Append-only log of (op, key) records continuing snapshot ``generation``.
+
+    Keys are stored with the snapshot's ``typecode`` ("q" for a new log if
+    not given); reopening an existing log with a different one fails.
+    """
+
+    def __init__(self, path, generation=0, typecode=None, sync=False):
+        self.path = path
+        self.sync = sync
+        exists = os.path.exists(path) and os.path.getsize(path) > 0
+        self._file = open(path, "ab+")
+        if exists:
+            self._file.seek(0)
+            header = self._file.read(LOG_HEADER.size)
+            try:
+                magic, version, code, self.generation = LOG_HEADER.unpack(header)
+            except struct.error:
+                raise StoreError(f"{path}: truncated log header") from None
+            if magic != LOG_MAGIC or version != FORMAT_VERSION:
+                raise StoreError(f"{path}: not a version {FORMAT_VERSION} splay op log")
+            self.typecode = code.decode()
+            if typecode is not None and typecode != self.typecode:
+                raise StoreError(f"{path}: log holds {self.typecode!r} keys, not {typecode!r}")
+        else:
+            self.generation = generation
+            self.typecode = typecode or "q"
+            self._write_header()
+        self._record = struct.Struct("<B" + self.typecode)
+
+    def _write_header(self):
+        self._file.write(LOG_HEADER.pack(LOG_MAGIC, FORMAT_VERSION, self.typecode.encode(), self.generation))
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def append(self, op, key):
+        self._file.write(self._record.pack(OPS.index(op), key))
+        if self.sync:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def flush(self):
+        self._file.flush()
+
+    def __iter__(self):
+        """Yield the logged ``(op, key)`` pairs; a torn last record is ignored."""
+        self._file.flush()
+        record = self._record
+        with open(self.path, "rb") as f:
+            f.seek(LOG_HEADER.size)
+            while True:
+                chunk = f.read(record.size)
+                if len(chunk) < record.size:
+                    return
+                code, key = record.unpack(chunk)
+                yield OPS[code], key
+
+    def replay(self, tree):
+        count = 0
+        for op, key in self:
+            getattr(tree, op)(key)
+            count += 1
+        return count
+
+    def restart(self, generation, typecode=None):
+        # Drop every record; the log now continues snapshot ``generation``
+        # with its key typecode
+        self._file.truncate(0)
+        self._file.seek(0)
+        self.generation = generation
+        if typecode is not None:
+            self.typecode = typecode
+            self._record = struct.Struct("<B" + typecode)
+        self._write_header()
+
+
+def checkpoint(tree, snapshot_path, log):
+    """Full snapshot of ``tree`` as the next generation, then restart ``log``."""
+    generation = log.generation + 1
+    # A float log stays float even while the tree happens to hold only ints
+    typecode = save_snapshot(tree, snapshot_path, generation, "d" if log.typecode == "d" else None)
+    log.restart(generation, typecode)
+    return generation
+
+
+def recover(snapshot_path, log_path=None, tree_class=ArraySplayTree):
+    """Load the snapshot and replay the log on top if it continues it."""
+    with MappedSnapshot(snapshot_path) as snapshot:
+        if tree_class is ArraySplayTree:
+            tree = snapshot.to_array_tree()
+        else:
+            tree = snapshot.to_tree(tree_class)
+        generation = snapshot.generation
+        typecode = snapshot.typecode
+    if log_path is not None and os.path.exists(log_path):
+        with OpLog(log_path) as log:
+            if log.generation != generation:
+                raise StoreError(
+                    f"{log_path} continues generation {log.generation}, snapshot is {generation}"
+                )
+            if log.typecode != typecode:
+                raise StoreError(f"{log_path} holds {log.typecode!r} keys, snapshot has {typecode!r}")
+            log.replay(tree)
+    return tree
@@ -0,0 +1,190 @@
+from splay_tree import SplayTree
+
+# Snapshot read mode for sharing a splay tree across threads.  A single
+# writer keeps splaying a VersionedSplayTree; publish() hands out a
+# TreeView of the current version in O(1) and starts a new one.  Nodes
+# remember the version that created them, and before the writer changes a
+# node's key/left/right it copies every node of an older version on the
+# root path (path copying, O(depth), which a splay pays anyway).  Views
+# only ever follow key/left/right, so the writer may keep rewriting the
+# parent pointers of shared nodes.
+
+
+class VersionedNode:
+    __slots__ = ("key", "left", "right", "parent", "version")
+
+    def __init__(self, key, parent=None, version=0):
+        self.key = key
+        self.left = None
+        self.right = None
+        self.parent = parent
+        self.version = version
+
+
+class TreeView:
+    """Read-only, non-splaying view of one published tree version.
+
+    Lookups are plain BST walks and iterators are lazy, so any number of
+    threads can share a view while the writer moves on.
+    """
+
+    __slots__ = ("root", "size")
+
+    def __init__(self, root, size):
+        self.root = root
+        self.size = size
+
+    def __len__(self):
+        return self.size
+
+    def __contains__(self, key):
+        return self._find(key) is not None
+
+    def __iter__(self):
+        return self.range_iter()
+
+    def _find(self, key):
+        node = self.root
+        while node is not None:
+            if key < node.key:
+                node = node.left
+            elif node.key < key:
+                node = node.right
+            else:
+                return node
+        return None
+
+    def search(self, key):
+        # SplayTree's signature, never any rotations
+        return self._find(key) is not None, []
+
+    def depth(self, key):
+        node = self.root
+        d = 0
+        while node is not None:
+            if key < node.key:
+                node = node.left
+            elif node.key < key:
+                node = node.right
+            else:
+                return d
+            d += 1
+        return -1
+
+    def range_iter(self, lo=None, hi=None):
+        """Yield keys in ``[lo, hi)`` in order; ``None`` leaves a side open."""
+        stack = []
+        node = self.root
+        while stack or node is not None:
+            while node is not None:
+                if lo is not None and node.key < lo:
+                    # Everything on the left is below lo as well
+                    node = node.right
+                    continue
+                stack.append(node)
+                node = node.left
+            if not stack:
+                return
+            node = stack.pop()
+            if hi is not None and not node.key < hi:
+                return
+            yield node.key
+            node = node.right
+
+    def min(self):
+        node = self.root
+        if node is None:
+            raise ValueError("min() of an empty view")
+        while node.left is not None:
+            node = node.left
+        return node.key
+
+    def max(self):
+        node = self.root
+        if node is None:
+            raise ValueError("max() of an empty view")
+        while node.right is not None:
+            node = node.right
+        return node.key
+
+
+class VersionedSplayTree(SplayTree):
+    """Splay tree with copy-on-write snapshot publication.
+
+    Only one thread may call the writer methods (search/insert/delete all
+    restructure); ``publish()`` returns a ``TreeView`` readers can share.
+    """
+
+    node_class = VersionedNode
+
+    def __init__(self, keys=(), on_rotate=None):
+        self.version = 0
+        super().__init__(keys, on_rotate)
+
+    def publish(self):
+        view = TreeView(self.root, len(self))
+        # Everything reachable from the view is now shared
+        self.version += 1
+        return view
+
+    def _new_node(self, key, parent):
+        return VersionedNode(key, parent, self.version)
+
+    def _own(self, node):
+        # Current-version copy of node, linked in place of it; its parent
+        # must already be current
+        if node.version == self.version:
+            return node
+        copy = VersionedNode(node.key, node.parent, self.version)
+        copy.left, copy.right = node.left, node.right
+        if copy.left is not None:
+            copy.left.parent = copy
+        if copy.right is not None:
+            copy.right.parent = copy
+        parent = node.parent
+        if parent is None:
+            self.root = copy
+        elif parent.left is node:
+            parent.left = copy
+        else:
+            parent.right = copy
+        return copy
+
+    def _own_path(self, node):
+        # Copy the old-version nodes from node up to the first current one
+        # (current nodes only ever have current ancestors), top-down
+        path = []
+        top = node
+        while top is not None and top.version != self.version:
+            path.append(top)
+            top = top.parent
+        for old in reversed(path):
+            node = self._own(old)
+        return node
+
+    def _splay_to_root(self, x):
+        return super()._splay_to_root(self._own_path(x))
+
+    @classmethod
+    def join(cls, left, right):
+        joined = super().join(left, right)
+        # right's nodes carry right's version numbers; a fresh version makes
+        # sure none of them passes for one of the joined tree's own
+        joined.version = max(left.version, right.version) + 1
+        return joined
+
+    def _attach(self, key):
+        node = self._find(key)
+        if node is not None and node.key == key:
+            return node, False
+        parent = self._own_path(node) if node is not None else None
+        node = self._new_node(key, parent)
+        if parent is None:
+            self.root = node
+        elif key < parent.key:
+            parent.left = node
+        else:
+            parent.right = node
+        self._resize(1)
+        self._update_path(node)
+        return node, True
@@ -0,0 +1,106 @@
+import os
+import random
+from collections import namedtuple
+
+from tree_spec import parse_key
+
+# Workload traces: one "op key" pair per line, e.g.
+#
+#   insert 42
+#   search 7
+#   delete 42
+#
+# Blank lines and "#" comments are skipped; s/i/d are accepted as short
+# forms.  Everything here is a generator so arbitrarily long traces stream
+# through without being held in memory.
+
+OPS = ("search", "insert", "delete")
+ALIASES = {"s": "search", "find": "search", "i": "insert", "d": "delete", "del": "delete"}
+
+TraceStep = namedtuple("TraceStep", ["index", "op", "key", "ok", "rotations", "depth"])
+
+
+def parse_op(line):
+    parts = line.split()
+    if len(parts) != 2:
+        raise ValueError(f"expected 'op key', got {line!r}")
+    op = ALIASES.get(parts[0].lower(), parts[0].lower())
+    if op not in OPS:
+        raise ValueError(f"unknown operation {parts[0]!r}")
+    return op, parse_key(parts[1])
+
+
+def read_trace(source):
+    """Yield ``(op, key)`` from a trace file path or an iterable of lines/pairs."""
+    if isinstance(source, (str, os.PathLike)):
+        with open(source) as f:
+            for lineno, line in enumerate(f, 1):
+                line = line.split("#", 1)[0].strip()
+                if not line:
+                    continue
+                try:
+                    yield parse_op(line)
+                except ValueError as e:
+                    raise ValueError(f"{source}:{lineno}: {e}") from None
+        return
+    for item in source:
+        yield parse_op(item) if isinstance(item, str) else tuple(item)
+
+
+def random_trace(n, key_range=64, seed=0, mix=(0.5, 0.3, 0.2)):
+    """``n`` random operations with the given search/insert/delete mix."""
+    rng = random.Random(seed)
+    for _ in range(n):
+        yield rng.choices(OPS, mix)[0], rng.randrange(key_range)
+
+
+def access_depth(tree, op, key):
+    # Depth of the node ``op(key)`` splays, read off the tree before the
+    # operation: key's own node, else the last node on its search path (for
+    # an insert, the new leaf under it); -1 on an empty tree.  Rotation
+    # counts don't give this: a delete also splays the predecessor, and
+    # semi-splaying and the other variants stop short of the root.
+    node = tree.root
+    depth = -1
+    while node is not None:
+        depth += 1
+        if key < node.key:
+            node = node.left
+        elif node.key < key:
+            node = node.right
+        else:
+            return depth
+    return depth + 1 if op == "insert" else depth
+
+
+def replay(tree, ops):
+    """Apply ``ops`` to ``tree`` one at a time, yielding a ``TraceStep`` each."""
+    for index, (op, key) in enumerate(ops):
+        depth = access_depth(tree, op, key)
+        ok, rotations = getattr(tree, op)(key)
+        yield TraceStep(index, op, key, ok, rotations, depth)
+
+
+def budgeted(steps, every=1, min_depth=None):
+    """Yield ``(step, animate)``; only every ``every``-th step, steps whose
+    access depth reaches ``min_depth``, and the final step are animated.
+
+    Steps are passed on as soon as they arrive, so a lazy ``replay`` has
+    applied exactly that step when it is handled.  If the final step was
+    not wanted it is yielded a second time, with ``True``, once ``steps``
+    is exhausted.
+    """
+    last = None
+    wanted = False
+    for step in steps:
+        last = step
+        wanted = _wanted(step, every, min_depth)
+        yield step, wanted
+    if last is not None and not wanted:
+        yield last, True
+
+
+def _wanted(step, every, min_depth):
+    if min_depth is not None and step.depth >= min_depth:
+        return True
+    return every > 0 and (step.index + 1) % every == 0